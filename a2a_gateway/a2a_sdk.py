@@ -2,43 +2,17 @@
 
 from typing import Any, Dict
 
+from a2a_gateway.registry import tool_registry
+
 # Mock Agent Card response
 MOCK_AGENT_CARD = {
     "name": "ClawdbotCodingAgent",
     "description": "Fixes bugs, refactors code, and reviews PRs",
     "url": "http://localhost:8000",
     "interfaces": [{"url": "http://localhost:8000", "transport": "JSONRPC"}],
-    "capabilities": {"streaming": False, "pushNotifications": False},
-    "skills": [
-        {
-            "id": "fix_bug",
-            "name": "Fix Bug",
-            "description": "Fix a bug in codebase",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "bug_description": {"type": "string"},
-                    "workdir": {"type": "string"},
-                    "context_files": {"type": "array", "items": {"type": "string"}},
-                },
-                "required": ["bug_description"],
-            },
-        },
-        {
-            "id": "generate_dockerfile",
-            "name": "Generate Dockerfile",
-            "description": "Generate a production-ready Dockerfile for the project",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "project_description": {"type": "string"},
-                    "workdir": {"type": "string"},
-                    "project_type": {"type": "string", "enum": ["python", "go", "nodejs"]},
-                },
-                "required": ["workdir"],
-            },
-        }
-    ],
+    "capabilities": {"streaming": True, "pushNotifications": False},
+    # Skills are generated from the tool registry, see get_agent_card()
+    "skills": [],
 }
 
 
@@ -84,4 +58,4 @@ def create_a2a_client(url: str) -> A2AClient:
 
 def get_agent_card() -> Dict[str, Any]:
     """Get the mock Agent Card"""
-    return MOCK_AGENT_CARD
+    return {**MOCK_AGENT_CARD, "skills": tool_registry.get_agent_card_skills()}
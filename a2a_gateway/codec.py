@@ -0,0 +1,75 @@
+"""Serialization of task values stored in Redis"""
+
+import importlib
+import json
+from types import ModuleType
+from typing import Any, Optional
+
+# Leading byte of values that are not plain JSON. JSON text never starts
+# with a control character, so values written before codecs existed, and
+# by the JSON codecs, still decode.
+MSGPACK_TAG = b"\x01"
+ZSTD_TAG = b"\x02"
+
+CODECS = ("json", "orjson", "msgpack")
+
+
+def _optional(module: str) -> Optional[ModuleType]:
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        return None
+
+
+def _require(module: Optional[ModuleType], name: str) -> ModuleType:
+    if module is None:
+        raise ValueError(f"The {name} package is required by the Redis codec")
+    return module
+
+
+class Codec:
+    """Encodes task values as JSON (stdlib or orjson) or msgpack.
+
+    Values of at least ``compress_threshold`` encoded bytes are compressed
+    with zstd. Every value records how it was written, so a store can switch
+    codecs without rewriting what it already holds. JSON is parsed with
+    orjson whenever it is installed.
+    """
+
+    def __init__(self, name: str = "json", compress_threshold: Optional[int] = None):
+        if name not in CODECS:
+            raise ValueError(f"Unknown codec {name!r}, expected one of {CODECS}")
+        self.name = name
+        self.compress_threshold = compress_threshold
+        self._orjson = _optional("orjson")
+        if name == "orjson":
+            _require(self._orjson, "orjson")
+        self._msgpack = _optional("msgpack")
+        if name == "msgpack":
+            _require(self._msgpack, "msgpack")
+        self._zstd = _optional("zstandard")
+        if compress_threshold is not None:
+            self._compressor = _require(self._zstd, "zstandard").ZstdCompressor()
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value"""
+        if self.name == "msgpack":
+            data = MSGPACK_TAG + self._msgpack.packb(value)
+        elif self.name == "orjson":
+            data = self._orjson.dumps(value)
+        else:
+            data = json.dumps(value, separators=(",", ":")).encode()
+        if self.compress_threshold is not None and len(data) >= self.compress_threshold:
+            return ZSTD_TAG + self._compressor.compress(data)
+        return data
+
+    def loads(self, data: bytes) -> Any:
+        """Decode a value written by any codec"""
+        if data[:1] == ZSTD_TAG:
+            zstd = _require(self._zstd, "zstandard")
+            data = zstd.ZstdDecompressor().decompress(data[1:])
+        if data[:1] == MSGPACK_TAG:
+            return _require(self._msgpack, "msgpack").unpackb(data[1:])
+        if self._orjson is not None:
+            return self._orjson.loads(data)
+        return json.loads(data)
@@ -0,0 +1,123 @@
+"""Adaptive concurrency limit for A2A Coding Gateway"""
+
+import math
+import os
+from typing import Any, Dict, Optional
+
+import structlog
+
+from a2a_gateway.config import settings
+from a2a_gateway.metrics import TASK_CONCURRENCY_LIMIT
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+# Factor applied to the limit when the host is overloaded
+DECREASE_FACTOR = 0.75
+
+# Weight of the latest run in a skill's baseline duration
+BASELINE_SMOOTHING = 0.1
+
+
+def cpu_load() -> Optional[float]:
+    """1-minute load average per CPU, or None if unknown"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        return None
+
+
+def free_memory() -> Optional[float]:
+    """Fraction of memory available to new processes, or None if unknown"""
+    info = {}
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                info[name] = int(value.split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    if not info.get("MemTotal") or "MemAvailable" not in info:
+        return None
+    return info["MemAvailable"] / info["MemTotal"]
+
+
+class AdaptiveLimiter:
+    """Adjusts the concurrency limit with additive increase, multiplicative decrease.
+
+    Every ``adaptive_interval`` seconds the limit drops by a quarter when the
+    load average per CPU exceeds ``adaptive_target_load``, free memory is
+    below ``adaptive_min_free_memory``, or tasks finished since the last
+    adjustment took ``adaptive_latency_tolerance`` times longer than usual for
+    their skill. Otherwise, if tasks are waiting for a slot, it grows by one.
+    The limit stays between ``adaptive_min_concurrency`` and
+    ``adaptive_max_concurrency``.
+    """
+
+    def __init__(self):
+        self.limit = settings.max_concurrent_tasks
+        self._baselines: Dict[str, float] = {}
+        # Sum and count of latency ratios since the last adjustment
+        self._latency_total = 0.0
+        self._latency_count = 0
+        self.last_signals: Dict[str, Any] = {}
+
+    @property
+    def bounds(self) -> tuple:
+        """Lowest and highest limit that may be set"""
+        lower = max(1, settings.adaptive_min_concurrency)
+        upper = settings.adaptive_max_concurrency or os.cpu_count() or 1
+        return lower, max(lower, upper)
+
+    def observe(self, skill: Optional[str], duration: float):
+        """Record how long a finished task ran"""
+        skill = skill or "unknown"
+        baseline = self._baselines.get(skill)
+        if baseline is None:
+            self._baselines[skill] = duration
+            return
+        if baseline > 0:
+            self._latency_total += duration / baseline
+            self._latency_count += 1
+        self._baselines[skill] = baseline + BASELINE_SMOOTHING * (duration - baseline)
+
+    def update(self, saturated: bool) -> int:
+        """Adjust the limit to the current signals; returns the new limit"""
+        load = cpu_load()
+        memory = free_memory()
+        latency = (
+            self._latency_total / self._latency_count if self._latency_count else None
+        )
+        self._latency_total = 0.0
+        self._latency_count = 0
+        self.last_signals = {"cpu_load": load, "free_memory": memory, "latency": latency}
+
+        lower, upper = self.bounds
+        overloaded = (
+            (load is not None and load > settings.adaptive_target_load)
+            or (memory is not None and memory < settings.adaptive_min_free_memory)
+            or (latency is not None and latency > settings.adaptive_latency_tolerance)
+        )
+        if overloaded:
+            limit = math.floor(self.limit * DECREASE_FACTOR)
+        elif saturated:
+            limit = self.limit + 1
+        else:
+            limit = self.limit
+        limit = min(max(limit, lower), upper)
+
+        if limit != self.limit:
+            logger.info(
+                "Concurrency limit adjusted",
+                previous=self.limit,
+                limit=limit,
+                **self.last_signals,
+            )
+            self.limit = limit
+        TASK_CONCURRENCY_LIMIT.set(self.limit)
+        return self.limit
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limit, its bounds and the signals behind it"""
+        lower, upper = self.bounds
+        return {"limit": self.limit, "min": lower, "max": upper, **self.last_signals}
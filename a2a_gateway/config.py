@@ -1,5 +1,9 @@
 """Configuration management for A2A Coding Gateway"""
 
+import os
+import socket
+import tempfile
+
 from pydantic_settings import BaseSettings
 from pydantic.fields import Field
 from typing import Optional
@@ -14,12 +18,131 @@ class Settings(BaseSettings):
     max_concurrent_tasks: int = Field(
         default=5, description="Maximum number of concurrent tasks"
     )
+    max_queue_depth: int = Field(
+        default=20,
+        description="Maximum number of tasks waiting for a slot before new ones are rejected",
+    )
     default_timeout: int = Field(
         default=600, description="Default task timeout in seconds"
     )
     task_timeout: int = Field(
         default=300, description="Task execution timeout in seconds"
     )
+    kill_grace_seconds: float = Field(
+        default=5.0,
+        description="Seconds between SIGTERM and SIGKILL for timed-out or canceled tools",
+    )
+    executor_mode: str = Field(
+        default="inline",
+        description="Where tools are supervised: inline (API process) or workers",
+    )
+    executor_workers: int = Field(
+        default=2, description="Number of executor worker processes in workers mode"
+    )
+    executor_output_queue_chars: int = Field(
+        default=1024 * 1024,
+        description="Characters of tool output a worker queues for the API process before dropping the oldest",
+    )
+
+    # Tool output configuration
+    output_ring_bytes: int = Field(
+        default=128 * 1024,
+        description="Most recent output bytes kept in memory per task",
+    )
+    output_head_bytes: int = Field(
+        default=16 * 1024, description="Leading output bytes kept in memory per task"
+    )
+    output_normalize: bool = Field(
+        default=True,
+        description="Strip terminal control sequences and collapse redrawn lines",
+    )
+    output_log_dir: str = Field(
+        default=os.path.join(tempfile.gettempdir(), "a2a-gateway"),
+        description="Directory for full logs of output that overflows memory",
+    )
+
+    # Streaming configuration
+    stream_history_bytes: int = Field(
+        default=1024 * 1024,
+        description="Output bytes of event history kept per task for resubscribe",
+    )
+    stream_retention_seconds: int = Field(
+        default=300, description="Seconds to keep a finished task's event history"
+    )
+    stream_keepalive_seconds: int = Field(
+        default=15, description="Interval of SSE keep-alive comments"
+    )
+    stream_poll_seconds: float = Field(
+        default=2.0,
+        description="Interval of task state polls for streams of tasks whose events are held elsewhere",
+    )
+
+    # Adaptive concurrency configuration
+    adaptive_concurrency: bool = Field(
+        default=False,
+        description="Whether to adjust the concurrency limit to host load and task latency",
+    )
+    adaptive_min_concurrency: int = Field(
+        default=1, description="Lowest concurrency limit the adaptive limiter sets"
+    )
+    adaptive_max_concurrency: Optional[int] = Field(
+        default=None,
+        description="Highest concurrency limit the adaptive limiter sets (default: CPU count)",
+    )
+    adaptive_interval: float = Field(
+        default=5.0, description="Seconds between adaptive limit adjustments"
+    )
+    adaptive_target_load: float = Field(
+        default=1.0,
+        description="1-minute load average per CPU above which the limit is lowered",
+    )
+    adaptive_min_free_memory: float = Field(
+        default=0.1,
+        description="Fraction of available memory below which the limit is lowered",
+    )
+    adaptive_latency_tolerance: float = Field(
+        default=2.0,
+        description="Ratio of recent to baseline task duration above which the limit is lowered",
+    )
+
+    # Scheduling class configuration
+    skill_concurrency: dict[str, int] = Field(
+        default_factory=dict,
+        description="Maximum concurrent tasks per skill (skills not listed are only bound by the global limit)",
+    )
+    tenant_api_keys: dict[str, str] = Field(
+        default_factory=dict,
+        description="API key of each tenant, by tenant name; accepted like api_key",
+    )
+    tenant_weights: dict[str, float] = Field(
+        default_factory=dict,
+        description="Fair-share weight per tenant (default 1.0)",
+    )
+
+    # Duplicate submission configuration
+    idempotency_ttl: int = Field(
+        default=86400, description="Seconds an idempotency key maps to its task"
+    )
+    idempotency_max_keys: int = Field(
+        default=100_000, description="Idempotency keys kept in process without Redis"
+    )
+    dedupe_in_flight: bool = Field(
+        default=False,
+        description="Whether identical in-flight submissions (same tenant, skill and normalized message) share one task",
+    )
+
+    # Resource limit configuration
+    tool_limits: dict[str, dict[str, float]] = Field(
+        default_factory=dict,
+        description=(
+            "Resource limits per skill (plus a 'default' entry): cpu_seconds, "
+            "memory_bytes, open_files, file_size_bytes, processes, cpus"
+        ),
+    )
+    cgroup_root: Optional[str] = Field(
+        default=None,
+        description="Delegated cgroup v2 directory in which per-task groups are created",
+    )
 
     # Redis configuration
     redis_url: Optional[str] = Field(
@@ -28,8 +151,83 @@ class Settings(BaseSettings):
     redis_enabled: bool = Field(
         default=False, description="Whether to use Redis for task storage"
     )
+    count_refresh_interval: float = Field(
+        default=2.0,
+        description="Seconds between refreshes of the Redis task counts shown by /health",
+    )
+    near_cache_enabled: bool = Field(
+        default=False,
+        description="Whether to cache task snapshots read from Redis in process",
+    )
+    near_cache_max_entries: int = Field(
+        default=10000, description="Task snapshots kept in the near-cache"
+    )
+    near_cache_ttl: float = Field(
+        default=5.0,
+        description="Seconds an unfinished task's snapshot may be served if an invalidation is lost",
+    )
+    near_cache_terminal_ttl: float = Field(
+        default=300.0, description="Seconds a finished task's snapshot is cached"
+    )
+    redis_codec: str = Field(
+        default="json",
+        description="Encoding of task values in Redis: json, orjson or msgpack",
+    )
+    redis_compress_threshold: Optional[int] = Field(
+        default=None,
+        description="Encoded size in bytes from which Redis values are zstd-compressed (off if unset)",
+    )
     task_retention_days: int = Field(
-        default=7, description="Number of days to retain completed tasks"
+        default=7,
+        description="Number of days to retain finished tasks whose state has no entry in task_retention_seconds",
+    )
+    task_retention_seconds: dict[str, int] = Field(
+        default_factory=lambda: {"completed": 86400, "failed": 7 * 86400},
+        description="Seconds to retain finished tasks, per terminal state",
+    )
+    max_retained_tasks: Optional[int] = Field(
+        default=None,
+        description="Finished tasks kept in memory before the least recently used are evicted",
+    )
+    max_retained_artifact_bytes: Optional[int] = Field(
+        default=None,
+        description="Artifact bytes of finished tasks kept in memory before the least recently used are evicted",
+    )
+    retention_sweep_interval: float = Field(
+        default=60.0, description="Seconds between passes over expired tasks"
+    )
+    retention_sweep_batch_size: int = Field(
+        default=500,
+        description="Expired tasks deleted from Redis per round-trip of a sweep",
+    )
+    retention_sweep_pause: float = Field(
+        default=0.01,
+        description="Seconds a Redis sweep pauses between batches",
+    )
+
+    # Cluster configuration
+    cluster_mode: bool = Field(
+        default=False,
+        description="Whether nodes pull tasks from the shared Redis queue (requires Redis)",
+    )
+    node_id: str = Field(
+        default_factory=lambda: f"{socket.gethostname()}-{os.getpid()}",
+        description="Name of this gateway node in leases",
+    )
+    lease_seconds: float = Field(
+        default=30.0,
+        description="Seconds a node's claim on a running task lasts without renewal",
+    )
+    lease_max_retries: int = Field(
+        default=2,
+        description="Times a task whose lease expired is requeued before it fails",
+    )
+    recovery_interval: float = Field(
+        default=30.0, description="Seconds between passes over expired leases"
+    )
+    cluster_poll_interval: float = Field(
+        default=5.0,
+        description="Seconds between queue polls when no submission is announced",
     )
 
     # Tools configuration
@@ -37,6 +235,60 @@ class Settings(BaseSettings):
     claude_command: str = Field(
         default="claude", description="Command to run Claude Code"
     )
+    tool_probe_ttl: int = Field(
+        default=300, description="Seconds a cached tool version probe stays valid"
+    )
+
+    # Result cache configuration
+    result_cache_enabled: bool = Field(
+        default=False, description="Whether to cache results of deterministic skills"
+    )
+    result_cache_skills: list[str] = Field(
+        default_factory=lambda: ["generate_dockerfile"],
+        description="Skills whose results are cached",
+    )
+    result_cache_ttl: int = Field(
+        default=3600, description="Seconds a cached result stays valid"
+    )
+    result_cache_max_entries: int = Field(
+        default=1024, description="Results kept in the in-process cache tier"
+    )
+    result_cache_max_files: int = Field(
+        default=20000, description="Workdirs with more files than this are not cached"
+    )
+    result_cache_redis: bool = Field(
+        default=False, description="Whether to share cached results through Redis"
+    )
+
+    # Warm pool configuration
+    warm_pool_size: int = Field(
+        default=0,
+        description="Idle pre-spawned sessions kept per tool and workdir (0 disables)",
+    )
+    droid_warm_command: Optional[str] = Field(
+        default=None,
+        description="droid command started ahead of time; reads the task from stdin",
+    )
+    claude_warm_command: Optional[str] = Field(
+        default=None,
+        description="Claude Code command started ahead of time; reads the task from stdin",
+    )
+    warm_pool_max_uses: int = Field(
+        default=1, description="Tasks served by a warm session before it is recycled"
+    )
+    warm_pool_max_age: int = Field(
+        default=600, description="Seconds after which a warm session is recycled"
+    )
+    warm_pool_ready_pattern: Optional[str] = Field(
+        default=None,
+        description="Regex printed by a tool when ready for its next task (enables reuse)",
+    )
+    warm_pool_workdirs: list[str] = Field(
+        default_factory=list, description="Working directories to pre-warm at startup"
+    )
+    warm_pool_max_workdirs: int = Field(
+        default=4, description="Working directories kept warm at the same time"
+    )
 
     # Security configuration
     api_key: Optional[str] = Field(
@@ -0,0 +1,210 @@
+"""Eager task dispatch for A2A Coding Gateway"""
+
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+import structlog
+
+from a2a_gateway.config import settings
+from a2a_gateway.metrics import TASKS_RECOVERED
+from a2a_gateway.scheduler import DEFAULT_TENANT, task_scheduler
+from a2a_gateway.tasks import task_store
+from a2a_gateway.tools import (
+    cancel_task_execution,
+    launch_task_execution,
+    running_executions,
+)
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+
+class TaskDispatcher:
+    """Starts tasks as soon as they are submitted.
+
+    The task store notifies the dispatcher of every new task. Each one is
+    claimed atomically (submitted -> working) before it is launched, so a
+    task never runs twice and canceled tasks are skipped.
+
+    Claimed tasks are leased to this node, which renews the leases of its
+    running tasks on a heartbeat. A recovery pass, at startup and then every
+    ``recovery_interval`` seconds, requeues tasks whose lease expired up to
+    ``lease_max_retries`` times and fails them after that.
+
+    In cluster mode, shared tasks are not run where they were submitted:
+    every node pulls from the Redis queue while it has free slots, so the
+    least loaded nodes take the work. Submissions and cancellations are
+    announced over Redis pub/sub.
+    """
+
+    def __init__(self):
+        self.pending: Deque[str] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._background: List[asyncio.Task] = []
+
+    @property
+    def cluster(self) -> bool:
+        """Whether tasks are pulled from the shared Redis queue"""
+        return settings.cluster_mode and task_store.shared
+
+    async def start(self):
+        """Start dispatching newly submitted tasks"""
+        if settings.cluster_mode and not task_store.shared:
+            logger.warning("Cluster mode requires Redis, dispatching locally")
+        self._wakeup = asyncio.Event()
+        task_store.submit_hooks.append(self.notify)
+
+        # Pick up work left by a previous run of the gateway
+        try:
+            await self.recover()
+            if not self.cluster:
+                self.pending.extend(await task_store.get_pending_task_ids())
+        except Exception as e:
+            logger.error("Task recovery failed", error=str(e))
+
+        self._background = [
+            asyncio.create_task(self._run()),
+            asyncio.create_task(self._heartbeat()),
+            asyncio.create_task(self._recovery()),
+        ]
+        if self.cluster:
+            # Tasks waiting in the shared queue are demand for more slots
+            task_scheduler.backlog = self._cluster_backlog
+            self._background.append(asyncio.create_task(self._watch_cluster()))
+            logger.info("Cluster dispatch started", node_id=settings.node_id)
+        self._wakeup.set()
+
+    async def close(self):
+        """Stop dispatching"""
+        if self.notify in task_store.submit_hooks:
+            task_store.submit_hooks.remove(self.notify)
+        if task_scheduler.backlog == self._cluster_backlog:
+            task_scheduler.backlog = lambda: 0
+        for task in self._background:
+            task.cancel()
+        self._background = []
+
+    def notify(self, task_id: str, shared: bool = True):
+        """Queue a newly submitted task for dispatch"""
+        if not (self.cluster and shared):
+            self.pending.append(task_id)
+        self._wakeup.set()
+
+    async def dispatch(self, task_id: str) -> bool:
+        """Claim a submitted task and launch it; False if already taken"""
+        task = await task_store.claim_task(task_id)
+        if task is None:
+            return False
+        self._launch(task)
+        return True
+
+    async def recover(self) -> int:
+        """Requeue or fail tasks whose lease expired; returns how many"""
+        recovered = 0
+        for task_id in await task_store.get_expired_leases():
+            if task_id in running_executions:
+                # Still running here; renewal failed and the heartbeat retries
+                continue
+            if not await task_store.take_expired_lease(task_id):
+                continue
+            task = await task_store.get_task(task_id, artifacts=False)
+            if task is None or task["status"]["state"] != "working":
+                continue
+
+            recovered += 1
+            recoveries = task.get("recoveries", 0)
+            if recoveries < settings.lease_max_retries:
+                logger.warning(
+                    "Requeuing task with expired lease",
+                    task_id=task_id,
+                    recoveries=recoveries,
+                )
+                await task_store.requeue_task(task_id)
+                TASKS_RECOVERED.labels(outcome="requeued").inc()
+            else:
+                error = f"Task lease expired after {recoveries + 1} attempts"
+                logger.error("Failing task with expired lease", task_id=task_id)
+                await task_store.finish_task(
+                    task_id, "failed", {"artifacts": [], "error": error}
+                )
+                TASKS_RECOVERED.labels(outcome="failed").inc()
+        return recovered
+
+    def _cluster_backlog(self) -> int:
+        # Cached counts: the adjustment loop must not wait on Redis
+        return task_store.state_counts()["states"].get("submitted", 0)
+
+    def _launch(self, task: Dict[str, Any]):
+        execution = launch_task_execution(
+            task["id"],
+            task["message"],
+            task["skill"],
+            task.get("priority", 0),
+            task.get("tenant", DEFAULT_TENANT),
+        )
+        if self.cluster:
+            # A finished task frees a slot for the next pull
+            execution.add_done_callback(lambda _: self._wakeup.set())
+
+    async def _run(self):
+        timeout = settings.cluster_poll_interval if self.cluster else None
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while self.pending:
+                task_id = self.pending.popleft()
+                try:
+                    await self.dispatch(task_id)
+                except Exception as e:
+                    logger.error("Task dispatch failed", task_id=task_id, error=str(e))
+            if self.cluster:
+                await self._pull()
+
+    async def _pull(self):
+        try:
+            while len(running_executions) < task_scheduler.limit:
+                task = await task_store.claim_next_task()
+                if task is None:
+                    return
+                logger.debug("Pulled task from cluster queue", task_id=task["id"])
+                self._launch(task)
+        except Exception as e:
+            logger.error("Cluster queue pull failed", error=str(e))
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(settings.lease_seconds / 3)
+            try:
+                await task_store.renew_leases(list(running_executions))
+            except Exception as e:
+                logger.error("Lease renewal failed", error=str(e))
+
+    async def _recovery(self):
+        while True:
+            await asyncio.sleep(settings.recovery_interval)
+            try:
+                await self.recover()
+            except Exception as e:
+                logger.error("Task recovery failed", error=str(e))
+
+    async def _watch_cluster(self):
+        def on_cancel(task_id: str):
+            if task_id in running_executions:
+                asyncio.create_task(cancel_task_execution(task_id))
+
+        while True:
+            try:
+                await task_store.watch_cluster(
+                    lambda _: self._wakeup.set(), on_cancel
+                )
+            except Exception as e:
+                logger.error("Cluster subscription failed", error=str(e))
+            # Polling still finds submitted tasks while resubscribing
+            await asyncio.sleep(settings.cluster_poll_interval)
+
+
+task_dispatcher = TaskDispatcher()
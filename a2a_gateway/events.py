@@ -0,0 +1,160 @@
+"""Task event streams for A2A Coding Gateway"""
+
+import asyncio
+import itertools
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+from a2a_gateway.config import settings
+
+Event = Tuple[int, Dict[str, Any]]
+
+# States after which a task produces no further events
+TERMINAL_STATES = ("completed", "failed", "canceled")
+
+
+class _TaskStream:
+    """Sequenced event history of a single task"""
+
+    __slots__ = ("events", "history_bytes", "next_seq", "final", "changed")
+
+    def __init__(self):
+        self.events: Deque[Tuple[int, Dict[str, Any], int]] = deque()
+        self.history_bytes = 0
+        self.next_seq = 1
+        self.final = False
+        self.changed = asyncio.Event()
+
+
+class TaskEventBus:
+    """In-process publish/subscribe of task status and artifact events.
+
+    Every event gets a per-task sequence number so that a reconnecting client
+    can resume after the last event it saw. History is bounded in bytes per
+    task and dropped a while after the task reaches a final state.
+    """
+
+    def __init__(self):
+        self.streams: Dict[str, _TaskStream] = {}
+
+    def publish_status(
+        self, task_id: str, state: str, timestamp: str, final: bool = False
+    ) -> int:
+        """Publish a TaskStatusUpdateEvent"""
+        event = {
+            "id": task_id,
+            "status": {"state": state, "timestamp": timestamp},
+            "final": final,
+        }
+        return self._publish(task_id, event, 0, final)
+
+    def publish_output(self, task_id: str, text: str) -> int:
+        """Publish a TaskArtifactUpdateEvent carrying a chunk of tool output"""
+        event = {
+            "id": task_id,
+            "artifact": {
+                "type": "text",
+                "data": {"output": text},
+                "index": 0,
+                "append": True,
+                "lastChunk": False,
+            },
+        }
+        return self._publish(task_id, event, len(text), False)
+
+    def has_stream(self, task_id: str) -> bool:
+        """Whether events for a task are held by this process"""
+        return task_id in self.streams
+
+    async def read(
+        self, task_id: str, after: int, timeout: float
+    ) -> Tuple[List[Event], bool]:
+        """Return events with a sequence number above ``after``.
+
+        Waits up to ``timeout`` seconds for new events. The second value is
+        True once the stream is final and every event has been returned.
+        Streams are only created by publishing, so a task whose events this
+        process does not hold reads as empty and not final; callers check
+        :meth:`has_stream` first.
+        """
+        stream = self.streams.get(task_id)
+        if stream is None:
+            return [], False
+
+        events = self._events_after(task_id, stream, after)
+        if not events and not stream.final:
+            changed = stream.changed
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                return [], False
+            events = self._events_after(task_id, stream, after)
+
+        return events, stream.final
+
+    def _publish(
+        self, task_id: str, event: Dict[str, Any], size: int, final: bool
+    ) -> int:
+        stream = self.streams.get(task_id)
+        if stream is None:
+            stream = self.streams[task_id] = _TaskStream()
+
+        seq = stream.next_seq
+        stream.next_seq += 1
+        stream.events.append((seq, event, size))
+        stream.history_bytes += size
+        while (
+            stream.history_bytes > settings.stream_history_bytes
+            and len(stream.events) > 1
+        ):
+            _, _, dropped = stream.events.popleft()
+            stream.history_bytes -= dropped
+
+        if final and not stream.final:
+            stream.final = True
+            asyncio.get_running_loop().call_later(
+                settings.stream_retention_seconds, self.streams.pop, task_id, None
+            )
+
+        # Wake current readers and arm a fresh event for the next ones
+        stream.changed.set()
+        stream.changed = asyncio.Event()
+        return seq
+
+    @staticmethod
+    def _events_after(task_id: str, stream: _TaskStream, after: int) -> List[Event]:
+        if not stream.events or stream.events[-1][0] <= after:
+            return []
+        first = stream.events[0][0]
+        start = max(after + 1 - first, 0)
+        events = [
+            (seq, event)
+            for seq, event, _ in itertools.islice(stream.events, start, None)
+        ]
+        if after + 1 < first:
+            # Events trimmed from history: tell the client what it missed
+            gap = {
+                "id": task_id,
+                "historyTruncated": {
+                    "firstAvailableSeq": first,
+                    "missedEvents": first - after - 1,
+                },
+            }
+            events.insert(0, (first - 1, gap))
+        return events
+
+
+def get_replay_events(task: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Rebuild the events of a finished task whose stream is no longer held"""
+    events = [
+        {
+            "id": task["id"],
+            "artifact": {**artifact, "index": index, "lastChunk": True},
+        }
+        for index, artifact in enumerate(task.get("artifacts", []))
+    ]
+    events.append({"id": task["id"], "status": task["status"], "final": True})
+    return events
+
+
+task_events = TaskEventBus()
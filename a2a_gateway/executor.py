@@ -0,0 +1,275 @@
+"""Out-of-process executor workers for A2A Coding Gateway"""
+
+import asyncio
+import json
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from a2a_gateway.config import settings
+from a2a_gateway.events import task_events
+from a2a_gateway.metrics import (
+    TASK_BYTES_WRITTEN,
+    TASK_CPU_SECONDS,
+    TASK_PEAK_RSS_BYTES,
+)
+from a2a_gateway.tasks import task_store
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+# Frames are a 4-byte big-endian length followed by a JSON object
+FRAME_HEADER = struct.Struct(">I")
+
+# Seconds a task waits for a worker to come up before failing
+CONNECT_TIMEOUT = 30.0
+
+# Seconds before a worker that exited is spawned again
+RESPAWN_DELAY = 1.0
+
+
+def write_frame(writer: asyncio.StreamWriter, message: Dict[str, Any]):
+    """Queue one message on an IPC connection"""
+    data = json.dumps(message, separators=(",", ":")).encode()
+    writer.write(FRAME_HEADER.pack(len(data)) + data)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """Read one message from an IPC connection, or None at end of stream"""
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+        (length,) = FRAME_HEADER.unpack(header)
+        return json.loads(await reader.readexactly(length))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+class TaskReporter:
+    """Publishes the output and resource usage of a running tool"""
+
+    def output(self, task_id: str, text: str):
+        """Publish decoded tool output to the task's event stream"""
+        task_events.publish_output(task_id, text)
+
+    async def usage(
+        self, task_id: str, skill: Optional[str], usage: Dict[str, float]
+    ):
+        """Export and store the resources used by an exited tool"""
+        label = skill or "unknown"
+        TASK_CPU_SECONDS.labels(skill=label).observe(usage["cpu_seconds"])
+        TASK_PEAK_RSS_BYTES.labels(skill=label).observe(usage["peak_rss_bytes"])
+        TASK_BYTES_WRITTEN.labels(skill=label).observe(usage["bytes_written"])
+        await task_store.update_task_usage(task_id, usage)
+
+
+class WorkerProcess:
+    """An executor worker process and the tasks it is running"""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.jobs: Dict[str, asyncio.Future] = {}
+
+    @property
+    def pid(self) -> int:
+        """Process id of the worker"""
+        return self.process.pid
+
+    @property
+    def connected(self) -> bool:
+        """Whether the worker is connected and accepts tasks"""
+        return self.writer is not None
+
+    def send(self, message: Dict[str, Any]):
+        """Send a message to the worker"""
+        if self.writer is not None:
+            write_frame(self.writer, message)
+
+    def fail(self, error: str):
+        """Disconnect and fail every task still running on the worker"""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        for future in self.jobs.values():
+            if not future.done():
+                future.set_result({"artifacts": [], "error": error})
+        self.jobs.clear()
+
+
+class WorkerPool:
+    """Worker processes that supervise coding tools outside the API process.
+
+    Workers connect back over a Unix socket and exchange length-prefixed JSON
+    frames: the API process sends ``run`` and ``cancel`` messages and receives
+    ``output``, ``usage`` and ``result`` messages. Task state stays in the API
+    process, which stores results and publishes events. A worker that exits
+    fails its running tasks and is spawned again.
+    """
+
+    def __init__(self):
+        self.workers: Dict[int, WorkerProcess] = {}
+        self.socket_path: Optional[str] = None
+        self.reporter = TaskReporter()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._supervisors: List[asyncio.Task] = []
+        self._available: Optional[asyncio.Event] = None
+        self._closing = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether tasks are executed by worker processes"""
+        return self._server is not None
+
+    async def start(self):
+        """Listen for workers and spawn them if the executor mode is workers"""
+        if settings.executor_mode != "workers":
+            return
+        self._closing = False
+        self._available = asyncio.Event()
+        self.socket_path = os.path.join(
+            tempfile.mkdtemp(prefix="a2a-executor-"), "executor.sock"
+        )
+        self._server = await asyncio.start_unix_server(
+            self._on_connect, path=self.socket_path
+        )
+        self._supervisors = [
+            asyncio.create_task(self._supervise())
+            for _ in range(settings.executor_workers)
+        ]
+        logger.info("Executor workers starting", workers=settings.executor_workers)
+
+    async def close(self):
+        """Stop every worker and the IPC listener"""
+        if self._server is None:
+            return
+        self._closing = True
+        self._server.close()
+        for worker in list(self.workers.values()):
+            worker.fail("Gateway shutting down")
+            try:
+                worker.process.terminate()
+            except ProcessLookupError:
+                pass
+        await asyncio.gather(*self._supervisors, return_exceptions=True)
+        self._supervisors = []
+        shutil.rmtree(os.path.dirname(self.socket_path), ignore_errors=True)
+        self._server = None
+
+    async def run(
+        self, task_id: str, message: Dict[str, Any], skill: str
+    ) -> Dict[str, Any]:
+        """Execute a skill on the least loaded worker and return its result"""
+        worker = await self._pick()
+        future = asyncio.get_running_loop().create_future()
+        worker.jobs[task_id] = future
+        worker.send(
+            {"type": "run", "task_id": task_id, "skill": skill, "message": message}
+        )
+        try:
+            return await future
+        except asyncio.CancelledError:
+            worker.jobs.pop(task_id, None)
+            worker.send({"type": "cancel", "task_id": task_id})
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Executor mode and the tasks running on each worker"""
+        return {
+            "mode": settings.executor_mode,
+            "workers": [
+                {
+                    "pid": worker.pid,
+                    "connected": worker.connected,
+                    "tasks": len(worker.jobs),
+                }
+                for worker in self.workers.values()
+            ],
+        }
+
+    async def _pick(self) -> WorkerProcess:
+        try:
+            await asyncio.wait_for(self._available.wait(), CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise RuntimeError("No executor worker available")
+        connected = [worker for worker in self.workers.values() if worker.connected]
+        return min(connected, key=lambda worker: len(worker.jobs))
+
+    def _update_available(self):
+        if any(worker.connected for worker in self.workers.values()):
+            self._available.set()
+        else:
+            self._available.clear()
+
+    def _worker_env(self) -> Dict[str, str]:
+        # Workers import the gateway the same way, installed or not
+        env = dict(os.environ)
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env["PYTHONPATH"] = os.pathsep.join(
+            path for path in (package_root, env.get("PYTHONPATH")) if path
+        )
+        return env
+
+    async def _supervise(self):
+        while not self._closing:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    sys.executable,
+                    "-m",
+                    "a2a_gateway.worker",
+                    self.socket_path,
+                    env=self._worker_env(),
+                )
+            except Exception as e:
+                logger.error("Failed to spawn executor worker", error=str(e))
+                await asyncio.sleep(RESPAWN_DELAY)
+                continue
+            worker = self.workers[process.pid] = WorkerProcess(process)
+            returncode = await process.wait()
+            del self.workers[process.pid]
+            worker.fail(f"Executor worker exited with code {returncode}")
+            self._update_available()
+            if not self._closing:
+                logger.error(
+                    "Executor worker exited", pid=process.pid, returncode=returncode
+                )
+                await asyncio.sleep(RESPAWN_DELAY)
+
+    async def _on_connect(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        hello = await read_frame(reader)
+        worker = self.workers.get(hello.get("pid")) if hello else None
+        if worker is None or self._closing:
+            writer.close()
+            return
+        worker.writer = writer
+        self._update_available()
+        logger.info("Executor worker connected", pid=worker.pid)
+
+        while (message := await read_frame(reader)) is not None:
+            try:
+                await self._handle(worker, message)
+            except Exception as e:
+                logger.error("Invalid executor worker message", error=str(e))
+        worker.fail("Executor worker disconnected")
+        self._update_available()
+
+    async def _handle(self, worker: WorkerProcess, message: Dict[str, Any]):
+        kind = message["type"]
+        task_id = message["task_id"]
+        if kind == "output":
+            self.reporter.output(task_id, message["text"])
+        elif kind == "usage":
+            await self.reporter.usage(task_id, message["skill"], message["usage"])
+        elif kind == "result":
+            future = worker.jobs.pop(task_id, None)
+            if future is not None and not future.done():
+                future.set_result(message["result"])
+
+
+worker_pool = WorkerPool()
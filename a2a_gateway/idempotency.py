@@ -0,0 +1,182 @@
+"""Deduplication of repeated task submissions for A2A Coding Gateway"""
+
+import hashlib
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import redis.asyncio as redis
+import structlog
+
+from a2a_gateway.config import settings
+from a2a_gateway.metrics import TASKS_DEDUPLICATED
+from a2a_gateway.result_cache import normalize_message
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+REDIS_KEY_PREFIX = "idempotency:"
+
+# States in which a task still counts as in flight for content dedupe
+IN_FLIGHT_STATES = {"submitted", "working"}
+
+# A key maps to "<task id> <epoch seconds it was taken>". A task missing
+# from the store counts as being created by the submission holding its key
+# for this long; after that it is gone (evicted or never created)
+CREATION_WINDOW = 30.0
+
+# Set KEYS[1] to ARGV[1] unless it holds a value other than ARGV[2];
+# returns the value it holds otherwise
+RESERVE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current and current ~= ARGV[2] then
+    return current
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+return false
+"""
+
+# Delete KEYS[1] if it still holds ARGV[1]
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def parse_entry(value: str) -> Tuple[str, float]:
+    """Task id of a key's value and when the key was taken (0 if unknown)"""
+    task_id, _, taken = value.partition(" ")
+    return task_id, float(taken or 0)
+
+
+class SubmissionDeduplicator:
+    """Maps repeated submissions of a task to the task created first.
+
+    A submission is keyed by the caller's idempotency key and, when
+    ``dedupe_in_flight`` is on, by a hash of its skill and normalized message.
+    Keys are scoped to the tenant and expire after ``idempotency_ttl``
+    seconds. An idempotency key keeps returning its task until it expires or
+    the task is evicted; a content key only while the task is submitted or
+    working. Keys are kept in
+    Redis when the task store uses it, so every node sees them, and in
+    process otherwise.
+    """
+
+    def __init__(self):
+        self.keys: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.redis: Optional[redis.Redis] = None
+
+    async def initialize(self):
+        """Connect to Redis if tasks are stored there"""
+        if settings.redis_enabled and settings.redis_url:
+            self.redis = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+            self._reserve = self.redis.register_script(RESERVE_SCRIPT)
+            self._release = self.redis.register_script(RELEASE_SCRIPT)
+
+    async def close(self):
+        """Close the Redis connection"""
+        if self.redis is not None:
+            await self.redis.close()
+            self.redis = None
+
+    def keys_for(
+        self,
+        tenant: str,
+        skill: str,
+        message: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+    ) -> List[Tuple[str, str]]:
+        """Dedupe keys of a submission with the reason each one stands for"""
+        keys = []
+        if idempotency_key:
+            digest = hashlib.sha256(f"{tenant}\0{idempotency_key}".encode())
+            keys.append((f"key:{digest.hexdigest()}", "idempotency_key"))
+        if settings.dedupe_in_flight:
+            digest = hashlib.sha256(
+                f"{tenant}\0{skill}\0{normalize_message(message)}".encode()
+            )
+            keys.append((f"content:{digest.hexdigest()}", "content"))
+        return keys
+
+    async def submit(
+        self,
+        keys: List[Tuple[str, str]],
+        create: Callable[[str], Awaitable[Any]],
+        get_state: Callable[[str], Awaitable[Optional[str]]],
+    ) -> Tuple[str, bool]:
+        """Run ``create`` with a new task id unless a key maps to a live task.
+
+        Returns the task id and whether the task was created by this call.
+        """
+        task_id = str(uuid.uuid4())
+        entry = f"{task_id} {time.time()!r}"
+        reserved = []
+        try:
+            for key, reason in keys:
+                existing = await self._claim(key, entry, None)
+                while existing is not None:
+                    existing_id, taken = parse_entry(existing)
+                    state = await get_state(existing_id)
+                    if state is None:
+                        # Being created by the submission holding the key,
+                        # unless that was too long ago for it to still be
+                        live = time.time() - taken < CREATION_WINDOW
+                    else:
+                        live = reason == "idempotency_key" or state in IN_FLIGHT_STATES
+                    if live:
+                        logger.info(
+                            "Duplicate submission", task_id=existing_id, reason=reason
+                        )
+                        TASKS_DEDUPLICATED.labels(reason=reason).inc()
+                        await self._release_all(reserved, entry)
+                        return existing_id, False
+                    existing = await self._claim(key, entry, existing)
+                reserved.append(key)
+            await create(task_id)
+        except BaseException:
+            await self._release_all(reserved, entry)
+            raise
+        return task_id, True
+
+    async def _claim(
+        self, key: str, entry: str, expected: Optional[str]
+    ) -> Optional[str]:
+        """Point ``key`` at ``entry`` if free or holding ``expected``; else its value"""
+        if self.redis is not None:
+            return await self._reserve(
+                keys=[REDIS_KEY_PREFIX + key],
+                args=[entry, expected or "", settings.idempotency_ttl],
+            )
+
+        now = time.monotonic()
+        current = self.keys.get(key)
+        if current is not None and current[0] > now and current[1] != expected:
+            return current[1]
+        self.keys[key] = (now + settings.idempotency_ttl, entry)
+        self.keys.move_to_end(key)
+        self._prune(now)
+        return None
+
+    async def _release_all(self, keys: List[str], entry: str):
+        for key in keys:
+            try:
+                if self.redis is not None:
+                    await self._release(keys=[REDIS_KEY_PREFIX + key], args=[entry])
+                elif self.keys.get(key, (0, None))[1] == entry:
+                    del self.keys[key]
+            except Exception as e:
+                logger.warning("Failed to release dedupe key", error=str(e))
+
+    def _prune(self, now: float):
+        # Keys share one TTL, so the oldest entries expire first
+        while self.keys:
+            expires, _ = next(iter(self.keys.values()))
+            if expires > now and len(self.keys) <= settings.idempotency_max_keys:
+                break
+            self.keys.popitem(last=False)
+
+
+submission_deduplicator = SubmissionDeduplicator()
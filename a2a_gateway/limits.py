@@ -0,0 +1,153 @@
+"""Per-task resource limits and accounting for A2A Coding Gateway"""
+
+import os
+import resource
+from typing import Any, Callable, Dict, Optional
+
+import structlog
+
+from a2a_gateway.config import settings
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+# Limit names accepted in ``tool_limits`` and the rlimit enforcing each
+RLIMITS = {
+    "cpu_seconds": resource.RLIMIT_CPU,
+    "memory_bytes": resource.RLIMIT_AS,
+    "open_files": resource.RLIMIT_NOFILE,
+    "file_size_bytes": resource.RLIMIT_FSIZE,
+    # Counts every process of the gateway's user, not only the task's
+    "processes": resource.RLIMIT_NPROC,
+}
+
+# cgroup v2 CPU period in microseconds used with the ``cpus`` limit
+CPU_PERIOD_USEC = 100_000
+
+
+def get_limits(skill: Optional[str]) -> Dict[str, Any]:
+    """Limits for a skill: the ``default`` entry overlaid by the skill's own"""
+    limits = dict(settings.tool_limits.get("default", {}))
+    if skill is not None:
+        limits.update(settings.tool_limits.get(skill, {}))
+    return limits
+
+
+class TaskCgroup:
+    """A cgroup v2 child group holding one task's processes"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @classmethod
+    def create(cls, task_id: str, limits: Dict[str, Any]) -> Optional["TaskCgroup"]:
+        """Create a group under ``cgroup_root``, or None if unavailable"""
+        root = settings.cgroup_root
+        if not root or not os.path.exists(os.path.join(root, "cgroup.controllers")):
+            return None
+        cgroup = cls(os.path.join(root, f"task-{task_id}"))
+        try:
+            os.mkdir(cgroup.path)
+            if "memory_bytes" in limits:
+                cgroup._write("memory.max", str(limits["memory_bytes"]))
+                cgroup._write("memory.swap.max", "0")
+            if "cpus" in limits:
+                quota = int(float(limits["cpus"]) * CPU_PERIOD_USEC)
+                cgroup._write("cpu.max", f"{quota} {CPU_PERIOD_USEC}")
+            if "processes" in limits:
+                cgroup._write("pids.max", str(limits["processes"]))
+        except OSError as e:
+            logger.warning("cgroup setup failed", path=cgroup.path, error=str(e))
+            cgroup.remove()
+            return None
+        return cgroup
+
+    def usage(self) -> Dict[str, float]:
+        """CPU, peak memory and bytes written by every process of the group"""
+        usage: Dict[str, float] = {}
+        try:
+            stats = dict(line.split() for line in self._read("cpu.stat").splitlines())
+            usage["cpu_seconds"] = int(stats["usage_usec"]) / 1e6
+        except (OSError, KeyError, ValueError):
+            pass
+        try:
+            usage["peak_rss_bytes"] = int(self._read("memory.peak"))
+        except (OSError, ValueError):
+            pass
+        try:
+            written = 0
+            for line in self._read("io.stat").splitlines():
+                for field in line.split()[1:]:
+                    key, _, value = field.partition("=")
+                    if key == "wbytes":
+                        written += int(value)
+            usage["bytes_written"] = written
+        except (OSError, ValueError):
+            pass
+        return usage
+
+    def remove(self) -> bool:
+        """Remove the group; fails while processes are still inside"""
+        try:
+            os.rmdir(self.path)
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError:
+            return False
+
+    def kill(self):
+        """Kill every process left in the group (kernel 5.14+)"""
+        try:
+            self._write("cgroup.kill", "1")
+        except OSError:
+            pass
+
+    def _read(self, name: str) -> str:
+        with open(os.path.join(self.path, name)) as f:
+            return f.read()
+
+    def _write(self, name: str, value: str):
+        with open(os.path.join(self.path, name), "w") as f:
+            f.write(value)
+
+
+def make_preexec(
+    limits: Dict[str, Any], cgroup: Optional[TaskCgroup]
+) -> Optional[Callable[[], None]]:
+    """Build the function that applies limits in the child before exec"""
+    rlimits = [
+        (RLIMITS[name], int(value))
+        for name, value in limits.items()
+        if name in RLIMITS
+        # Enforced by the cgroup instead, which is more precise
+        and not (cgroup is not None and name in ("memory_bytes", "processes"))
+    ]
+    if not rlimits and cgroup is None:
+        return None
+    procs = os.path.join(cgroup.path, "cgroup.procs") if cgroup else None
+
+    def preexec():
+        if procs is not None:
+            with open(procs, "w") as f:
+                f.write("0")
+        for limit, value in rlimits:
+            resource.setrlimit(limit, (value, value))
+
+    return preexec
+
+
+def collect_usage(rusage, cgroup: Optional[TaskCgroup]) -> Dict[str, float]:
+    """Resource usage of a finished tool from wait4 rusage and its cgroup"""
+    usage = {
+        "cpu_seconds": rusage.ru_utime + rusage.ru_stime,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_bytes": rusage.ru_maxrss * 1024,
+        # ru_oublock counts 512-byte blocks
+        "bytes_written": rusage.ru_oublock * 512,
+    }
+    if cgroup is not None:
+        # The group also covers descendants that were never waited for
+        for key, value in cgroup.usage().items():
+            usage[key] = max(usage[key], value)
+    return usage
@@ -0,0 +1,23 @@
+"""Logging setup for A2A Coding Gateway processes"""
+
+import sys
+
+import structlog
+
+
+def configure_logging():
+    """Configure structured logging"""
+    structlog.configure(
+        processors=[
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.add_log_level,
+            structlog.processors.StackInfoRenderer(),
+            (
+                structlog.dev.ConsoleRenderer()
+                if sys.stdout.isatty()
+                else structlog.processors.JSONRenderer()
+            ),
+        ],
+        logger_factory=structlog.PrintLoggerFactory(),
+        cache_logger_on_first_use=True,
+    )
@@ -1,7 +1,6 @@
 """A2A Coding Gateway - FastAPI application"""
 
 import contextlib
-import sys
 
 import structlog
 from fastapi import FastAPI
@@ -12,24 +11,19 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
 from a2a_gateway.config import settings
+from a2a_gateway.dispatcher import task_dispatcher
+from a2a_gateway.executor import worker_pool
+from a2a_gateway.registry import tool_registry
+from a2a_gateway.idempotency import submission_deduplicator
+from a2a_gateway.log import configure_logging
+from a2a_gateway.result_cache import result_cache
 from a2a_gateway.routes import router
+from a2a_gateway.scheduler import task_scheduler
 from a2a_gateway.tasks import task_store
+from a2a_gateway.warm_pool import warm_pools
 
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.add_log_level,
-        structlog.processors.StackInfoRenderer(),
-        (
-            structlog.dev.ConsoleRenderer()
-            if sys.stdout.isatty()
-            else structlog.processors.JSONRenderer()
-        ),
-    ],
-    logger_factory=structlog.PrintLoggerFactory(),
-    cache_logger_on_first_use=True,
-)
+
+configure_logging()
 
 logger = structlog.get_logger(__name__)
 
@@ -42,10 +36,26 @@ async def lifespan(app: FastAPI):
 
     logger.info("Starting A2A Coding Gateway", version=__version__)
     await task_store.initialize()
+    await tool_registry.start()
+    await result_cache.initialize()
+    await submission_deduplicator.initialize()
+    await worker_pool.start()
+    if not worker_pool.enabled:
+        # Executor workers keep warm pools of their own
+        await warm_pools.start()
+    await task_scheduler.start()
+    await task_dispatcher.start()
 
     yield
 
     logger.info("Shutting down A2A Coding Gateway")
+    await task_dispatcher.close()
+    await task_scheduler.close()
+    await warm_pools.close()
+    await worker_pool.close()
+    await tool_registry.close()
+    await submission_deduplicator.close()
+    await result_cache.close()
     await task_store.close()
 
 
@@ -84,11 +94,17 @@ async def health_check(detailed: bool = False):
         "status": "healthy",
         "version": __version__,
         "active_tasks": task_store.active_count,
+        "tasks": task_store.state_counts(),
         "max_concurrent_tasks": settings.max_concurrent_tasks,
+        "queue": task_scheduler.stats(),
     }
 
-    if detailed and settings.redis_enabled:
-        health_status["redis"] = await task_store.check_redis_health()
+    if detailed:
+        if settings.redis_enabled:
+            health_status["redis"] = await task_store.check_redis_health()
+        health_status["tools"] = tool_registry.stats()
+        health_status["warm_pools"] = warm_pools.stats()
+        health_status["executor"] = worker_pool.stats()
 
     return health_status
 
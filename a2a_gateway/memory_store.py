@@ -1,86 +1,305 @@
 """In-memory task store implementation"""
 
 import asyncio
-from datetime import datetime, UTC
-from typing import Any, Dict, Optional
+import heapq
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+from a2a_gateway.config import settings
+from a2a_gateway.metrics import TASKS_EVICTED
+from a2a_gateway.models import (
+    TaskRecord,
+    TaskState,
+    isoformat,
+    max_retention_seconds,
+    retention_seconds,
+)
+from a2a_gateway.output import remove_log, sweep_logs
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+ACTIVE_STATES = (TaskState.SUBMITTED, TaskState.WORKING)
+
+
+def estimated_size(value: Any) -> int:
+    """Approximate bytes of a JSON-like value, from its string lengths"""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(key) + estimated_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(estimated_size(item) for item in value)
+    return 8
 
 
 class InMemoryTaskStore:
-    """In-memory task store implementation"""
+    """In-memory task store implementation.
+
+    Tasks are kept as :class:`TaskRecord` objects with their artifacts in a
+    separate map, and indexed by state, so counts and state queries do not scan the
+    store. No method awaits while it reads or changes a task, so every call
+    is atomic on the event loop and needs no lock.
+
+    Finished tasks are kept for ``retention_seconds(state)`` after they
+    finish; a background sweeper pops expired ones off a min-heap of expiry
+    times. If ``max_retained_tasks`` or ``max_retained_artifact_bytes`` is
+    set, the least recently used finished tasks are evicted as soon as a cap
+    is exceeded. Active tasks are never evicted.
+    """
 
     def __init__(self):
-        self.tasks: Dict[str, Dict[str, Any]] = {}
-        self.lock = asyncio.Lock()
+        self.tasks: Dict[str, TaskRecord] = {}
+        self.artifacts: Dict[str, List[Dict[str, Any]]] = {}
+        # Ids of the tasks in each state, in the order they entered it
+        self.by_state: DefaultDict[TaskState, Dict[str, None]] = defaultdict(dict)
+        # Lease expiry (epoch seconds) of claimed tasks
+        self.leases: Dict[str, float] = {}
+        # Finished tasks: (expiry, id) heap, least recently used first order
+        # and artifact sizes
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.finished: "OrderedDict[str, None]" = OrderedDict()
+        self.artifact_bytes: Dict[str, int] = {}
+        self.finished_artifact_bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
 
     async def initialize(self):
         """Initialize task store"""
-        pass
+        self._sweeper = asyncio.create_task(self._sweep_periodically())
 
     async def close(self):
         """Close task store"""
-        pass
-
-    async def create_task(self, task_id: str, message: Dict[str, Any], skill: str):
-        """Create a new task"""
-        async with self.lock:
-            self.tasks[task_id] = {
-                "id": task_id,
-                "message": message,
-                "skill": skill,
-                "status": {
-                    "state": "submitted",
-                    "timestamp": datetime.now(UTC).isoformat(),
-                    "error": None,
-                },
-                "artifacts": [],
-                "created_at": datetime.now(UTC).isoformat(),
-            }
-
-    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Get task by ID"""
-        async with self.lock:
-            return self.tasks.get(task_id)
-
-    async def update_task_status(self, task_id: str, status: str):
-        """Update task status"""
-        async with self.lock:
-            if task_id in self.tasks:
-                self.tasks[task_id]["status"]["state"] = status
-                self.tasks[task_id]["status"]["timestamp"] = datetime.now(
-                    UTC
-                ).isoformat()
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    async def create_task(
+        self,
+        task_id: str,
+        message: Dict[str, Any],
+        skill: str,
+        priority: int = 0,
+        tenant: str = "anonymous",
+        shared: bool = True,
+    ):
+        """Create a new task (``shared`` only matters to shared stores)"""
+        self.tasks[task_id] = TaskRecord(task_id, message, skill, priority, tenant)
+        self.by_state[TaskState.SUBMITTED][task_id] = None
+
+    async def get_task(
+        self, task_id: str, artifacts: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Get task by ID, with its artifacts unless told not to"""
+        task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        if task_id in self.finished:
+            self.finished.move_to_end(task_id)
+        return task.to_dict(self.artifacts.get(task_id) if artifacts else None)
+
+    async def get_task_state(self, task_id: str) -> Optional[str]:
+        """State of a task, without building the task object"""
+        task = self.tasks.get(task_id)
+        return task.state.value if task else None
+
+    async def claim_task(
+        self, task_id: str, owner: Optional[str] = None, lease_seconds: float = 0
+    ) -> Optional[Dict[str, Any]]:
+        """Move a submitted task to working; None if it is not submitted"""
+        task = self.tasks.get(task_id)
+        if task is None or task.state != TaskState.SUBMITTED:
+            return None
+        self._set_state(task, TaskState.WORKING)
+        if owner is not None:
+            self.leases[task_id] = time.time() + lease_seconds
+        return task.to_dict(self.artifacts.get(task_id))
+
+    async def renew_leases(
+        self, owner: str, task_ids: Iterable[str], lease_seconds: float
+    ):
+        """Extend the leases on running tasks"""
+        expiry = time.time() + lease_seconds
+        for task_id in task_ids:
+            if task_id in self.leases:
+                self.leases[task_id] = expiry
+
+    async def get_expired_leases(self) -> List[str]:
+        """Ids of tasks whose lease has expired"""
+        now = time.time()
+        return [task_id for task_id, expiry in self.leases.items() if expiry <= now]
+
+    async def take_expired_lease(self, task_id: str) -> bool:
+        """Drop a lease if it is still expired; True if this call dropped it"""
+        expiry = self.leases.get(task_id)
+        if expiry is None or expiry > time.time():
+            return False
+        del self.leases[task_id]
+        return True
+
+    async def requeue_task(self, task_id: str) -> bool:
+        """Return a working task to submitted, counting the recovery"""
+        task = self.tasks.get(task_id)
+        if task is None or task.state != TaskState.WORKING:
+            return False
+        self._set_state(task, TaskState.SUBMITTED)
+        task.recoveries += 1
+        self.leases.pop(task_id, None)
+        return True
+
+    async def get_pending_task_ids(self) -> List[str]:
+        """Ids of submitted tasks"""
+        return list(self.by_state[TaskState.SUBMITTED])
+
+    async def update_task_status(self, task_id: str, status: str) -> bool:
+        """Update task status; False if the task is missing or finished"""
+        task = self.tasks.get(task_id)
+        if task is None or task.state.terminal:
+            return False
+        self._set_state(task, TaskState(status))
+        # Only working tasks hold a lease
+        if status != TaskState.WORKING:
+            self.leases.pop(task_id, None)
+        return True
 
     async def update_task_result(self, task_id: str, result: Dict[str, Any]):
         """Update task result"""
-        async with self.lock:
-            if task_id in self.tasks:
-                self.tasks[task_id]["artifacts"] = result.get("artifacts", [])
-                if "error" in result:
-                    self.tasks[task_id]["status"]["error"] = result["error"]
+        if task_id in self.tasks:
+            artifacts = result.get("artifacts", [])
+            self.artifacts[task_id] = artifacts
+            if "error" in result:
+                self.tasks[task_id].error = result["error"]
+            size = result.get("artifact_bytes")
+            if size is None:
+                size = estimated_size(artifacts)
+            self._set_artifact_bytes(task_id, size)
+
+    async def finish_task(
+        self,
+        task_id: str,
+        status: str,
+        result: Dict[str, Any],
+        owner: Optional[str] = None,
+    ) -> bool:
+        """Record a working task's result and final status in one step.
+
+        Returns False, changing nothing, if the task is no longer working.
+        """
+        task = self.tasks.get(task_id)
+        if task is None or task.state != TaskState.WORKING:
+            return False
+        await self.update_task_result(task_id, result)
+        return await self.update_task_status(task_id, status)
+
+    async def update_task_usage(self, task_id: str, usage: Dict[str, float]):
+        """Record resources used by the task's tool"""
+        if task_id in self.tasks:
+            self.tasks[task_id].usage = usage
 
     async def get_task_timestamp(self, task_id: str) -> str:
         """Get task timestamp"""
-        async with self.lock:
-            if task_id in self.tasks:
-                return self.tasks[task_id]["status"]["timestamp"]
-            return datetime.now(UTC).isoformat()
+        if task_id in self.tasks:
+            return isoformat(self.tasks[task_id].updated_at)
+        return isoformat(time.time())
 
     async def get_active_count(self) -> int:
         """Get number of active tasks"""
-        async with self.lock:
-            active_tasks = [
-                task
-                for task in self.tasks.values()
-                if task["status"]["state"] in ["submitted", "working"]
-            ]
-            return len(active_tasks)
+        return self.active_count
 
     @property
     def active_count(self) -> int:
         """Get number of active tasks (sync version)"""
-        active_tasks = [
-            task
-            for task in self.tasks.values()
-            if task["status"]["state"] in ["submitted", "working"]
-        ]
-        return len(active_tasks)
+        return sum(len(self.by_state[state]) for state in ACTIVE_STATES)
+
+    def state_counts(self) -> Tuple[Dict[str, int], Optional[float]]:
+        """Task count per state; always current, so its age is 0"""
+        return {state.value: len(self.by_state[state]) for state in TaskState}, 0.0
+
+    def count(self, state: str) -> int:
+        """Number of tasks in a state"""
+        return len(self.by_state.get(TaskState(state), ()))
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Evict finished tasks past their retention; returns how many"""
+        now = time.time() if now is None else now
+        evicted = 0
+        while self.expiry_heap and self.expiry_heap[0][0] <= now:
+            expiry, task_id = heapq.heappop(self.expiry_heap)
+            # Entries of tasks that were evicted or finished again are stale
+            if self._expiry(task_id) == expiry:
+                self._evict(task_id, "expired")
+                evicted += 1
+        if len(self.expiry_heap) > 2 * len(self.finished) + 1024:
+            # Drop the stale entries left by capacity evictions
+            self.expiry_heap = [(self._expiry(t), t) for t in self.finished]
+            heapq.heapify(self.expiry_heap)
+        return evicted
+
+    def _set_state(self, task: TaskRecord, state: TaskState):
+        task_id = task.id
+        if task.state != state:
+            self.by_state[task.state].pop(task_id, None)
+            self.by_state[state][task_id] = None
+        task.transition(state)
+
+        if state.terminal:
+            expiry = task.updated_at + retention_seconds(state.value)
+            heapq.heappush(self.expiry_heap, (expiry, task_id))
+            if task_id not in self.finished:
+                self.finished_artifact_bytes += self.artifact_bytes.get(task_id, 0)
+            self.finished[task_id] = None
+            self.finished.move_to_end(task_id)
+            self._enforce_caps()
+        elif task_id in self.finished:
+            del self.finished[task_id]
+            self.finished_artifact_bytes -= self.artifact_bytes.get(task_id, 0)
+
+    def _expiry(self, task_id: str) -> Optional[float]:
+        task = self.tasks.get(task_id)
+        if task is None or not task.state.terminal:
+            return None
+        return task.updated_at + retention_seconds(task.state.value)
+
+    def _set_artifact_bytes(self, task_id: str, size: int):
+        previous = self.artifact_bytes.get(task_id, 0)
+        self.artifact_bytes[task_id] = size
+        if task_id in self.finished:
+            self.finished_artifact_bytes += size - previous
+            self._enforce_caps()
+
+    def _enforce_caps(self):
+        max_tasks = settings.max_retained_tasks
+        max_bytes = settings.max_retained_artifact_bytes
+        while self.finished and (
+            (max_tasks is not None and len(self.finished) > max_tasks)
+            or (max_bytes is not None and self.finished_artifact_bytes > max_bytes)
+        ):
+            self._evict(next(iter(self.finished)), "capacity")
+
+    def _evict(self, task_id: str, reason: str):
+        task = self.tasks.pop(task_id, None)
+        if task is None:
+            return
+        state = task.state
+        self.by_state[state].pop(task_id, None)
+        self.artifacts.pop(task_id, None)
+        self.leases.pop(task_id, None)
+        size = self.artifact_bytes.pop(task_id, 0)
+        if task_id in self.finished:
+            del self.finished[task_id]
+            self.finished_artifact_bytes -= size
+        remove_log(task_id)
+        TASKS_EVICTED.labels(state=state.value, reason=reason).inc()
+
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(settings.retention_sweep_interval)
+            try:
+                evicted = self.sweep()
+                if evicted:
+                    logger.info("Evicted expired tasks", count=evicted)
+                sweep_logs(max_retention_seconds())
+            except Exception as e:
+                logger.error("Task retention sweep failed", error=str(e))
@@ -0,0 +1,114 @@
+"""Prometheus metrics for A2A Coding Gateway"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+WARM_POOL_REQUESTS = Counter(
+    "a2a_gateway_warm_pool_requests_total",
+    "Tool session requests served by the warm pool",
+    ["tool", "result"],
+)
+
+WARM_POOL_IDLE_SESSIONS = Gauge(
+    "a2a_gateway_warm_pool_idle_sessions",
+    "Idle pre-spawned tool sessions",
+    ["tool"],
+)
+
+RESULT_CACHE_LOOKUPS = Counter(
+    "a2a_gateway_result_cache_lookups_total",
+    "Result cache lookups by outcome (hit_memory, hit_redis, miss)",
+    ["skill", "result"],
+)
+
+TASK_RECLAIM_SECONDS = Histogram(
+    "a2a_gateway_task_reclaim_seconds",
+    "Time from cancel or timeout until the task's concurrency slot is free",
+    ["reason"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+TASK_CPU_SECONDS = Histogram(
+    "a2a_gateway_task_cpu_seconds",
+    "CPU time (user + system) used by a task's tool",
+    ["skill"],
+    buckets=(0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600),
+)
+
+TASK_PEAK_RSS_BYTES = Histogram(
+    "a2a_gateway_task_peak_rss_bytes",
+    "Peak resident memory of a task's tool",
+    ["skill"],
+    buckets=tuple(2**n * 1024 * 1024 for n in range(4, 15)),
+)
+
+TASK_BYTES_WRITTEN = Histogram(
+    "a2a_gateway_task_bytes_written",
+    "Bytes written to storage by a task's tool",
+    ["skill"],
+    buckets=tuple(2**n * 1024 * 1024 for n in range(0, 14, 2)),
+)
+
+TASK_QUEUE_DEPTH = Gauge(
+    "a2a_gateway_task_queue_depth",
+    "Tasks waiting for an execution slot",
+)
+
+TASK_QUEUE_WAIT_SECONDS = Histogram(
+    "a2a_gateway_task_queue_wait_seconds",
+    "Time tasks waited for an execution slot",
+    ["skill"],
+    buckets=(0.01, 0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600),
+)
+
+TASKS_REJECTED = Counter(
+    "a2a_gateway_tasks_rejected_total",
+    "Tasks rejected by admission control",
+    ["reason"],
+)
+
+SKILL_RUNNING_TASKS = Gauge(
+    "a2a_gateway_skill_running_tasks",
+    "Execution slots in use per skill",
+    ["skill"],
+)
+
+TENANT_RUNNING_TASKS = Gauge(
+    "a2a_gateway_tenant_running_tasks",
+    "Execution slots in use per tenant",
+    ["tenant"],
+)
+
+TASKS_RECOVERED = Counter(
+    "a2a_gateway_tasks_recovered_total",
+    "Tasks whose lease expired, by what recovery did with them",
+    ["outcome"],
+)
+
+TASKS_DEDUPLICATED = Counter(
+    "a2a_gateway_tasks_deduplicated_total",
+    "Submissions answered with an existing task (idempotency_key, content)",
+    ["reason"],
+)
+
+TASK_CONCURRENCY_LIMIT = Gauge(
+    "a2a_gateway_task_concurrency_limit",
+    "Number of tasks currently allowed to run at once",
+)
+
+TASKS_EVICTED = Counter(
+    "a2a_gateway_tasks_evicted_total",
+    "Finished tasks removed from the store, by state and reason (expired, capacity)",
+    ["state", "reason"],
+)
+
+NEAR_CACHE_LOOKUPS = Counter(
+    "a2a_gateway_near_cache_lookups_total",
+    "Task reads answered by the per-process near-cache (hit) or Redis (miss)",
+    ["result"],
+)
+
+NEAR_CACHE_INVALIDATION_LAG_SECONDS = Histogram(
+    "a2a_gateway_near_cache_invalidation_lag_seconds",
+    "Time from a task update on any node until this node drops its snapshot",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
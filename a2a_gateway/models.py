@@ -0,0 +1,117 @@
+"""Task records for A2A Coding Gateway"""
+
+import enum
+import time
+from datetime import datetime, UTC
+from typing import Any, Dict, List, Optional
+
+from a2a_gateway.config import settings
+
+
+class TaskState(str, enum.Enum):
+    """A2A task state"""
+
+    SUBMITTED = "submitted"
+    WORKING = "working"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELED = "canceled"
+
+    @property
+    def terminal(self) -> bool:
+        """Whether the task has finished"""
+        return self in (TaskState.COMPLETED, TaskState.FAILED, TaskState.CANCELED)
+
+    @property
+    def active(self) -> bool:
+        """Whether the task is waiting or running"""
+        return not self.terminal
+
+
+def isoformat(timestamp: float) -> str:
+    """ISO 8601 form of an epoch timestamp, as used in A2A responses"""
+    return datetime.fromtimestamp(timestamp, UTC).isoformat()
+
+
+def retention_seconds(state: str) -> float:
+    """Seconds a task finished in ``state`` is kept"""
+    retention = settings.task_retention_seconds.get(state)
+    if retention is None:
+        return settings.task_retention_days * 86400
+    return retention
+
+
+def max_retention_seconds() -> float:
+    """Longest time any finished task is kept"""
+    return max(retention_seconds(state.value) for state in TaskState if state.terminal)
+
+
+class TaskRecord:
+    """Stored state of a task.
+
+    Timestamps are epoch seconds and the state is a :class:`TaskState`; the
+    A2A task object is only built by :meth:`to_dict` when a caller needs it.
+    Artifacts are kept apart from the record by the stores.
+    """
+
+    __slots__ = (
+        "id",
+        "message",
+        "skill",
+        "priority",
+        "tenant",
+        "state",
+        "error",
+        "created_at",
+        "updated_at",
+        "recoveries",
+        "usage",
+    )
+
+    def __init__(
+        self,
+        task_id: str,
+        message: Dict[str, Any],
+        skill: str,
+        priority: int = 0,
+        tenant: str = "anonymous",
+        created_at: Optional[float] = None,
+    ):
+        self.id = task_id
+        self.message = message
+        self.skill = skill
+        self.priority = priority
+        self.tenant = tenant
+        self.state = TaskState.SUBMITTED
+        self.error: Optional[str] = None
+        self.created_at = time.time() if created_at is None else created_at
+        self.updated_at = self.created_at
+        self.recoveries = 0
+        self.usage: Optional[Dict[str, float]] = None
+
+    def transition(self, state: TaskState):
+        """Move to ``state`` now"""
+        self.state = state
+        self.updated_at = time.time()
+
+    def to_dict(self, artifacts: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """A2A task object"""
+        task = {
+            "id": self.id,
+            "message": self.message,
+            "skill": self.skill,
+            "priority": self.priority,
+            "tenant": self.tenant,
+            "status": {
+                "state": self.state.value,
+                "timestamp": isoformat(self.updated_at),
+                "error": self.error,
+            },
+            "artifacts": artifacts or [],
+            "created_at": isoformat(self.created_at),
+        }
+        if self.recoveries:
+            task["recoveries"] = self.recoveries
+        if self.usage is not None:
+            task["usage"] = self.usage
+        return task
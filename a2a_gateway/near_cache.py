@@ -0,0 +1,90 @@
+"""Per-process cache of task snapshots read from Redis"""
+
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from a2a_gateway.config import settings
+from a2a_gateway.metrics import NEAR_CACHE_LOOKUPS
+
+
+class NearCache:
+    """Size-bounded LRU of task snapshots, invalidated by task id.
+
+    Snapshots are cached with or without artifacts; one with artifacts also
+    serves reads that do not need them. Finished tasks rarely change and are
+    kept for ``near_cache_terminal_ttl`` seconds, others for
+    ``near_cache_ttl`` seconds, which bounds staleness if an invalidation is
+    lost. A snapshot loaded while its task is invalidated
+    is not cached, so a slow read cannot bring back an old state.
+    """
+
+    def __init__(self):
+        self.entries: "OrderedDict[Tuple[str, bool], Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+        # Loads in progress per task, and tasks invalidated during one
+        self._loading: Counter = Counter()
+        self._stale: Set[str] = set()
+
+    def get(self, task_id: str, artifacts: bool = True) -> Optional[Any]:
+        """Cached snapshot of a task, or None"""
+        now = time.monotonic()
+        keys = [(task_id, True)] if artifacts else [(task_id, True), (task_id, False)]
+        for key in keys:
+            entry = self.entries.get(key)
+            if entry is None:
+                continue
+            if entry[0] <= now:
+                del self.entries[key]
+                continue
+            self.entries.move_to_end(key)
+            self.hits += 1
+            NEAR_CACHE_LOOKUPS.labels(result="hit").inc()
+            return entry[1]
+        self.misses += 1
+        NEAR_CACHE_LOOKUPS.labels(result="miss").inc()
+        return None
+
+    def start_load(self, task_id: str):
+        """Note that a snapshot of the task is being read"""
+        self._loading[task_id] += 1
+
+    def finish_load(self, task_id: str, artifacts: bool, value: Any, terminal: bool):
+        """Cache a snapshot read since start_load, unless it went stale"""
+        self._loading[task_id] -= 1
+        stale = task_id in self._stale
+        if self._loading[task_id] <= 0:
+            del self._loading[task_id]
+            self._stale.discard(task_id)
+        if stale or value is None:
+            return
+        ttl = settings.near_cache_terminal_ttl if terminal else settings.near_cache_ttl
+        self.entries[(task_id, artifacts)] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end((task_id, artifacts))
+        while len(self.entries) > settings.near_cache_max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, task_id: str):
+        """Drop every snapshot of a task"""
+        self.entries.pop((task_id, True), None)
+        self.entries.pop((task_id, False), None)
+        if task_id in self._loading:
+            self._stale.add(task_id)
+
+    def clear(self):
+        """Drop every snapshot"""
+        self.entries.clear()
+        self._stale.update(self._loading)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries and hit ratio"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
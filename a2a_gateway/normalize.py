@@ -0,0 +1,92 @@
+"""Terminal output normalization for A2A Coding Gateway"""
+
+import re
+
+# Complete escape sequences: CSI, OSC (BEL or ST terminated), DCS/SOS/PM/APC
+# strings, and two or three byte ESC sequences such as charset selection
+ESCAPE_SEQUENCE = re.compile(
+    rb"\x1b\[[0-?]*[ -/]*[@-~]"
+    rb"|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)"
+    rb"|\x1b[PX^_][^\x1b]*\x1b\\"
+    rb"|\x1b[ -/]*[0-OQ-WYZ\\`-~]"
+)
+
+# A possibly incomplete escape sequence at the end of a chunk
+INCOMPLETE_SEQUENCE = re.compile(
+    rb"\x1b(?:\[[0-?]*[ -/]*|\][^\x07\x1b]*\x1b?|[PX^_][^\x1b]*\x1b?|[ -/]*)\Z"
+)
+
+# C0 controls other than tab, newline, carriage return, backspace and ESC
+CONTROL_CHARACTERS = re.compile(rb"[\x00-\x07\x0b\x0c\x0e-\x1a\x1c-\x1f\x7f]")
+
+# One UTF-8 encoded character followed by a backspace
+BACKSPACED_CHARACTER = re.compile(rb"(?:[\x00-\x7f]|[\xc0-\xff][\x80-\xbf]*)\x08")
+
+# Unterminated sequences longer than this are treated as garbage
+MAX_PENDING_SEQUENCE = 4096
+
+# Lines without a newline are emitted once they grow beyond this
+MAX_LINE_BYTES = 64 * 1024
+
+
+def _collapse_line(line: bytes) -> bytes:
+    """Resolve carriage-return overwrites and backspaces within one line"""
+    line = line.rstrip(b"\r")
+    if b"\r" in line:
+        line = line[line.rindex(b"\r") + 1 :]
+    while b"\x08" in line:
+        collapsed = BACKSPACED_CHARACTER.sub(b"", line)
+        if collapsed == line:
+            collapsed = line.replace(b"\x08", b"")
+        line = collapsed
+    return line
+
+
+class TerminalNormalizer:
+    """Streaming filter turning raw PTY bytes into plain text lines.
+
+    ANSI escape sequences and control characters are removed, and lines that
+    were redrawn with carriage returns (progress bars, spinners) collapse to
+    their final text. An escape sequence or line split across chunks is held
+    until the rest arrives.
+    """
+
+    def __init__(self):
+        self._pending = b""
+        self._line = b""
+
+    def feed(self, data: bytes) -> bytes:
+        """Normalize a chunk, returning the completed lines it produced"""
+        data = ESCAPE_SEQUENCE.sub(b"", self._pending + data)
+
+        # Hold back a trailing escape sequence that may still be incomplete
+        self._pending = b""
+        incomplete = INCOMPLETE_SEQUENCE.search(
+            data, max(len(data) - MAX_PENDING_SEQUENCE, 0)
+        )
+        if incomplete:
+            self._pending = data[incomplete.start() :]
+            data = data[: incomplete.start()]
+        data = CONTROL_CHARACTERS.sub(b"", data.replace(b"\x1b", b""))
+
+        lines = (self._line + data).split(b"\n")
+        self._line = lines.pop()
+        # Only the text after the last carriage return can still be shown.
+        # Trailing ones may precede a newline (ONLCR turns \r\n into \r\r\n)
+        # and are kept without looking past them.
+        overwrite = self._line.rfind(b"\r", 0, len(self._line.rstrip(b"\r")))
+        if overwrite != -1:
+            self._line = self._line[overwrite + 1 :]
+
+        output = b""
+        if lines:
+            output = b"\n".join(_collapse_line(line) for line in lines) + b"\n"
+        if len(self._line) > MAX_LINE_BYTES:
+            output += _collapse_line(self._line)
+            self._line = b""
+        return output
+
+    def flush(self) -> bytes:
+        """Return the final unterminated line at end of output"""
+        line, self._line, self._pending = self._line, b"", b""
+        return _collapse_line(line)
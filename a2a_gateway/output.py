@@ -0,0 +1,145 @@
+"""Bounded tool output buffering for A2A Coding Gateway"""
+
+import mmap
+import os
+import time
+from typing import Any, BinaryIO, Dict, Optional
+
+from a2a_gateway.config import settings
+
+
+def log_name(task_id: str) -> str:
+    """Name of a task's spilled output log within ``output_log_dir``"""
+    return f"{task_id}.log"
+
+
+def remove_log(task_id: str, log_dir: Optional[str] = None) -> bool:
+    """Delete a task's spilled output log; False if it had none"""
+    try:
+        os.unlink(os.path.join(log_dir or settings.output_log_dir, log_name(task_id)))
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def sweep_logs(max_age: float, log_dir: Optional[str] = None) -> int:
+    """Delete output logs not written to for ``max_age`` seconds; returns how many.
+
+    Catches logs whose task was removed without this node seeing it, such
+    as tasks expired by another node or left behind by a restart.
+    """
+    log_dir = log_dir or settings.output_log_dir
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(log_dir))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if not entry.name.endswith(".log"):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+class OutputBuffer:
+    """Tool output held in a bounded in-memory ring that spills to disk.
+
+    The first ``head_bytes`` and the most recent ``ring_bytes`` of output stay
+    in memory. Once the ring overflows, older bytes are appended to a log
+    file, so memory per task stays bounded however much a tool prints. Output
+    that never overflows is returned whole.
+    """
+
+    def __init__(
+        self,
+        task_id: str,
+        ring_bytes: Optional[int] = None,
+        head_bytes: Optional[int] = None,
+        log_dir: Optional[str] = None,
+    ):
+        self.task_id = task_id
+        self.ring_bytes = ring_bytes or settings.output_ring_bytes
+        self.head_bytes = head_bytes or settings.output_head_bytes
+        self.log_dir = log_dir or settings.output_log_dir
+        self.total_bytes = 0
+        self.log_path: Optional[str] = None
+        self._head = bytearray()
+        self._ring = bytearray()
+        self._log: Optional[BinaryIO] = None
+
+    @property
+    def spilled(self) -> bool:
+        """Whether output has overflowed to the log file"""
+        return self.log_path is not None
+
+    @property
+    def retained_bytes(self) -> int:
+        """Bytes of output kept in memory, and so in the artifact"""
+        if not self.spilled:
+            return self.total_bytes
+        return len(self._head) + len(self._ring)
+
+    def write(self, data: bytes):
+        """Append a chunk of output"""
+        self.total_bytes += len(data)
+        if len(self._head) < self.head_bytes:
+            self._head += data[: self.head_bytes - len(self._head)]
+        self._ring += data
+        # Spill in batches so the ring is not shifted on every chunk
+        if len(self._ring) >= 2 * self.ring_bytes:
+            self._spill(len(self._ring) - self.ring_bytes)
+
+    def close(self):
+        """Flush the ring so the log file holds the complete output"""
+        if self._log is None:
+            return
+        self._log.write(self._ring)
+        self._log.close()
+        self._log = None
+
+    def text(self) -> str:
+        """Decode the output, or a head/tail summary if it was spilled"""
+        if not self.spilled:
+            return self._ring.decode(errors="replace")
+        omitted = self.total_bytes - len(self._head) - len(self._ring)
+        return (
+            self._head.decode(errors="replace")
+            + f"\n... [{omitted} bytes omitted, full log: {log_name(self.task_id)}] ...\n"
+            + self._ring.decode(errors="replace")
+        )
+
+    def to_artifact(self, text: Optional[str] = None) -> Dict[str, Any]:
+        """Build the text artifact, referencing the full log when spilled.
+
+        The log is named relative to the gateway's log directory; server
+        paths are not exposed to clients.
+        """
+        data: Dict[str, Any] = {"output": self.text() if text is None else text}
+        if self.spilled:
+            data.update(
+                truncated=True,
+                total_bytes=self.total_bytes,
+                log_file=log_name(self.task_id),
+            )
+        return {"type": "text", "data": data}
+
+    def mmap(self) -> mmap.mmap:
+        """Map the complete log file read-only (after ``close``)"""
+        if not self.spilled:
+            raise ValueError("Output was not spilled to a log file")
+        with open(self.log_path, "rb") as log:
+            return mmap.mmap(log.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _spill(self, size: int):
+        if self._log is None:
+            os.makedirs(self.log_dir, exist_ok=True)
+            self.log_path = os.path.join(self.log_dir, log_name(self.task_id))
+            self._log = open(self.log_path, "wb")
+        self._log.write(self._ring[:size])
+        del self._ring[:size]
@@ -0,0 +1,216 @@
+"""Event-loop driven PTY process runner for A2A Coding Gateway"""
+
+import asyncio
+import os
+import pty
+import signal
+import subprocess
+from typing import Callable, List, Optional
+
+import structlog
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+# Bytes requested per read of the PTY master
+READ_CHUNK_SIZE = 64 * 1024
+
+# Seconds to keep draining the PTY after the child exits. Grandchildren that
+# inherited the slave side can keep it open indefinitely.
+DRAIN_TIMEOUT = 1.0
+
+
+class PtyProcess:
+    """A child process attached to a PTY and read via the event loop.
+
+    The PTY master is registered with ``loop.add_reader`` and child exit is
+    observed through a pidfd, so no thread is held while the tool runs. The
+    child is started in its own session so that its whole process group can
+    be signalled on timeout or cancellation.
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        cwd: str,
+        on_output: Callable[[bytes], None],
+        stdin_pipe: bool = False,
+        preexec_fn: Optional[Callable[[], None]] = None,
+    ):
+        self.command = command
+        self.cwd = cwd
+        self.on_output = on_output
+        self.stdin_pipe = stdin_pipe
+        self.preexec_fn = preexec_fn
+        self.process: Optional[subprocess.Popen] = None
+        self.returncode: Optional[int] = None
+        self.rusage = None
+        self._master: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._eof: Optional[asyncio.Future] = None
+        self._exit: Optional[asyncio.Future] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the child has been started and not yet exited"""
+        return self.process is not None and self.returncode is None
+
+    @property
+    def exited(self) -> asyncio.Future:
+        """Future resolved with the exit code once the child is reaped"""
+        return self._exit
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Process id of the child (also its process group id)"""
+        return self.process.pid if self.process is not None else None
+
+    async def start(self):
+        """Spawn the child on a new PTY and start reading its output"""
+        self._loop = asyncio.get_running_loop()
+        master, slave = pty.openpty()
+        try:
+            self.process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE if self.stdin_pipe else slave,
+                stdout=slave,
+                stderr=slave,
+                cwd=self.cwd,
+                close_fds=True,
+                start_new_session=True,
+                preexec_fn=self.preexec_fn,
+            )
+        except Exception:
+            os.close(master)
+            raise
+        finally:
+            os.close(slave)
+
+        self._master = master
+        os.set_blocking(master, False)
+        if self.stdin_pipe:
+            os.set_blocking(self.process.stdin.fileno(), False)
+        self._eof = self._loop.create_future()
+        self._loop.add_reader(master, self._on_readable)
+        self._exit = self._watch_exit()
+
+    def write(self, data: bytes):
+        """Write input to the child through the PTY"""
+        if self._master is None:
+            raise RuntimeError("PTY is closed")
+        os.write(self._master, data)
+
+    async def send(self, data: bytes, eof: bool = False):
+        """Write input to the child's stdin pipe, optionally closing it.
+
+        Unlike the PTY, a pipe is neither echoed nor limited by the terminal
+        line buffer, so it suits handing over large prompts.
+        """
+        if not self.stdin_pipe:
+            raise RuntimeError("Process was started without a stdin pipe")
+        fd = self.process.stdin.fileno()
+        view = memoryview(data)
+        while view:
+            try:
+                view = view[os.write(fd, view) :]
+            except BlockingIOError:
+                writable = self._loop.create_future()
+                self._loop.add_writer(fd, writable.set_result, None)
+                try:
+                    await writable
+                finally:
+                    self._loop.remove_writer(fd)
+        if eof:
+            self.process.stdin.close()
+
+    async def wait(self) -> int:
+        """Wait for the child to exit and its output to be drained"""
+        returncode = await asyncio.shield(self._exit)
+        try:
+            await asyncio.wait_for(asyncio.shield(self._eof), DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.debug("PTY drain timed out", pid=self.pid)
+        self._close_master()
+        return returncode
+
+    def signal_group(self, signum: int):
+        """Send a signal to the child's whole process group"""
+        if self.process is None:
+            return
+        try:
+            os.killpg(self.process.pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def close(self, grace: float = 0.0):
+        """Tear down the PTY, killing the process group if still running.
+
+        With a ``grace`` period the group gets SIGTERM first and SIGKILL once
+        it elapses. Either way this returns at once; the exit watcher stays
+        registered and reaps the child once it is gone.
+        """
+        if self.process is None:
+            return
+        if self.returncode is None:
+            if grace > 0:
+                self.signal_group(signal.SIGTERM)
+                self._loop.call_later(grace, self.signal_group, signal.SIGKILL)
+            else:
+                self.signal_group(signal.SIGKILL)
+        if self.stdin_pipe and not self.process.stdin.closed:
+            self.process.stdin.close()
+        self._close_master()
+
+    def _on_readable(self):
+        try:
+            data = os.read(self._master, READ_CHUNK_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            # EIO: every slave descriptor has been closed
+            data = b""
+        if not data:
+            self._close_master()
+            return
+        self.on_output(data)
+
+    def _close_master(self):
+        if self._master is None:
+            return
+        self._loop.remove_reader(self._master)
+        os.close(self._master)
+        self._master = None
+        if not self._eof.done():
+            self._eof.set_result(None)
+
+    def _watch_exit(self) -> asyncio.Future:
+        future = self._loop.create_future()
+        pid = self.process.pid
+
+        def _reap(status: int, rusage):
+            self.rusage = rusage
+            self.returncode = os.waitstatus_to_exitcode(status)
+            # Keep Popen from trying to reap the child a second time
+            self.process.returncode = self.returncode
+            if not future.done():
+                future.set_result(self.returncode)
+
+        try:
+            pidfd = os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            # Kernels without pidfd support fall back to a blocking wait4
+            def _wait_blocking():
+                _, status, rusage = os.wait4(pid, 0)
+                self._loop.call_soon_threadsafe(_reap, status, rusage)
+
+            self._loop.run_in_executor(None, _wait_blocking)
+            return future
+
+        def _on_exit():
+            self._loop.remove_reader(pidfd)
+            os.close(pidfd)
+            _, status, rusage = os.wait4(pid, 0)
+            _reap(status, rusage)
+
+        self._loop.add_reader(pidfd, _on_exit)
+        return future
@@ -2,112 +2,870 @@
 
 import asyncio
 import json
-from datetime import datetime, UTC
-from typing import Any, Dict, Optional
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import redis.asyncio as redis
+import structlog
+
+from a2a_gateway.codec import Codec
+from a2a_gateway.config import settings
+from a2a_gateway.metrics import NEAR_CACHE_INVALIDATION_LAG_SECONDS, TASKS_EVICTED
+from a2a_gateway.models import (
+    TaskRecord,
+    TaskState,
+    isoformat,
+    max_retention_seconds,
+    retention_seconds,
+)
+from a2a_gateway.near_cache import NearCache
+from a2a_gateway.output import remove_log, sweep_logs
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+# Pub/sub channels carrying task ids between gateway nodes
+SUBMITTED_CHANNEL = "tasks:submitted"
+CANCEL_CHANNEL = "tasks:cancel"
+# "<task id> <epoch seconds>" whenever a task changes, for near-caches
+INVALIDATE_CHANNEL = "tasks:invalidate"
+
+# Claimed tasks scored by lease expiry (epoch ms), and the node of each lease
+LEASES_KEY = "tasks:leases"
+LEASE_OWNERS_KEY = "tasks:lease_owners"
+
+# Held by the node running the retention sweep; expires on its own
+RETENTION_LOCK_KEY = "tasks:retention_lock"
+
+# Pending score offset per priority level; a higher priority sorts first
+PRIORITY_STEP = 1e6
+
+# Index set of the tasks in each state, scored by when they entered it
+# (pending tasks by priority, then age)
+STATE_INDEXES = {
+    TaskState.SUBMITTED: "tasks:pending",
+    TaskState.WORKING: "tasks:working",
+    TaskState.COMPLETED: "tasks:completed",
+    TaskState.FAILED: "tasks:failed",
+    TaskState.CANCELED: "tasks:canceled",
+}
+
+# Move a task to a new state in one step: update its hash (and artifacts),
+# move it from the index of its old state to that of the new one and take
+# or drop its lease. Returns false if the task is missing, finished, not in
+# the expected state or leased to another node than the one given, else
+# the old state or, if asked, the whole task hash.
+#
+# KEYS: task, leases, lease owners, the index of each state in
+#       STATE_INDEXES order, then the task's artifacts
+# ARGV: task id, new state, expected state or '', now (epoch seconds),
+#       priority step, '1' to count a recovery, lease expiry (epoch ms) or
+#       '', lease owner, '1' to return the task, encoded artifacts or '',
+#       channel to publish the change on or '', seconds until the task and
+#       its artifacts expire or '', node that must hold the lease if the
+#       task has one or '', then extra field/value pairs
+TRANSITION_SCRIPT = """
+local state = redis.call('HGET', KEYS[1], 'state')
+if not state or (ARGV[3] ~= '' and state ~= ARGV[3]) then
+    return false
+end
+-- Finished tasks never change again
+if state == 'completed' or state == 'failed' or state == 'canceled' then
+    return false
+end
+if ARGV[13] ~= '' then
+    local holder = redis.call('HGET', KEYS[3], ARGV[1])
+    if holder and holder ~= ARGV[13] then
+        return false
+    end
+end
+local indexes = {
+    submitted = KEYS[4], working = KEYS[5], completed = KEYS[6],
+    failed = KEYS[7], canceled = KEYS[8]
+}
+local now = tonumber(ARGV[4])
+redis.call('HSET', KEYS[1], 'state', ARGV[2], 'updated_at', ARGV[4])
+for i = 14, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+if ARGV[10] ~= '' then
+    redis.call('SET', KEYS[9], ARGV[10])
+end
+if ARGV[6] == '1' then
+    redis.call('HINCRBY', KEYS[1], 'recoveries', 1)
+end
+
+if indexes[state] and state ~= ARGV[2] then
+    redis.call('ZREM', indexes[state], ARGV[1])
+end
+local score = now
+if ARGV[2] == 'submitted' then
+    local priority = tonumber(redis.call('HGET', KEYS[1], 'priority') or '0')
+    score = now - priority * tonumber(ARGV[5])
+end
+redis.call('ZADD', indexes[ARGV[2]], score, ARGV[1])
+
+if ARGV[12] ~= '' then
+    redis.call('EXPIRE', KEYS[1], ARGV[12])
+    redis.call('EXPIRE', KEYS[9], ARGV[12])
+end
+
+-- Only working tasks hold a lease
+if ARGV[2] ~= 'working' then
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    redis.call('HDEL', KEYS[3], ARGV[1])
+elseif ARGV[7] ~= '' then
+    redis.call('ZADD', KEYS[2], ARGV[7], ARGV[1])
+    redis.call('HSET', KEYS[3], ARGV[1], ARGV[8])
+end
+
+if ARGV[11] ~= '' then
+    redis.call('PUBLISH', ARGV[11], ARGV[1] .. ' ' .. ARGV[4])
+end
+
+if ARGV[9] == '1' then
+    return redis.call('HGETALL', KEYS[1])
+end
+return state
+"""
+
+# Set fields of a task hash (KEYS[1]) and, unless ARGV[1] is '', its
+# artifacts (KEYS[2]) only if the task exists. Unless ARGV[2] is '', the
+# message ARGV[3] is published on that channel. Fields start at ARGV[4].
+SET_FIELDS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+if ARGV[1] ~= '' then
+    redis.call('SET', KEYS[2], ARGV[1], 'KEEPTTL')
+end
+if #ARGV > 3 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 4))
+end
+if ARGV[2] ~= '' then
+    redis.call('PUBLISH', ARGV[2], ARGV[3])
+end
+return 1
+"""
+
+# Atomically take the next pending task, move it to working and lease it,
+# so no crash or failed call can leave a task popped but never claimed.
+# Ids whose task is no longer submitted are dropped from the queue.
+#
+# KEYS: pending, working, leases, lease owners
+# ARGV: now (epoch seconds), lease expiry (epoch ms), lease owner, channel
+#       to publish the change on or ''
+# Task keys are derived from the popped ids, as in task_key().
+CLAIM_NEXT_SCRIPT = """
+while true do
+    local popped = redis.call('ZPOPMIN', KEYS[1])
+    if #popped == 0 then
+        return false
+    end
+    local task_id = popped[1]
+    local key = 'task:' .. task_id
+    if redis.call('HGET', key, 'state') == 'submitted' then
+        redis.call('HSET', key, 'state', 'working', 'updated_at', ARGV[1])
+        redis.call('ZADD', KEYS[2], ARGV[1], task_id)
+        redis.call('ZADD', KEYS[3], ARGV[2], task_id)
+        redis.call('HSET', KEYS[4], task_id, ARGV[3])
+        if ARGV[4] ~= '' then
+            redis.call('PUBLISH', ARGV[4], task_id .. ' ' .. ARGV[1])
+        end
+        return redis.call('HGETALL', key)
+    end
+end
+"""
+
+# Drop a lease only if it is still expired, so exactly one node recovers
+# the task and a lease renewed meanwhile is kept
+TAKE_EXPIRED_LEASE_SCRIPT = """
+local expiry = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not expiry or tonumber(expiry) > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+return 1
+"""
+
+# Extend a lock only if it is still held by the caller's token
+RENEW_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+"""
+
+
+def pending_score(priority: int, now: Optional[float] = None) -> float:
+    """Score of a task in tasks:pending: priority first, then age"""
+    return (time.time() if now is None else now) - priority * PRIORITY_STEP
+
+
+def lease_expiry(lease_seconds: float) -> int:
+    """Epoch milliseconds at which a lease taken now expires"""
+    return int((time.time() + lease_seconds) * 1000)
+
+
+def task_key(task_id: str) -> str:
+    """Key of a task's hash"""
+    return f"task:{task_id}"
+
+
+def artifacts_key(task_id: str) -> str:
+    """Key of a task's encoded artifacts, kept out of its hash"""
+    return f"artifacts:{task_id}"
+
+
+def encode_record(record: TaskRecord, codec: Codec) -> Dict[str, Any]:
+    """Hash fields of a new task"""
+    fields = {
+        "id": record.id,
+        "message": codec.dumps(record.message),
+        "skill": record.skill,
+        "priority": str(record.priority),
+        "tenant": record.tenant,
+        "state": record.state.value,
+        "created_at": repr(record.created_at),
+        "updated_at": repr(record.updated_at),
+        "recoveries": str(record.recoveries),
+    }
+    if record.error is not None:
+        fields["error"] = record.error
+    if record.usage is not None:
+        fields["usage"] = codec.dumps(record.usage)
+    return fields
+
+
+def decode_task(
+    fields: Dict[bytes, bytes], codec: Codec, artifacts: Optional[bytes] = None
+) -> Dict[str, Any]:
+    """A2A task object of a task hash and its encoded artifacts"""
+    values = {key.decode(): value for key, value in fields.items()}
+    fields = {
+        key: value.decode()
+        for key, value in values.items()
+        if key not in ("message", "usage", "artifacts")
+    }
+    record = TaskRecord(
+        fields["id"],
+        codec.loads(values["message"]),
+        fields["skill"],
+        int(fields.get("priority", 0)),
+        fields.get("tenant", "anonymous"),
+        float(fields["created_at"]),
+    )
+    record.state = TaskState(fields["state"])
+    record.updated_at = float(fields["updated_at"])
+    record.error = fields.get("error")
+    record.recoveries = int(fields.get("recoveries", 0))
+    if "usage" in values:
+        record.usage = codec.loads(values["usage"])
+    # Older gateways kept artifacts in the hash
+    artifacts = artifacts or values.get("artifacts")
+    return record.to_dict(codec.loads(artifacts) if artifacts else None)
+
+
+def legacy_task_record(task: Dict[str, Any]) -> TaskRecord:
+    """Record of a task stored as a JSON document by older gateways"""
+    record = TaskRecord(
+        task["id"],
+        task["message"],
+        task["skill"],
+        task.get("priority", 0),
+        task.get("tenant", "anonymous"),
+        datetime.fromisoformat(task["created_at"]).timestamp(),
+    )
+    record.state = TaskState(task["status"]["state"])
+    record.updated_at = datetime.fromisoformat(task["status"]["timestamp"]).timestamp()
+    record.error = task["status"].get("error")
+    record.recoveries = task.get("recoveries", 0)
+    record.usage = task.get("usage")
+    return record
+
+
+def result_fields(result: Dict[str, Any]) -> Dict[str, str]:
+    """Hash fields recording a task result"""
+    if "error" in result:
+        return {"error": str(result["error"])}
+    return {}
 
 
 class RedisTaskStore:
-    """Redis task store implementation"""
+    """Redis task store implementation.
+
+    Each task is a hash at ``task:{id}``, indexed by state in the sorted sets
+    of :data:`STATE_INDEXES`. Its artifacts, often megabytes of tool output,
+    live at ``artifacts:{id}`` and are only read when a caller needs them.
+    Structured values are encoded with the configured :class:`Codec`. State
+    transitions run as one server-side script that rewrites only the changed
+    fields and moves the task between the two index sets involved, so every
+    update is a single atomic round-trip.
+
+    With ``near_cache_enabled``, task snapshots are also kept in a
+    :class:`NearCache`. Every update publishes the task id on
+    :data:`INVALIDATE_CHANNEL`, and each node drops its snapshot on receipt;
+    the cache is only consulted while that subscription is up. Snapshots
+    are shared between callers and must not be modified.
+
+    Finished tasks expire ``retention_seconds(state)`` after they finish:
+    their keys get a TTL on the final transition, and a sweep run by one
+    node at a time trims the terminal index sets and deletes what the TTL
+    has not already removed.
+    """
 
     def __init__(self, redis_url: str):
         self.redis_url = redis_url
         self.client: Optional[redis.Redis] = None
         self.pool: Optional[redis.ConnectionPool] = None
+        self._claim_next = None
+        self._take_expired_lease = None
+        self._transition_script = None
+        self._set_fields = None
+        self._renew_lock = None
+        # Unique per store, so a lock taken over by another node is not renewed
+        self._lock_token = f"{settings.node_id}:{uuid.uuid4().hex}"
+        self.codec = Codec()
+        # Task counts per state, refreshed in the background for /health
+        self.counts: Dict[str, int] = {}
+        self.counts_refreshed: Optional[float] = None
+        self._counts_refresher: Optional[asyncio.Task] = None
+        self.near_cache: Optional[NearCache] = None
+        self._near_cache_live = False
+        self._invalidation_listener: Optional[asyncio.Task] = None
+        self._sweeper: Optional[asyncio.Task] = None
 
     async def initialize(self):
         """Initialize Redis connection"""
+        self.codec = Codec(settings.redis_codec, settings.redis_compress_threshold)
         self.pool = redis.ConnectionPool.from_url(self.redis_url)
         self.client = redis.Redis(connection_pool=self.pool)
+        self._claim_next = self.client.register_script(CLAIM_NEXT_SCRIPT)
+        self._take_expired_lease = self.client.register_script(
+            TAKE_EXPIRED_LEASE_SCRIPT
+        )
+        self._transition_script = self.client.register_script(TRANSITION_SCRIPT)
+        self._set_fields = self.client.register_script(SET_FIELDS_SCRIPT)
+        self._renew_lock = self.client.register_script(RENEW_LOCK_SCRIPT)
+        await self._migrate_json_tasks()
+        await self._lease_orphans()
+        await self.refresh_counts()
+        self._counts_refresher = asyncio.create_task(
+            self._refresh_counts_periodically()
+        )
+        self._sweeper = asyncio.create_task(self._sweep_periodically())
+        if settings.near_cache_enabled:
+            self.near_cache = NearCache()
+            self._invalidation_listener = asyncio.create_task(
+                self._listen_for_invalidations()
+            )
+
+    async def _migrate_json_tasks(self):
+        """Convert tasks stored as JSON documents by older gateways to hashes"""
+        migrated = 0
+        async for key in self.client.scan_iter(match="task:*", _type="string"):
+            data = await self.client.get(key)
+            if not data:
+                continue
+            task = json.loads(data)
+            pipe = self.client.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=encode_record(legacy_task_record(task), self.codec))
+            if task.get("artifacts"):
+                pipe.set(
+                    artifacts_key(task["id"]), self.codec.dumps(task["artifacts"])
+                )
+            await pipe.execute()
+            migrated += 1
+        if migrated:
+            logger.info("Migrated JSON tasks to hashes", count=migrated)
+
+    async def _lease_orphans(self):
+        """Give working tasks without a lease an expired one.
+
+        Such tasks were left by gateways that stopped before recording
+        leases; the recovery pass then requeues or fails them.
+        """
+        working = await self.client.zrange("tasks:working", 0, -1)
+        if not working:
+            return
+        pipe = self.client.pipeline()
+        for task_id in working:
+            pipe.zadd(LEASES_KEY, {task_id: 0}, nx=True)
+        await pipe.execute()
 
     async def close(self):
         """Close Redis connection"""
+        if self._counts_refresher is not None:
+            self._counts_refresher.cancel()
+            self._counts_refresher = None
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        if self._invalidation_listener is not None:
+            self._invalidation_listener.cancel()
+            self._invalidation_listener = None
+            self._near_cache_live = False
         if self.client:
             await self.client.close()
         if self.pool:
             await self.pool.disconnect()
 
-    async def create_task(self, task_id: str, message: Dict[str, Any], skill: str):
-        """Create a new task in Redis"""
-        task_data = {
-            "id": task_id,
-            "message": message,
-            "skill": skill,
-            "status": {
-                "state": "submitted",
-                "timestamp": datetime.now(UTC).isoformat(),
-                "error": None,
-            },
-            "artifacts": [],
-            "created_at": datetime.now(UTC).isoformat(),
-        }
+    async def create_task(
+        self,
+        task_id: str,
+        message: Dict[str, Any],
+        skill: str,
+        priority: int = 0,
+        tenant: str = "anonymous",
+        shared: bool = True,
+    ):
+        """Create a new task in Redis; shared tasks may run on any node.
+
+        Nodes are only told about shared tasks in cluster mode, the only
+        mode in which they pull them.
+        """
+        record = TaskRecord(task_id, message, skill, priority, tenant)
 
         pipe = self.client.pipeline()
-        pipe.set(f"task:{task_id}", json.dumps(task_data))
-        pipe.zadd("tasks:pending", {task_id: datetime.now(UTC).timestamp()})
+        pipe.hset(task_key(task_id), mapping=encode_record(record, self.codec))
+        if shared:
+            pipe.zadd(
+                "tasks:pending",
+                {task_id: pending_score(priority, record.created_at)},
+            )
+            if settings.cluster_mode:
+                pipe.publish(SUBMITTED_CHANNEL, task_id)
         await pipe.execute()
+        if shared:
+            self._adjust_count("submitted", 1)
+
+    async def get_task(
+        self, task_id: str, artifacts: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Get task by ID from Redis, with its artifacts unless told not to"""
+        cache = self._cache()
+        if cache is None:
+            return await self._read_task(task_id, artifacts)
+        task = cache.get(task_id, artifacts)
+        if task is not None:
+            return task
+        cache.start_load(task_id)
+        task = None
+        try:
+            task = await self._read_task(task_id, artifacts)
+        finally:
+            cache.finish_load(
+                task_id,
+                artifacts,
+                task,
+                task is not None and TaskState(task["status"]["state"]).terminal,
+            )
+        return task
+
+    async def _read_task(
+        self, task_id: str, artifacts: bool
+    ) -> Optional[Dict[str, Any]]:
+        if not artifacts:
+            fields = await self.client.hgetall(task_key(task_id))
+            return decode_task(fields, self.codec) if fields else None
 
-    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Get task by ID from Redis"""
-        task_data = await self.client.get(f"task:{task_id}")
-        if task_data:
-            return json.loads(task_data)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(task_key(task_id))
+        pipe.get(artifacts_key(task_id))
+        fields, encoded_artifacts = await pipe.execute()
+        if fields:
+            return decode_task(fields, self.codec, encoded_artifacts)
         return None
 
-    async def update_task_status(self, task_id: str, status: str):
-        """Update task status in Redis"""
-        task = await self.get_task(task_id)
-        if task:
-            task["status"]["state"] = status
-            task["status"]["timestamp"] = datetime.now(UTC).isoformat()
+    async def get_task_state(self, task_id: str) -> Optional[str]:
+        """State of a task in Redis"""
+        cache = self._cache()
+        task = cache.get(task_id, artifacts=False) if cache is not None else None
+        if task is not None:
+            return task["status"]["state"]
+        state = await self.client.hget(task_key(task_id), "state")
+        return state.decode() if state else None
 
-            # Move task between status sets
-            pipe = self.client.pipeline()
-            pipe.set(f"task:{task_id}", json.dumps(task))
+    async def _transition(
+        self,
+        task_id: str,
+        state: str,
+        expected: Optional[str] = None,
+        fields: Optional[Dict[str, str]] = None,
+        artifacts: Optional[List[Dict[str, Any]]] = None,
+        recovered: bool = False,
+        owner: Optional[str] = None,
+        lease_seconds: float = 0,
+        fetch: bool = False,
+        holder: Optional[str] = None,
+    ):
+        """Run TRANSITION_SCRIPT; None if the transition was refused.
 
-            # Remove from old status set
-            for status_set in [
-                "tasks:pending",
-                "tasks:working",
-                "tasks:completed",
-                "tasks:failed",
-            ]:
-                pipe.zrem(status_set, task_id)
-
-            # Add to new status set
-            if status == "submitted":
-                pipe.zadd("tasks:pending", {task_id: datetime.now(UTC).timestamp()})
-            elif status == "working":
-                pipe.zadd("tasks:working", {task_id: datetime.now(UTC).timestamp()})
-            elif status == "completed":
-                pipe.zadd("tasks:completed", {task_id: datetime.now(UTC).timestamp()})
-            elif status == "failed":
-                pipe.zadd("tasks:failed", {task_id: datetime.now(UTC).timestamp()})
+        It is refused if the task is missing, finished or not ``expected``,
+        or is leased to another node than ``holder``.
+        """
+        args = [
+            task_id,
+            state,
+            expected or "",
+            repr(time.time()),
+            PRIORITY_STEP,
+            "1" if recovered else "0",
+            lease_expiry(lease_seconds) if owner is not None else "",
+            owner or "",
+            "1" if fetch else "0",
+            self.codec.dumps(artifacts) if artifacts is not None else "",
+            INVALIDATE_CHANNEL if settings.near_cache_enabled else "",
+            int(retention_seconds(state)) if TaskState(state).terminal else "",
+            holder or "",
+        ]
+        for name, value in (fields or {}).items():
+            args.extend((name, value))
+        result = await self._transition_script(
+            keys=[task_key(task_id), LEASES_KEY, LEASE_OWNERS_KEY]
+            + list(STATE_INDEXES.values())
+            + [artifacts_key(task_id)],
+            args=args,
+        )
+        self._invalidate(task_id)
+        if not result:
+            return None
+        if fetch:
+            # HGETALL replies come back from scripts as a flat list; the
+            # artifacts are left out
+            return decode_task(dict(zip(result[::2], result[1::2])), self.codec)
+        return result
 
-            await pipe.execute()
+    async def claim_task(
+        self, task_id: str, owner: Optional[str] = None, lease_seconds: float = 0
+    ) -> Optional[Dict[str, Any]]:
+        """Move a submitted task to working in Redis; None if not submitted.
+
+        With an ``owner`` the claim also takes a lease on the task.
+        """
+        return await self._transition(
+            task_id,
+            "working",
+            expected="submitted",
+            owner=owner,
+            lease_seconds=lease_seconds,
+            fetch=True,
+        )
+
+    async def update_task_status(self, task_id: str, status: str) -> bool:
+        """Update task status in Redis; False if the task is missing or finished"""
+        return await self._transition(task_id, status) is not None
+
+    async def finish_task(
+        self,
+        task_id: str,
+        status: str,
+        result: Dict[str, Any],
+        owner: Optional[str] = None,
+    ) -> bool:
+        """Record a working task's result and final status in one step.
+
+        Returns False, changing nothing, if the task is no longer working or
+        its lease has passed to another node than ``owner``: a node that
+        lost its lease must not overwrite what happened since.
+        """
+        finished = await self._transition(
+            task_id,
+            status,
+            expected="working",
+            fields=result_fields(result),
+            artifacts=result.get("artifacts", []),
+            holder=owner,
+        )
+        return finished is not None
+
+    async def claim_next_task(
+        self, owner: str, lease_seconds: float
+    ) -> Optional[Dict[str, Any]]:
+        """Lease and claim the next shared pending task, if any"""
+        result = await self._claim_next(
+            keys=["tasks:pending", "tasks:working", LEASES_KEY, LEASE_OWNERS_KEY],
+            args=[
+                repr(time.time()),
+                lease_expiry(lease_seconds),
+                owner,
+                INVALIDATE_CHANNEL if settings.near_cache_enabled else "",
+            ],
+        )
+        if not result:
+            return None
+        task = decode_task(dict(zip(result[::2], result[1::2])), self.codec)
+        self._invalidate(task["id"])
+        self._adjust_count("submitted", -1)
+        return task
+
+    async def renew_leases(
+        self, owner: str, task_ids: Iterable[str], lease_seconds: float
+    ):
+        """Extend the leases a node holds on its running tasks"""
+        expiry = lease_expiry(lease_seconds)
+        pipe = self.client.pipeline()
+        for task_id in task_ids:
+            # XX: never resurrect the lease of a task that just finished
+            pipe.zadd(LEASES_KEY, {task_id: expiry}, xx=True)
+        await pipe.execute()
+
+    async def get_expired_leases(self) -> List[str]:
+        """Ids of tasks whose lease has expired"""
+        expired = await self.client.zrangebyscore(
+            LEASES_KEY, "-inf", int(time.time() * 1000)
+        )
+        return [task_id.decode() for task_id in expired]
+
+    async def take_expired_lease(self, task_id: str) -> bool:
+        """Drop a lease if it is still expired; True if this call dropped it"""
+        taken = await self._take_expired_lease(
+            keys=[LEASES_KEY, LEASE_OWNERS_KEY],
+            args=[task_id, int(time.time() * 1000)],
+        )
+        return bool(taken)
+
+    async def requeue_task(self, task_id: str) -> bool:
+        """Return a working task to the pending queue, counting the recovery"""
+        requeued = await self._transition(
+            task_id, "submitted", expected="working", recovered=True
+        )
+        if requeued is None:
+            return False
+        # As in create_task, only nodes in cluster mode listen
+        if settings.cluster_mode:
+            await self.client.publish(SUBMITTED_CHANNEL, task_id)
+        return True
+
+    async def get_pending_task_ids(self) -> List[str]:
+        """Ids of tasks in the pending queue"""
+        pending = await self.client.zrange("tasks:pending", 0, -1)
+        return [task_id.decode() for task_id in pending]
+
+    async def publish_cancel(self, task_id: str):
+        """Ask every node to cancel its execution of a task"""
+        await self.client.publish(CANCEL_CHANNEL, task_id)
+
+    async def watch_cluster(
+        self,
+        on_submitted: Callable[[str], None],
+        on_cancel: Callable[[str], None],
+    ):
+        """Call back on tasks submitted or canceled by any node, until canceled"""
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(SUBMITTED_CHANNEL, CANCEL_CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                task_id = message["data"].decode()
+                if message["channel"].decode() == CANCEL_CHANNEL:
+                    on_cancel(task_id)
+                else:
+                    on_submitted(task_id)
+        finally:
+            await pubsub.aclose()
 
     async def update_task_result(self, task_id: str, result: Dict[str, Any]):
         """Update task result in Redis"""
-        task = await self.get_task(task_id)
-        if task:
-            task["artifacts"] = result.get("artifacts", [])
-            if "error" in result:
-                task["status"]["error"] = result["error"]
-            await self.client.set(f"task:{task_id}", json.dumps(task))
+        await self._set_task_fields(
+            task_id, result_fields(result), result.get("artifacts", [])
+        )
+
+    async def update_task_usage(self, task_id: str, usage: Dict[str, float]):
+        """Record resources used by the task's tool in Redis"""
+        await self._set_task_fields(task_id, {"usage": self.codec.dumps(usage)})
+
+    async def _set_task_fields(
+        self,
+        task_id: str,
+        fields: Dict[str, Any],
+        artifacts: Optional[List[Dict[str, Any]]] = None,
+    ):
+        args = [
+            self.codec.dumps(artifacts) if artifacts is not None else "",
+            INVALIDATE_CHANNEL if settings.near_cache_enabled else "",
+            f"{task_id} {time.time()!r}",
+        ]
+        for name, value in fields.items():
+            args.extend((name, value))
+        await self._set_fields(
+            keys=[task_key(task_id), artifacts_key(task_id)], args=args
+        )
+        self._invalidate(task_id)
+
+    async def acquire_sweep_lock(self) -> bool:
+        """Take the retention lock for one sweep interval, if no node holds it"""
+        return bool(
+            await self.client.set(
+                RETENTION_LOCK_KEY, self._lock_token, nx=True, px=self._lock_ms()
+            )
+        )
+
+    async def _renew_sweep_lock(self) -> bool:
+        """Extend the retention lock by one interval; False if it was lost"""
+        renewed = await self._renew_lock(
+            keys=[RETENTION_LOCK_KEY], args=[self._lock_token, self._lock_ms()]
+        )
+        return bool(renewed)
+
+    @staticmethod
+    def _lock_ms() -> int:
+        return max(1, int(settings.retention_sweep_interval * 1000))
+
+    async def sweep(self, now: Optional[float] = None, locked: bool = False) -> int:
+        """Delete finished tasks past their retention; returns how many.
+
+        Expired ids are read from each terminal index set in batches of
+        ``retention_sweep_batch_size``, pausing between batches so a large
+        backlog never holds Redis for long. With ``locked``, the retention
+        lock is renewed before each batch and the sweep stops once it is lost.
+        """
+        now = time.time() if now is None else now
+        batch_size = settings.retention_sweep_batch_size
+        deleted = 0
+        for state, index in STATE_INDEXES.items():
+            if not state.terminal:
+                continue
+            cutoff = now - retention_seconds(state.value)
+            while True:
+                if locked and not await self._renew_sweep_lock():
+                    logger.warning("Retention lock lost, stopping sweep")
+                    return deleted
+                # Each batch removes what it read, so the next starts at 0
+                task_ids = await self.client.zrangebyscore(
+                    index, "-inf", cutoff, start=0, num=batch_size
+                )
+                if not task_ids:
+                    break
+                await self._delete_tasks(index, [t.decode() for t in task_ids])
+                deleted += len(task_ids)
+                TASKS_EVICTED.labels(state=state.value, reason="expired").inc(
+                    len(task_ids)
+                )
+                if len(task_ids) < batch_size:
+                    break
+                await asyncio.sleep(settings.retention_sweep_pause)
+        return deleted
+
+    async def _delete_tasks(self, index: str, task_ids: List[str]):
+        pipe = self.client.pipeline(transaction=False)
+        # UNLINK frees large artifact values off Redis' main thread
+        pipe.unlink(*[task_key(t) for t in task_ids])
+        pipe.unlink(*[artifacts_key(t) for t in task_ids])
+        pipe.zrem(index, *task_ids)
+        if settings.near_cache_enabled:
+            published = repr(time.time())
+            for task_id in task_ids:
+                pipe.publish(INVALIDATE_CHANNEL, f"{task_id} {published}")
+        await pipe.execute()
+        for task_id in task_ids:
+            self._invalidate(task_id)
+            remove_log(task_id)
+
+    async def _sweep_periodically(self):
+        interval = settings.retention_sweep_interval
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # Output logs are local to each node, so every node sweeps its own
+                sweep_logs(max_retention_seconds())
+                # The lock lapses one interval after its last renewal, so at
+                # most one node sweeps at a time and a crashed node never
+                # blocks others
+                if not await self.acquire_sweep_lock():
+                    continue
+                deleted = await self.sweep(locked=True)
+                if deleted:
+                    logger.info("Deleted expired tasks", count=deleted)
+            except Exception as e:
+                logger.error("Task retention sweep failed", error=str(e))
+
+    def _cache(self) -> Optional[NearCache]:
+        """The near-cache, if enabled and kept up to date"""
+        return self.near_cache if self._near_cache_live else None
+
+    def _invalidate(self, task_id: str):
+        """Drop this node's snapshot of a task it just changed"""
+        if self.near_cache is not None:
+            self.near_cache.invalidate(task_id)
+
+    async def _listen_for_invalidations(self):
+        """Apply invalidations published by every node to the near-cache.
+
+        Invalidations sent while unsubscribed are lost, so the cache is
+        bypassed until the subscription is up and emptied whenever it is
+        (re)established.
+        """
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                self.near_cache.clear()
+                self._near_cache_live = True
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    task_id, _, published = message["data"].decode().partition(" ")
+                    self.near_cache.invalidate(task_id)
+                    if published:
+                        NEAR_CACHE_INVALIDATION_LAG_SECONDS.observe(
+                            max(0.0, time.time() - float(published))
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Near-cache invalidations interrupted", error=str(e))
+            finally:
+                self._near_cache_live = False
+                await pubsub.aclose()
+            await asyncio.sleep(1)
 
     async def get_task_timestamp(self, task_id: str) -> str:
         """Get task timestamp from Redis"""
-        task = await self.get_task(task_id)
-        if task:
+        cache = self._cache()
+        task = cache.get(task_id, artifacts=False) if cache is not None else None
+        if task is not None:
             return task["status"]["timestamp"]
-        return datetime.now(UTC).isoformat()
+        updated_at = await self.client.hget(task_key(task_id), "updated_at")
+        return isoformat(float(updated_at) if updated_at else time.time())
 
     async def get_active_count(self) -> int:
         """Get number of active tasks from Redis"""
-        pending_count = await self.client.zcard("tasks:pending")
-        working_count = await self.client.zcard("tasks:working")
-        return pending_count + working_count
+        counts = await self.refresh_counts()
+        return counts["submitted"] + counts["working"]
+
+    async def refresh_counts(self) -> Dict[str, int]:
+        """Read the number of tasks in each state in one round-trip"""
+        pipe = self.client.pipeline(transaction=False)
+        for index in STATE_INDEXES.values():
+            pipe.zcard(index)
+        sizes = await pipe.execute()
+        self.counts = {state.value: size for state, size in zip(STATE_INDEXES, sizes)}
+        self.counts_refreshed = time.monotonic()
+        return self.counts
+
+    def _adjust_count(self, state: str, delta: int):
+        """Apply this node's own change to the cached counts until the next refresh"""
+        self.counts[state] = max(0, self.counts.get(state, 0) + delta)
+
+    def state_counts(self) -> Tuple[Dict[str, int], Optional[float]]:
+        """Cached task count per state and its age in seconds (None if never read)"""
+        if self.counts_refreshed is None:
+            return self.counts, None
+        return self.counts, time.monotonic() - self.counts_refreshed
+
+    async def _refresh_counts_periodically(self):
+        while True:
+            await asyncio.sleep(settings.count_refresh_interval)
+            try:
+                await self.refresh_counts()
+            except Exception as e:
+                logger.warning("Task count refresh failed", error=str(e))
 
     async def check_health(self) -> Dict[str, Any]:
         """Check Redis health"""
@@ -115,18 +873,23 @@ class RedisTaskStore:
             pong = await self.client.ping()
             if pong:
                 info = await self.client.info()
-                return {
+                health = {
                     "status": "healthy",
                     "version": info.get("redis_version", "unknown"),
                     "used_memory": info.get("used_memory_human", "unknown"),
                     "connected_clients": info.get("connected_clients", 0),
                 }
+                if self.near_cache is not None:
+                    health["near_cache"] = {
+                        **self.near_cache.stats(),
+                        "live": self._near_cache_live,
+                    }
+                return health
             return {"status": "unhealthy"}
         except Exception as e:
             return {"status": "unhealthy", "error": str(e)}
 
     @property
     def active_count(self) -> int:
-        """Get number of active tasks (sync version)"""
-        loop = asyncio.get_event_loop()
-        return loop.run_until_complete(self.get_active_count())
+        """Get number of active tasks (sync version, from the cached counts)"""
+        return self.counts.get("submitted", 0) + self.counts.get("working", 0)
@@ -0,0 +1,196 @@
+"""Tool and skill registry for A2A Coding Gateway"""
+
+import asyncio
+import shlex
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+
+from a2a_gateway.config import settings
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+# Seconds a version probe may take before the tool is considered unavailable
+PROBE_TIMEOUT = 10.0
+
+SkillHandler = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class ToolAdapter:
+    """A coding tool binary whose availability is probed and cached.
+
+    The command is read from ``settings.<command_setting>`` at probe time. The
+    cached result is served until it is older than ``tool_probe_ttl``, after
+    which it is refreshed in the background rather than on the task's path.
+    """
+
+    def __init__(self, name: str, command_setting: str):
+        self.name = name
+        self.command_setting = command_setting
+        self.available: Optional[bool] = None
+        self.version: Optional[str] = None
+        self.error: Optional[str] = None
+        self.probed_at: Optional[float] = None
+        self._refresh: Optional[asyncio.Task] = None
+
+    @property
+    def command(self) -> List[str]:
+        """Command line that starts the tool"""
+        return shlex.split(getattr(settings, self.command_setting))
+
+    async def probe(self) -> bool:
+        """Run ``<tool> --version`` and cache the outcome"""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self.command,
+                "--version",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(), PROBE_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise RuntimeError(f"--version timed out after {PROBE_TIMEOUT}s")
+
+            if process.returncode == 0:
+                self.available = True
+                self.version = stdout.decode(errors="replace").strip()
+                self.error = None
+            else:
+                self.available = False
+                self.version = None
+                self.error = stderr.decode(errors="replace").strip()
+        except Exception as e:
+            self.available = False
+            self.version = None
+            self.error = str(e)
+
+        self.probed_at = time.monotonic()
+        logger.info(
+            "Probed coding tool",
+            tool=self.name,
+            available=self.available,
+            version=self.version,
+            error=self.error,
+        )
+        return self.available
+
+    async def is_available(self) -> bool:
+        """Cached availability; only the very first call waits for a probe"""
+        if self.probed_at is None:
+            return await self.probe()
+        if time.monotonic() - self.probed_at > settings.tool_probe_ttl and (
+            self._refresh is None or self._refresh.done()
+        ):
+            self._refresh = asyncio.create_task(self.probe())
+        return bool(self.available)
+
+    def info(self) -> Dict[str, Any]:
+        """Cached probe result"""
+        return {
+            "available": self.available,
+            "version": self.version,
+            "error": self.error,
+        }
+
+
+class Skill:
+    """An A2A skill and the handler that executes it"""
+
+    def __init__(
+        self,
+        skill_id: str,
+        name: str,
+        description: str,
+        input_schema: Dict[str, Any],
+        handler: SkillHandler,
+        tool: Optional[str] = None,
+    ):
+        self.id = skill_id
+        self.name = name
+        self.description = description
+        self.input_schema = input_schema
+        self.handler = handler
+        self.tool = tool
+
+    def card(self) -> Dict[str, Any]:
+        """Agent Card entry of the skill"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "inputSchema": self.input_schema,
+        }
+
+
+class ToolRegistry:
+    """Maps skills to their handlers and the tools they depend on"""
+
+    def __init__(self):
+        self.tools: Dict[str, ToolAdapter] = {}
+        self.skills: Dict[str, Skill] = {}
+        self._refresh_loop: Optional[asyncio.Task] = None
+
+    def add_tool(self, tool: ToolAdapter) -> ToolAdapter:
+        """Register a tool adapter"""
+        self.tools[tool.name] = tool
+        return tool
+
+    def skill(
+        self,
+        skill_id: str,
+        name: str,
+        description: str,
+        input_schema: Dict[str, Any],
+        tool: Optional[str] = None,
+    ) -> Callable[[SkillHandler], SkillHandler]:
+        """Decorator registering a coroutine function as a skill handler"""
+
+        def register(handler: SkillHandler) -> SkillHandler:
+            self.skills[skill_id] = Skill(
+                skill_id, name, description, input_schema, handler, tool
+            )
+            return handler
+
+        return register
+
+    def get_skill(self, skill_id: str) -> Optional[Skill]:
+        """Look up a skill by id"""
+        return self.skills.get(skill_id)
+
+    async def is_available(self, tool: str) -> bool:
+        """Cached availability of a registered tool"""
+        return await self.tools[tool].is_available()
+
+    async def start(self):
+        """Probe every tool once and keep the results fresh in background"""
+        await asyncio.gather(*(tool.probe() for tool in self.tools.values()))
+        self._refresh_loop = asyncio.create_task(self._refresh())
+
+    async def close(self):
+        """Stop background probing"""
+        if self._refresh_loop is not None:
+            self._refresh_loop.cancel()
+            self._refresh_loop = None
+
+    def get_agent_card_skills(self) -> List[Dict[str, Any]]:
+        """Agent Card ``skills`` generated from the registered skills"""
+        return [skill.card() for skill in self.skills.values()]
+
+    def stats(self) -> Dict[str, Any]:
+        """Cached probe results of every tool"""
+        return {name: tool.info() for name, tool in self.tools.items()}
+
+    async def _refresh(self):
+        while True:
+            await asyncio.sleep(settings.tool_probe_ttl)
+            await asyncio.gather(*(tool.probe() for tool in self.tools.values()))
+
+
+tool_registry = ToolRegistry()
@@ -0,0 +1,207 @@
+"""Content-addressed result cache for A2A Coding Gateway"""
+
+import asyncio
+import hashlib
+import json
+import os
+import stat
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import redis.asyncio as redis
+import structlog
+
+from a2a_gateway.config import settings
+from a2a_gateway.metrics import RESULT_CACHE_LOOKUPS
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+# Directories that never influence a tool's result
+IGNORED_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+}
+
+REDIS_KEY_PREFIX = "result_cache:"
+
+# Memoized file digests are dropped once this many files have been seen
+MAX_MEMOIZED_FILES = 100_000
+
+
+def normalize_message(message: Dict[str, Any]) -> str:
+    """Canonical JSON of message parameters (sorted keys, no empty values)"""
+
+    def _normalize(value):
+        if isinstance(value, dict):
+            return {
+                key: _normalize(item)
+                for key, item in value.items()
+                if item is not None and item != ""
+            }
+        if isinstance(value, list):
+            return [_normalize(item) for item in value]
+        if isinstance(value, str):
+            return value.strip()
+        return value
+
+    return json.dumps(_normalize(message), sort_keys=True, separators=(",", ":"))
+
+
+class ResultCache:
+    """Two-tier cache of task results keyed by skill, input and workdir content.
+
+    The key covers the skill, the normalized message and a content hash of the
+    ``workdir`` tree plus ``context_files``, so any change to the repository
+    state is a miss. Entries live in a TTL-bounded in-process LRU and, when
+    enabled, in Redis shared across gateway nodes.
+    """
+
+    def __init__(self):
+        self.entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.redis: Optional[redis.Redis] = None
+        # File digests memoized by (size, mtime, inode) to make rehashing cheap
+        self._file_digests: Dict[str, Tuple[Tuple[int, int, int], bytes]] = {}
+
+    async def initialize(self):
+        """Connect the shared Redis tier if enabled"""
+        if settings.result_cache_redis and settings.redis_url:
+            self.redis = redis.Redis.from_url(settings.redis_url)
+
+    async def close(self):
+        """Close the Redis tier"""
+        if self.redis is not None:
+            await self.redis.close()
+            self.redis = None
+
+    def enabled_for(self, skill: str) -> bool:
+        """Whether results of ``skill`` are cached"""
+        return settings.result_cache_enabled and skill in settings.result_cache_skills
+
+    async def make_key(self, skill: str, message: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a task, or None if the workdir cannot be hashed"""
+        loop = asyncio.get_running_loop()
+        tree_digest = await loop.run_in_executor(
+            None,
+            self._hash_tree,
+            message.get("workdir", "."),
+            message.get("context_files", []),
+        )
+        if tree_digest is None:
+            return None
+        digest = hashlib.sha256()
+        digest.update(skill.encode())
+        digest.update(b"\0")
+        digest.update(normalize_message(message).encode())
+        digest.update(b"\0")
+        digest.update(tree_digest)
+        return digest.hexdigest()
+
+    async def get(self, skill: str, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a result, promoting Redis hits into the local tier"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                RESULT_CACHE_LOOKUPS.labels(skill=skill, result="hit_memory").inc()
+                return entry[1]
+            del self.entries[key]
+
+        if self.redis is not None:
+            try:
+                data = await self.redis.get(REDIS_KEY_PREFIX + key)
+            except Exception as e:
+                logger.warning("Result cache Redis lookup failed", error=str(e))
+                data = None
+            if data:
+                result = json.loads(data)
+                self._store_local(key, result)
+                RESULT_CACHE_LOOKUPS.labels(skill=skill, result="hit_redis").inc()
+                return result
+
+        RESULT_CACHE_LOOKUPS.labels(skill=skill, result="miss").inc()
+        return None
+
+    async def set(self, key: str, result: Dict[str, Any]):
+        """Store a successful result in every tier"""
+        self._store_local(key, result)
+        if self.redis is not None:
+            try:
+                await self.redis.set(
+                    REDIS_KEY_PREFIX + key,
+                    json.dumps(result),
+                    ex=settings.result_cache_ttl,
+                )
+            except Exception as e:
+                logger.warning("Result cache Redis store failed", error=str(e))
+
+    def _store_local(self, key: str, result: Dict[str, Any]):
+        self.entries[key] = (time.monotonic() + settings.result_cache_ttl, result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > settings.result_cache_max_entries:
+            self.entries.popitem(last=False)
+
+    def _hash_tree(self, workdir: str, context_files) -> Optional[bytes]:
+        digest = hashlib.sha256()
+        files = 0
+        root = os.path.abspath(workdir)
+        if not os.path.isdir(root):
+            return None
+
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in IGNORED_DIRS)
+            for filename in sorted(filenames):
+                paths.append(os.path.join(dirpath, filename))
+                files += 1
+                if files > settings.result_cache_max_files:
+                    return None
+        # Context files count even when they live in an ignored directory
+        paths.extend(os.path.join(root, path) for path in context_files)
+
+        for path in paths:
+            file_digest = self._hash_file(path)
+            if file_digest is None:
+                continue
+            digest.update(os.path.relpath(path, root).encode())
+            digest.update(b"\0")
+            digest.update(file_digest)
+        return digest.digest()
+
+    def _hash_file(self, path: str) -> Optional[bytes]:
+        try:
+            info = os.stat(path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(info.st_mode):
+            return None
+        signature = (info.st_size, info.st_mtime_ns, info.st_ino)
+        cached = self._file_digests.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        digest = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+        except OSError:
+            return None
+        if len(self._file_digests) >= MAX_MEMOIZED_FILES:
+            self._file_digests.clear()
+        self._file_digests[path] = (signature, digest.digest())
+        return digest.digest()
+
+
+result_cache = ResultCache()
@@ -1,16 +1,21 @@
 """API routes for A2A Coding Gateway"""
 
-from typing import Any, Dict, Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, Optional
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from a2a_gateway.a2a_sdk import get_agent_card
 from a2a_gateway.config import settings
+from a2a_gateway.events import TERMINAL_STATES, get_replay_events, task_events
+from a2a_gateway.idempotency import submission_deduplicator
+from a2a_gateway.scheduler import QueueFull, task_scheduler
 from a2a_gateway.tasks import task_store
-from a2a_gateway.tools import execute_task_with_tool
+from a2a_gateway.tools import cancel_task_execution
 
 # Rate limiter
 limiter = Limiter(key_func=get_remote_address)
@@ -48,22 +53,29 @@ async def jsonrpc_endpoint(request: Request, jsonrpc_request: JSONRPCRequest):
     """Handle JSON-RPC requests"""
     try:
         # API Key authentication
-        if settings.api_key:
-            api_key = request.headers.get("X-API-Key")
-            if api_key != settings.api_key:
-                return JSONRPCResponse(
-                    id=jsonrpc_request.id,
-                    error={
-                        "code": -32602,
-                        "message": "Invalid params",
-                        "data": "Invalid API Key",
-                    },
-                )
+        tenant = authenticate(request)
+        if tenant is None:
+            return JSONRPCResponse(
+                id=jsonrpc_request.id,
+                error={
+                    "code": -32602,
+                    "message": "Invalid params",
+                    "data": "Invalid API Key",
+                },
+            )
 
         if jsonrpc_request.method == "tasks/send":
-            return await handle_tasks_send(jsonrpc_request)
+            return await handle_tasks_send(
+                jsonrpc_request, tenant, request.headers.get("Idempotency-Key")
+            )
         elif jsonrpc_request.method == "tasks/get":
             return await handle_tasks_get(jsonrpc_request)
+        elif jsonrpc_request.method == "tasks/cancel":
+            return await handle_tasks_cancel(jsonrpc_request)
+        elif jsonrpc_request.method == "tasks/sendSubscribe":
+            return await handle_tasks_send_subscribe(jsonrpc_request, tenant)
+        elif jsonrpc_request.method == "tasks/resubscribe":
+            return await handle_tasks_resubscribe(request, jsonrpc_request)
         else:
             raise HTTPException(status_code=404, detail="Method not found")
     except Exception as e:
@@ -73,11 +85,27 @@ async def jsonrpc_endpoint(request: Request, jsonrpc_request: JSONRPCRequest):
         )
 
 
-async def handle_tasks_send(request: JSONRPCRequest) -> JSONRPCResponse:
+def authenticate(request: Request) -> Optional[str]:
+    """Tenant of the caller, or None if its API key is not accepted"""
+    api_key = request.headers.get("X-API-Key")
+    for tenant, tenant_key in settings.tenant_api_keys.items():
+        if api_key == tenant_key:
+            return tenant
+    if settings.api_key or settings.tenant_api_keys:
+        if api_key is None or api_key != settings.api_key:
+            return None
+    # Callers sharing the gateway key are told apart by address
+    return f"ip:{get_remote_address(request)}"
+
+
+async def handle_tasks_send(
+    request: JSONRPCRequest, tenant: str, idempotency_key: Optional[str] = None
+) -> JSONRPCResponse:
     """Handle tasks/send method"""
     params = request.params
     message = params.get("message")
     skill = params.get("skill")
+    idempotency_key = params.get("idempotencyKey", idempotency_key)
 
     if not message or not skill:
         return JSONRPCResponse(
@@ -89,15 +117,52 @@ async def handle_tasks_send(request: JSONRPCRequest) -> JSONRPCResponse:
             },
         )
 
-    # Create task
-    task_id = await task_store.create_task(message=message, skill=skill)
+    if idempotency_key is not None and (
+        not isinstance(idempotency_key, str) or not 0 < len(idempotency_key) <= 255
+    ):
+        return JSONRPCResponse(
+            id=request.id,
+            error={
+                "code": -32602,
+                "message": "Invalid params",
+                "data": "idempotencyKey must be a string of 1 to 255 characters",
+            },
+        )
+
+    priority_error = check_priority(request)
+    if priority_error is not None:
+        return priority_error
+
+    async def create(task_id: str):
+        # Only submissions that add a task go through admission control
+        task_scheduler.admit()
+        await task_store.create_task(
+            message=message,
+            skill=skill,
+            priority=params.get("priority", 0),
+            tenant=tenant,
+            task_id=task_id,
+        )
+
+    # Create task, or return the one a duplicate submission created
+    try:
+        task_id, created = await submission_deduplicator.submit(
+            submission_deduplicator.keys_for(tenant, skill, message, idempotency_key),
+            create,
+            task_store.get_task_state,
+        )
+    except QueueFull as e:
+        return queue_full_response(request.id, e)
 
+    state = "submitted"
+    if not created:
+        state = await task_store.get_task_state(task_id) or state
     return JSONRPCResponse(
         id=request.id,
         result={
             "id": task_id,
             "status": {
-                "state": "submitted",
+                "state": state,
                 "timestamp": await task_store.get_task_timestamp(task_id),
             },
         },
@@ -131,16 +196,223 @@ async def handle_tasks_get(request: JSONRPCRequest) -> JSONRPCResponse:
             },
         )
 
-    # If task is submitted, start execution in background
-    if task["status"]["state"] == "submitted":
-        await task_store.update_task_status(task_id, "working")
-        # Execute task asynchronously without blocking
-        import asyncio
+    return JSONRPCResponse(id=request.id, result=task)
+
+
+async def handle_tasks_cancel(request: JSONRPCRequest) -> JSONRPCResponse:
+    """Handle tasks/cancel method"""
+    params = request.params
+    task_id = params.get("id")
+
+    if not task_id:
+        return JSONRPCResponse(
+            id=request.id,
+            error={
+                "code": -32602,
+                "message": "Invalid params",
+                "data": "Missing required field: id",
+            },
+        )
+
+    state = await task_store.get_task_state(task_id)
+    if not state:
+        return JSONRPCResponse(
+            id=request.id,
+            error={
+                "code": -32000,
+                "message": "Task not found",
+                "data": f"Task with id {task_id} not found",
+            },
+        )
+
+    if state in TERMINAL_STATES:
+        return JSONRPCResponse(
+            id=request.id,
+            error={
+                "code": -32004,
+                "message": "Task not cancelable",
+                "data": f"Task with id {task_id} is already {state}",
+            },
+        )
+
+    # A running execution records the canceled state itself once its tool
+    # is gone; a task that has not started, or runs on another node, is
+    # canceled directly
+    if not await cancel_task_execution(task_id):
+        await task_store.update_task_status(task_id, "canceled")
+        await task_store.publish_cancel(task_id)
+
+    return JSONRPCResponse(id=request.id, result=await task_store.get_task(task_id))
+
+
+async def handle_tasks_send_subscribe(request: JSONRPCRequest, tenant: str):
+    """Handle tasks/sendSubscribe method"""
+    params = request.params
+    message = params.get("message")
+    skill = params.get("skill")
 
-        asyncio.create_task(
-            execute_task_with_tool(task_id, task["message"], task["skill"])
+    if not message or not skill:
+        return JSONRPCResponse(
+            id=request.id,
+            error={
+                "code": -32602,
+                "message": "Invalid params",
+                "data": "Missing required fields: message or skill",
+            },
         )
-        # Return updated task status
+
+    admission_error = check_admission(request)
+    if admission_error is not None:
+        return admission_error
+
+    # Started by the dispatcher, whose events the stream picks up; kept on
+    # this node in cluster mode since the events are only published here
+    task_id = await task_store.create_task(
+        message=message,
+        skill=skill,
+        priority=params.get("priority", 0),
+        tenant=tenant,
+        shared=False,
+    )
+    return _event_stream_response(request.id, task_id, 0)
+
+
+async def handle_tasks_resubscribe(request: Request, jsonrpc_request: JSONRPCRequest):
+    """Handle tasks/resubscribe method"""
+    params = jsonrpc_request.params
+    task_id = params.get("id")
+
+    if not task_id:
+        return JSONRPCResponse(
+            id=jsonrpc_request.id,
+            error={
+                "code": -32602,
+                "message": "Invalid params",
+                "data": "Missing required field: id",
+            },
+        )
+
+    state = await task_store.get_task_state(task_id)
+    if not state:
+        return JSONRPCResponse(
+            id=jsonrpc_request.id,
+            error={
+                "code": -32000,
+                "message": "Task not found",
+                "data": f"Task with id {task_id} not found",
+            },
+        )
+
+    # Resume after the last sequence number the client has seen
+    offset = params.get("offset", request.headers.get("Last-Event-ID", 0))
+    try:
+        offset = int(offset)
+    except (TypeError, ValueError):
+        offset = 0
+
+    if not task_events.has_stream(task_id) and state in TERMINAL_STATES:
         task = await task_store.get_task(task_id)
+        return StreamingResponse(
+            _replay_events(jsonrpc_request.id, task),
+            media_type="text/event-stream",
+        )
+    return _event_stream_response(jsonrpc_request.id, task_id, offset)
 
-    return JSONRPCResponse(id=request.id, result=task)
+
+def check_admission(request: JSONRPCRequest) -> Optional[JSONRPCResponse]:
+    """Validate the task priority and reject the task if the queue is full"""
+    priority_error = check_priority(request)
+    if priority_error is not None:
+        return priority_error
+
+    try:
+        task_scheduler.admit()
+    except QueueFull as e:
+        return queue_full_response(request.id, e)
+    return None
+
+
+def check_priority(request: JSONRPCRequest) -> Optional[JSONRPCResponse]:
+    """Reject a task priority that is not an integer"""
+    priority = request.params.get("priority", 0)
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        return JSONRPCResponse(
+            id=request.id,
+            error={
+                "code": -32602,
+                "message": "Invalid params",
+                "data": "priority must be an integer",
+            },
+        )
+    return None
+
+
+def queue_full_response(request_id: str, error: QueueFull) -> JSONRPCResponse:
+    """-32003 response telling the client when to retry"""
+    return JSONRPCResponse(
+        id=request_id,
+        error={
+            "code": -32003,
+            "message": "Concurrent limit reached",
+            "data": {
+                "reason": str(error),
+                "queue_depth": error.queue_depth,
+                "retry_after": error.retry_after,
+            },
+        },
+    )
+
+
+def _event_stream_response(
+    request_id: str, task_id: str, offset: int
+) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_events(request_id, task_id, offset),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _format_event(request_id: str, seq: int, event: Dict[str, Any]) -> str:
+    payload = JSONRPCResponse(id=request_id, result=event).model_dump_json()
+    return f"id: {seq}\ndata: {payload}\n\n"
+
+
+async def _stream_events(
+    request_id: str, task_id: str, offset: int
+) -> AsyncIterator[str]:
+    """Yield Server-Sent Events for a task until its final status.
+
+    Events of a task not held by this process (running on another node, or
+    from before a restart) are unavailable; its state is polled instead and
+    the stored result replayed once it finishes.
+    """
+    while True:
+        if not task_events.has_stream(task_id):
+            state = await task_store.get_task_state(task_id)
+            if state is None or state in TERMINAL_STATES:
+                task = await task_store.get_task(task_id) if state else None
+                if task is not None:
+                    async for event in _replay_events(request_id, task):
+                        yield event
+                return
+            await asyncio.sleep(settings.stream_poll_seconds)
+            yield ": keepalive\n\n"
+            continue
+        events, final = await task_events.read(
+            task_id, offset, timeout=settings.stream_keepalive_seconds
+        )
+        if not events and not final:
+            yield ": keepalive\n\n"
+            continue
+        for seq, event in events:
+            yield _format_event(request_id, seq, event)
+            offset = seq
+        if final:
+            return
+
+
+async def _replay_events(request_id: str, task: Dict[str, Any]) -> AsyncIterator[str]:
+    """Yield the stored result of a finished task as Server-Sent Events"""
+    for seq, event in enumerate(get_replay_events(task), start=1):
+        yield _format_event(request_id, seq, event)
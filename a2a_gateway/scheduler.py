@@ -0,0 +1,289 @@
+"""Task scheduling and admission control for A2A Coding Gateway"""
+
+import asyncio
+import contextlib
+import itertools
+import math
+import time
+from collections import Counter
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import structlog
+
+from a2a_gateway.concurrency import AdaptiveLimiter
+from a2a_gateway.config import settings
+from a2a_gateway.metrics import (
+    SKILL_RUNNING_TASKS,
+    TASK_CONCURRENCY_LIMIT,
+    TASK_QUEUE_DEPTH,
+    TASK_QUEUE_WAIT_SECONDS,
+    TASKS_REJECTED,
+    TENANT_RUNNING_TASKS,
+)
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+# Retry-after hint used before any task has finished
+DEFAULT_RETRY_AFTER = 5.0
+
+# Weight of the latest run in the average task duration
+DURATION_SMOOTHING = 0.2
+
+# Tenant used when the caller cannot be identified
+DEFAULT_TENANT = "anonymous"
+
+# Finish tags of idle tenants are pruned once this many are tracked
+MAX_TRACKED_TENANTS = 1024
+
+
+class QueueFull(Exception):
+    """Raised when a task cannot be admitted because the queue is full"""
+
+    def __init__(self, queue_depth: int, retry_after: int):
+        super().__init__(f"Task queue is full ({queue_depth} waiting)")
+        self.queue_depth = queue_depth
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    """A task waiting for an execution slot"""
+
+    __slots__ = ("skill", "tenant", "priority", "tag", "order", "future", "enqueued")
+
+    def __init__(self, skill, tenant, priority, tag, order, future):
+        self.skill = skill
+        self.tenant = tenant
+        self.priority = priority
+        self.tag = tag
+        self.order = order
+        self.future = future
+        self.enqueued = time.monotonic()
+
+
+def tenant_label(tenant: str) -> str:
+    """Metric label of a tenant; callers without a tenant key share one"""
+    return tenant if tenant in settings.tenant_api_keys else DEFAULT_TENANT
+
+
+class TaskScheduler:
+    """Grants execution slots by priority, skill cap and tenant fair share.
+
+    At most ``max_concurrent_tasks`` tasks run at once (or the adaptive
+    limit when ``adaptive_concurrency`` is on), and at most
+    ``skill_concurrency[skill]`` of one skill. Among waiting tasks whose skill
+    has room, the highest priority goes first; within a priority, tenants
+    share slots in proportion to ``tenant_weights`` using start-time fair
+    queuing, so a tenant flooding the queue only delays its own tasks. The
+    queue holds at most ``max_queue_depth`` tasks; :meth:`admit` rejects new
+    tasks once it is full so bursts are shed at the API.
+    """
+
+    def __init__(self):
+        self.running = 0
+        self.running_by_skill: Counter = Counter()
+        self.running_by_tenant: Counter = Counter()
+        self._waiting: List[_Waiter] = []
+        self._order = itertools.count()
+        self._virtual_time = 0.0
+        self._finish_tags: Dict[str, float] = {}
+        self._avg_duration: Optional[float] = None
+        self.adaptive = AdaptiveLimiter()
+        self._adapter: Optional[asyncio.Task] = None
+        # Tasks this node could run that wait outside the scheduler, such as
+        # the shared cluster queue, which is only pulled while slots are free
+        self.backlog: Callable[[], int] = lambda: 0
+
+    @property
+    def limit(self) -> int:
+        """Number of tasks allowed to run at once"""
+        if settings.adaptive_concurrency:
+            return self.adaptive.limit
+        return settings.max_concurrent_tasks
+
+    async def start(self):
+        """Start adjusting the concurrency limit if it is adaptive"""
+        if settings.adaptive_concurrency:
+            lower, upper = self.adaptive.bounds
+            self.adaptive.limit = min(max(settings.max_concurrent_tasks, lower), upper)
+            self._adapter = asyncio.create_task(self._adapt())
+            logger.info("Adaptive concurrency enabled", limit=self.adaptive.limit)
+        TASK_CONCURRENCY_LIMIT.set(self.limit)
+
+    async def close(self):
+        """Stop adjusting the concurrency limit"""
+        if self._adapter is not None:
+            self._adapter.cancel()
+            self._adapter = None
+
+    @property
+    def queued(self) -> int:
+        """Number of tasks waiting for a slot"""
+        return len(self._waiting)
+
+    @property
+    def saturated(self) -> bool:
+        """Whether every slot is taken while tasks wait for one"""
+        return self.running >= self.limit and (self.queued > 0 or self.backlog() > 0)
+
+    def admit(self):
+        """Raise QueueFull if a new task would have no room to wait.
+
+        Tasks in the backlog count as waiting, so in cluster mode the shared
+        queue is capped at ``max_queue_depth`` too.
+        """
+        waiting = self.queued + self.backlog()
+        if self.running < self.limit and not waiting:
+            return
+        if waiting >= settings.max_queue_depth:
+            TASKS_REJECTED.labels(reason="queue_full").inc()
+            logger.warning("Task rejected, queue is full", queued=waiting)
+            raise QueueFull(waiting, self.retry_after(waiting))
+
+    def retry_after(self, waiting: int) -> int:
+        """Seconds until a slot is likely to be free with ``waiting`` tasks ahead"""
+        duration = self._avg_duration or DEFAULT_RETRY_AFTER
+        return max(1, math.ceil(duration * (waiting + 1) / self.limit))
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self,
+        priority: int = 0,
+        skill: Optional[str] = None,
+        tenant: str = DEFAULT_TENANT,
+    ) -> AsyncIterator[None]:
+        """Hold an execution slot, waiting in the queue for it if needed"""
+        waiter = self._enqueue(priority, skill, tenant)
+        self._grant()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.cancelled():
+                self._waiting.remove(waiter)
+                TASK_QUEUE_DEPTH.set(self.queued)
+            else:
+                # Granted a slot just before being canceled
+                self._release(waiter)
+            raise
+
+        started = time.monotonic()
+        TASK_QUEUE_WAIT_SECONDS.labels(skill=skill or "unknown").observe(
+            started - waiter.enqueued
+        )
+        try:
+            yield
+        finally:
+            self._release(waiter)
+            duration = time.monotonic() - started
+            if settings.adaptive_concurrency:
+                self.adaptive.observe(skill, duration)
+            if self._avg_duration is None:
+                self._avg_duration = duration
+            else:
+                self._avg_duration += DURATION_SMOOTHING * (
+                    duration - self._avg_duration
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        """Running and queued task counts, overall and per scheduling class"""
+        queued_by_skill = Counter(waiter.skill for waiter in self._waiting)
+        queued_by_tenant = Counter(waiter.tenant for waiter in self._waiting)
+        skills = set(self.running_by_skill) | set(queued_by_skill)
+        skills.update(settings.skill_concurrency)
+        tenants = set(self.running_by_tenant) | set(queued_by_tenant)
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "limit": self.limit,
+            "max_queue_depth": settings.max_queue_depth,
+            "adaptive": self.adaptive.stats() if settings.adaptive_concurrency else None,
+            "skills": {
+                skill: {
+                    "running": self.running_by_skill[skill],
+                    "queued": queued_by_skill[skill],
+                    "limit": settings.skill_concurrency.get(skill),
+                }
+                for skill in skills
+                if skill is not None
+            },
+            "tenants": {
+                tenant: {
+                    "running": self.running_by_tenant[tenant],
+                    "queued": queued_by_tenant[tenant],
+                    "weight": self._weight(tenant),
+                }
+                for tenant in tenants
+            },
+        }
+
+    async def _adapt(self):
+        while True:
+            await asyncio.sleep(settings.adaptive_interval)
+            try:
+                self.adaptive.update(self.saturated)
+                self._grant()
+            except Exception as e:
+                logger.error("Concurrency limit adjustment failed", error=str(e))
+
+    def _weight(self, tenant: str) -> float:
+        return max(settings.tenant_weights.get(tenant, 1.0), 1e-6)
+
+    def _enqueue(self, priority: int, skill: Optional[str], tenant: str) -> _Waiter:
+        # Start tag: a tenant's next task starts where its previous one
+        # finished in virtual time, or now if the tenant was idle
+        tag = max(self._virtual_time, self._finish_tags.get(tenant, 0.0))
+        self._finish_tags[tenant] = tag + 1.0 / self._weight(tenant)
+        waiter = _Waiter(
+            skill,
+            tenant,
+            priority,
+            tag,
+            next(self._order),
+            asyncio.get_running_loop().create_future(),
+        )
+        self._waiting.append(waiter)
+        TASK_QUEUE_DEPTH.set(self.queued)
+        return waiter
+
+    def _has_room(self, skill: Optional[str]) -> bool:
+        cap = settings.skill_concurrency.get(skill)
+        return cap is None or self.running_by_skill[skill] < cap
+
+    def _grant(self):
+        while self.running < self.limit:
+            # The queue is bounded by max_queue_depth, so a scan is cheap
+            candidates = [w for w in self._waiting if self._has_room(w.skill)]
+            if not candidates:
+                break
+            waiter = min(candidates, key=lambda w: (-w.priority, w.tag, w.order))
+            self._waiting.remove(waiter)
+            self._virtual_time = max(self._virtual_time, waiter.tag)
+            self.running += 1
+            self.running_by_skill[waiter.skill] += 1
+            self.running_by_tenant[waiter.tenant] += 1
+            SKILL_RUNNING_TASKS.labels(skill=waiter.skill or "unknown").inc()
+            TENANT_RUNNING_TASKS.labels(tenant=tenant_label(waiter.tenant)).inc()
+            waiter.future.set_result(None)
+        TASK_QUEUE_DEPTH.set(self.queued)
+
+        if len(self._finish_tags) > MAX_TRACKED_TENANTS:
+            # Tags at or behind virtual time no longer affect ordering
+            self._finish_tags = {
+                tenant: tag
+                for tenant, tag in self._finish_tags.items()
+                if tag > self._virtual_time
+            }
+
+    def _release(self, waiter: _Waiter):
+        self.running -= 1
+        self.running_by_skill[waiter.skill] -= 1
+        self.running_by_tenant[waiter.tenant] -= 1
+        # Keep only classes with running tasks
+        self.running_by_skill += Counter()
+        self.running_by_tenant += Counter()
+        SKILL_RUNNING_TASKS.labels(skill=waiter.skill or "unknown").dec()
+        TENANT_RUNNING_TASKS.labels(tenant=tenant_label(waiter.tenant)).dec()
+        self._grant()
+
+
+task_scheduler = TaskScheduler()
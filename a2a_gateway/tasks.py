@@ -1,15 +1,19 @@
 """Task management for A2A Coding Gateway"""
 
 import uuid
-import asyncio
-from typing import Any, Dict, Optional
+from datetime import datetime, UTC
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
 
 from a2a_gateway.config import settings
+from a2a_gateway.events import TERMINAL_STATES, task_events
 from a2a_gateway.redis_store import RedisTaskStore
 from a2a_gateway.memory_store import InMemoryTaskStore
+from a2a_gateway.scheduler import DEFAULT_TENANT
 
-# Concurrency control for task execution
-task_semaphore = asyncio.BoundedSemaphore(settings.max_concurrent_tasks)
+# Configure logger
+logger = structlog.get_logger(__name__)
 
 
 class TaskStore:
@@ -20,6 +24,9 @@ class TaskStore:
             self.store = RedisTaskStore(settings.redis_url)
         else:
             self.store = InMemoryTaskStore()
+        # Called with the id of every task submitted through this node and
+        # whether it was offered to the whole cluster
+        self.submit_hooks: List[Callable[[str, bool], None]] = []
 
     async def initialize(self):
         """Initialize task store"""
@@ -29,24 +36,150 @@ class TaskStore:
         """Close task store"""
         await self.store.close()
 
-    async def create_task(self, message: Dict[str, Any], skill: str) -> str:
-        """Create a new task"""
-        task_id = str(uuid.uuid4())
-        await self.store.create_task(task_id, message, skill)
+    async def create_task(
+        self,
+        message: Dict[str, Any],
+        skill: str,
+        priority: int = 0,
+        tenant: str = DEFAULT_TENANT,
+        shared: bool = True,
+        task_id: Optional[str] = None,
+    ) -> str:
+        """Create a new task; unshared tasks run on this node in cluster mode"""
+        task_id = task_id or str(uuid.uuid4())
+        await self.store.create_task(
+            task_id, message, skill, priority, tenant, shared
+        )
+        task_events.publish_status(
+            task_id, "submitted", datetime.now(UTC).isoformat()
+        )
+        for hook in self.submit_hooks:
+            hook(task_id, shared)
         return task_id
 
-    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Get task by ID"""
-        return await self.store.get_task(task_id)
+    async def get_task(
+        self, task_id: str, artifacts: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Get task by ID; ``artifacts=False`` skips loading its artifacts"""
+        return await self.store.get_task(task_id, artifacts)
+
+    async def get_task_state(self, task_id: str) -> Optional[str]:
+        """State of a task, or None if it does not exist"""
+        return await self.store.get_task_state(task_id)
 
-    async def update_task_status(self, task_id: str, status: str):
-        """Update task status"""
-        await self.store.update_task_status(task_id, status)
+    @property
+    def shared(self) -> bool:
+        """Whether tasks are stored where every gateway node can reach them"""
+        return isinstance(self.store, RedisTaskStore)
+
+    async def claim_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically move a submitted task to working and lease it"""
+        task = await self.store.claim_task(
+            task_id, settings.node_id, settings.lease_seconds
+        )
+        if task is not None:
+            task_events.publish_status(task_id, "working", task["status"]["timestamp"])
+        return task
+
+    async def claim_next_task(self) -> Optional[Dict[str, Any]]:
+        """Claim the next task offered to the cluster (shared stores only)"""
+        task = await self.store.claim_next_task(
+            settings.node_id, settings.lease_seconds
+        )
+        if task is not None:
+            task_events.publish_status(
+                task["id"], "working", task["status"]["timestamp"]
+            )
+        return task
+
+    async def renew_leases(self, task_ids: List[str]):
+        """Extend this node's leases on its running tasks"""
+        if task_ids:
+            await self.store.renew_leases(
+                settings.node_id, task_ids, settings.lease_seconds
+            )
+
+    async def get_expired_leases(self) -> List[str]:
+        """Ids of tasks whose lease has expired"""
+        return await self.store.get_expired_leases()
+
+    async def take_expired_lease(self, task_id: str) -> bool:
+        """Take over an expired lease; False if another node did or it renewed"""
+        return await self.store.take_expired_lease(task_id)
+
+    async def requeue_task(self, task_id: str) -> bool:
+        """Return a working task to submitted so that it runs again"""
+        if not await self.store.requeue_task(task_id):
+            return False
+        task_events.publish_status(
+            task_id, "submitted", datetime.now(UTC).isoformat()
+        )
+        for hook in self.submit_hooks:
+            hook(task_id, True)
+        return True
+
+    async def get_pending_task_ids(self) -> List[str]:
+        """Ids of submitted tasks waiting to be claimed"""
+        return await self.store.get_pending_task_ids()
+
+    async def publish_cancel(self, task_id: str):
+        """Ask other gateway nodes to cancel a task they are running"""
+        if self.shared and settings.cluster_mode:
+            await self.store.publish_cancel(task_id)
+
+    async def watch_cluster(
+        self,
+        on_submitted: Callable[[str], None],
+        on_cancel: Callable[[str], None],
+    ):
+        """Follow task submissions and cancellations of every node"""
+        await self.store.watch_cluster(on_submitted, on_cancel)
+
+    async def update_task_status(self, task_id: str, status: str) -> bool:
+        """Update task status; False if the task is missing or already finished"""
+        if not await self.store.update_task_status(task_id, status):
+            return False
+        task_events.publish_status(
+            task_id,
+            status,
+            datetime.now(UTC).isoformat(),
+            final=status in TERMINAL_STATES,
+        )
+        return True
 
     async def update_task_result(self, task_id: str, result: Dict[str, Any]):
         """Update task result"""
         await self.store.update_task_result(task_id, result)
 
+    async def finish_task(
+        self, task_id: str, status: str, result: Dict[str, Any]
+    ) -> bool:
+        """Record a task's result and final status together.
+
+        The result is stored before the final status is published, so that
+        streaming clients see the artifacts once the final event arrives.
+        Only a working task whose lease, if any, this node holds is
+        finished; otherwise the result is discarded and False returned.
+        """
+        if not await self.store.finish_task(task_id, status, result, settings.node_id):
+            logger.warning(
+                "Task result discarded, task no longer running here",
+                task_id=task_id,
+                status=status,
+            )
+            return False
+        task_events.publish_status(
+            task_id,
+            status,
+            datetime.now(UTC).isoformat(),
+            final=status in TERMINAL_STATES,
+        )
+        return True
+
+    async def update_task_usage(self, task_id: str, usage: Dict[str, float]):
+        """Update task resource usage"""
+        await self.store.update_task_usage(task_id, usage)
+
     async def get_task_timestamp(self, task_id: str) -> str:
         """Get task timestamp"""
         return await self.store.get_task_timestamp(task_id)
@@ -55,6 +188,18 @@ class TaskStore:
         """Get number of active tasks"""
         return await self.store.get_active_count()
 
+    def state_counts(self) -> Dict[str, Any]:
+        """Task count per state, without a store round-trip.
+
+        ``age_seconds`` tells how old the counts are: the Redis store
+        refreshes them every ``count_refresh_interval`` seconds.
+        """
+        counts, age = self.store.state_counts()
+        return {
+            "states": counts,
+            "age_seconds": None if age is None else round(age, 3),
+        }
+
     async def check_redis_health(self) -> Dict[str, Any]:
         """Check Redis health (if using Redis store)"""
         if isinstance(self.store, RedisTaskStore):
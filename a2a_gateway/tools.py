@@ -1,15 +1,25 @@
 """Coding tools integration for A2A Coding Gateway"""
 
 import asyncio
-import pty
-import os
-import subprocess
+import codecs
 import structlog
 import re
-from typing import Any, Dict, List
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
 
 from a2a_gateway.config import settings
-from a2a_gateway.tasks import task_store, task_semaphore
+from a2a_gateway.executor import TaskReporter, worker_pool
+from a2a_gateway.limits import TaskCgroup, collect_usage, get_limits, make_preexec
+from a2a_gateway.metrics import TASK_RECLAIM_SECONDS
+from a2a_gateway.normalize import TerminalNormalizer
+from a2a_gateway.output import OutputBuffer
+from a2a_gateway.pty_runner import PtyProcess
+from a2a_gateway.registry import ToolAdapter, tool_registry
+from a2a_gateway.result_cache import result_cache
+from a2a_gateway.scheduler import DEFAULT_TENANT, task_scheduler
+from a2a_gateway.tasks import task_store
+from a2a_gateway.warm_pool import warm_pools
 
 # Configure logger
 logger = structlog.get_logger(__name__)
@@ -29,37 +39,165 @@ def sanitize_log(message: str) -> str:
     return message
 
 
-async def execute_task_with_tool(task_id: str, message: Dict[str, Any], skill: str):
+# Skill of the task being executed, read when spawning its tool
+current_skill: ContextVar[Optional[str]] = ContextVar("current_skill", default=None)
+
+# Receives tool output and usage; executor workers forward them instead
+reporter = TaskReporter()
+
+# Executions of this process, by task id
+running_executions: Dict[str, asyncio.Task] = {}
+
+# Start time and reason of slot reclaims in progress, by task id
+_reclaims: Dict[str, Tuple[str, float]] = {}
+
+# Seconds tasks/cancel waits for the execution to wind down
+CANCEL_WAIT = 5.0
+
+
+def launch_task_execution(
+    task_id: str,
+    message: Dict[str, Any],
+    skill: str,
+    priority: int = 0,
+    tenant: str = DEFAULT_TENANT,
+) -> asyncio.Task:
+    """Execute a task in background, tracking it for cancellation"""
+    execution = asyncio.create_task(
+        execute_task_with_tool(task_id, message, skill, priority, tenant)
+    )
+    running_executions[task_id] = execution
+    execution.add_done_callback(lambda _: running_executions.pop(task_id, None))
+    return execution
+
+
+async def cancel_task_execution(task_id: str) -> bool:
+    """Cancel a running execution; False if it does not run in this process"""
+    execution = running_executions.get(task_id)
+    if execution is None or execution.done():
+        return False
+    start_reclaim(task_id, "cancel")
+    execution.cancel()
+    await asyncio.wait({execution}, timeout=CANCEL_WAIT)
+    return True
+
+
+def start_reclaim(task_id: str, reason: str, elapsed: float = 0.0):
+    """Mark the start of reclaiming a task's slot, ``elapsed`` seconds ago"""
+    _reclaims.setdefault(task_id, (reason, time.monotonic() - elapsed))
+
+
+def finish_reclaim(task_id: str):
+    """Record how long reclaiming a task's slot took, if it was reclaimed"""
+    reclaim = _reclaims.pop(task_id, None)
+    if reclaim is not None:
+        reason, started = reclaim
+        TASK_RECLAIM_SECONDS.labels(reason=reason).observe(time.monotonic() - started)
+
+
+async def execute_task_with_tool(
+    task_id: str,
+    message: Dict[str, Any],
+    skill: str,
+    priority: int = 0,
+    tenant: str = DEFAULT_TENANT,
+):
     """Execute task with appropriate coding tool"""
     logger.info("Starting task execution", task_id=task_id, skill=skill)
     try:
-        async with task_semaphore:
-            logger.debug("Task acquired semaphore", task_id=task_id)
-            if skill == "fix_bug":
-                result = await run_droid_task(task_id, message)
-            elif skill == "refactor_code":
-                result = await run_claude_task(task_id, message)
-            elif skill == "review_pr":
-                result = await run_claude_task(task_id, message)
-            else:
-                result = {"artifacts": [], "error": f"Unsupported skill: {skill}"}
+        cache_key = None
+        if result_cache.enabled_for(skill):
+            cache_key = await result_cache.make_key(skill, message)
+            cached = await result_cache.get(skill, cache_key) if cache_key else None
+            if cached is not None:
+                logger.info("Task served from result cache", task_id=task_id)
+                await task_store.finish_task(task_id, "completed", cached)
+                return
+
+        try:
+            async with task_scheduler.slot(priority, skill, tenant):
+                logger.debug("Task acquired execution slot", task_id=task_id)
+                if worker_pool.enabled:
+                    result = await worker_pool.run(task_id, message, skill)
+                else:
+                    result = await run_skill(task_id, message, skill)
+                # A timed out tool was torn down where it ran, maybe a worker
+                reclaim = result.pop("reclaim", None)
+                if reclaim is not None:
+                    start_reclaim(task_id, reclaim["reason"], reclaim["seconds"])
+        finally:
+            finish_reclaim(task_id)
 
         if "error" in result:
             logger.error(
                 "Task execution failed", task_id=task_id, error=result["error"]
             )
-            await task_store.update_task_status(task_id, "failed")
+            await task_store.finish_task(task_id, "failed", result)
         else:
             logger.info("Task execution completed", task_id=task_id)
-            await task_store.update_task_status(task_id, "completed")
-        await task_store.update_task_result(task_id, result)
+            await task_store.finish_task(task_id, "completed", result)
+            if cache_key is not None:
+                await result_cache.set(cache_key, result)
+
+    except asyncio.CancelledError:
+        logger.info("Task execution canceled", task_id=task_id)
+        await task_store.finish_task(
+            task_id, "canceled", {"artifacts": [], "error": "Task canceled"}
+        )
+        raise
 
     except Exception as e:
         logger.error("Task execution exception", task_id=task_id, error=str(e))
-        await task_store.update_task_status(task_id, "failed")
-        await task_store.update_task_result(task_id, {"artifacts": [], "error": str(e)})
+        await task_store.finish_task(
+            task_id, "failed", {"artifacts": [], "error": str(e)}
+        )
+
+    finally:
+        # Canceled before taking a slot, such as during the cache lookup
+        finish_reclaim(task_id)
 
 
+async def run_skill(
+    task_id: str, message: Dict[str, Any], skill: str
+) -> Dict[str, Any]:
+    """Run a skill's handler in this process"""
+    current_skill.set(skill)
+    skill_spec = tool_registry.get_skill(skill)
+    if skill_spec is None:
+        return {"artifacts": [], "error": f"Unsupported skill: {skill}"}
+    return await skill_spec.handler(task_id, message)
+
+
+DROID = tool_registry.add_tool(ToolAdapter("droid", "droid_command"))
+CLAUDE = tool_registry.add_tool(ToolAdapter("claude", "claude_command"))
+
+# Input schema of the skills served by run_claude_task
+CLAUDE_INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "project_description": {"type": "string"},
+        "workdir": {"type": "string"},
+        "project_type": {"type": "string", "enum": ["python", "go", "nodejs"]},
+    },
+    "required": ["workdir"],
+}
+
+
+@tool_registry.skill(
+    "fix_bug",
+    name="Fix Bug",
+    description="Fix a bug in codebase",
+    input_schema={
+        "type": "object",
+        "properties": {
+            "bug_description": {"type": "string"},
+            "workdir": {"type": "string"},
+            "context_files": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["bug_description"],
+    },
+    tool="droid",
+)
 async def run_droid_task(task_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
     """Run droid tool task"""
     logger.debug("Running droid task", task_id=task_id)
@@ -68,18 +206,32 @@ async def run_droid_task(task_id: str, message: Dict[str, Any]) -> Dict[str, Any
     context_files = message.get("context_files", [])
 
     # Create command
-    command = [settings.droid_command, "fix", bug_description]
+    command = [*DROID.command, "fix", bug_description]
     if workdir != ".":
         command.extend(["--workdir", workdir])
     if context_files:
         command.extend(["--context", ",".join(context_files)])
 
+    # Task input for a pre-spawned droid session
+    warm_input = bug_description
+    if context_files:
+        warm_input += "\n\nContext files: " + ", ".join(context_files)
+
     logger.debug("Droid command created", task_id=task_id, command=command)
-    result = await run_pty_command(task_id, command, workdir)
+    result = await run_pty_command(
+        task_id, command, workdir, tool="droid", warm_input=warm_input
+    )
     logger.debug("Droid task completed", task_id=task_id, result=result)
     return result
 
 
+@tool_registry.skill(
+    "generate_dockerfile",
+    name="Generate Dockerfile",
+    description="Generate a production-ready Dockerfile for the project",
+    input_schema=CLAUDE_INPUT_SCHEMA,
+    tool="claude",
+)
 async def run_claude_task(task_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
     """Run Claude Code tool task to generate Dockerfile"""
     logger.info("Running Claude Code task for Dockerfile generation", task_id=task_id)
@@ -90,8 +242,8 @@ async def run_claude_task(task_id: str, message: Dict[str, Any]) -> Dict[str, An
     workdir = message.get("workdir", ".")
     project_type = message.get("project_type", "python")
     
-    # Check if Claude Code CLI is available
-    claude_available = await check_claude_code_available()
+    # Check if Claude Code CLI is available (cached by the registry)
+    claude_available = await CLAUDE.is_available()
     
     if not claude_available:
         # Fall back to template-based Dockerfile generation
@@ -128,13 +280,15 @@ Return the complete Dockerfile content only, no explanations.
 """
     
     command = [
-        settings.claude_command,
+        *CLAUDE.command,
         prompt,
         "--output", "dockerfile"
     ]
     
     logger.info("Calling Claude Code to generate Dockerfile", task_id=task_id, command=command)
-    result = await run_pty_command(task_id, command, workdir)
+    result = await run_pty_command(
+        task_id, command, workdir, tool="claude", warm_input=prompt
+    )
     
     # Extract Dockerfile from Claude Code output
     dockerfile = extract_dockerfile_from_output(result.get("artifacts", []))
@@ -167,27 +321,6 @@ Return the complete Dockerfile content only, no explanations.
         }
 
 
-async def check_claude_code_available() -> bool:
-    """Check if Claude Code CLI is available"""
-    try:
-        process = await asyncio.create_subprocess_exec(
-            [settings.claude_command, "--version"],
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await process.communicate()
-        
-        if process.returncode == 0:
-            logger.info(f"Claude Code CLI available, version: {stdout.decode().strip()}")
-            return True
-        else:
-            logger.warning(f"Claude Code CLI not available: {stderr.decode()}")
-            return False
-    except Exception as e:
-        logger.error(f"Failed to check Claude Code availability: {e}")
-        return False
-
-
 def generate_dockerfile_from_template(description: str, project_type: str, workdir: str) -> str:
     """Generate Dockerfile from template"""
     if project_type.lower() == "python":
@@ -242,29 +375,147 @@ def extract_dockerfile_from_output(artifacts: list) -> str:
     return ""
 
 
-async def run_pty_command(task_id: str, command: List[str], cwd: str) -> Dict[str, Any]:
-    """Run command in PTY mode"""
+async def run_pty_command(
+    task_id: str,
+    command: List[str],
+    cwd: str,
+    tool: Optional[str] = None,
+    warm_input: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run command in PTY mode.
+
+    When ``tool`` has a warm pool with an idle session for ``cwd``, that
+    session is given ``warm_input`` on stdin instead of spawning ``command``.
+    """
     logger.debug("Executing PTY command", task_id=task_id, command=command, cwd=cwd)
-    loop = asyncio.get_event_loop()
+    output = OutputBuffer(task_id)
+    normalizer = TerminalNormalizer() if settings.output_normalize else None
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def on_output(data: bytes, final: bool = False):
+        if normalizer is not None:
+            data = normalizer.feed(data) if not final else normalizer.flush()
+        output.write(data)
+        text = decoder.decode(data, final)
+        if text:
+            reporter.output(task_id, text)
+
+    skill = current_skill.get()
+    limits = get_limits(skill)
+    cgroup = None
+
+    # Warm sessions were spawned before the skill was known, so they only
+    # serve skills without resource limits
+    session = None
+    if tool is not None and warm_input is not None and not limits:
+        session = await warm_pools.acquire(tool, cwd)
+
+    if session is not None:
+        logger.debug("Using warm tool session", task_id=task_id, tool=tool)
+        process = session.process
+        completion = session.run(warm_input.encode(), on_output)
+    else:
+        cgroup = TaskCgroup.create(task_id, limits) if limits else None
+        process = PtyProcess(
+            command, cwd, on_output=on_output, preexec_fn=make_preexec(limits, cgroup)
+        )
+        try:
+            await process.start()
+        except Exception as e:
+            if cgroup is not None:
+                cgroup.remove()
+            logger.error("PTY command exception", task_id=task_id, error=str(e))
+            return {"artifacts": [], "error": str(e)}
+        completion = process.wait()
+
+    completed = False
+    timed_out = None
     try:
-        return await asyncio.wait_for(
-            loop.run_in_executor(
-                None, _run_pty_command_blocking, task_id, command, cwd
-            ),
-            timeout=settings.task_timeout,
+        return_code = await asyncio.wait_for(
+            completion, timeout=settings.task_timeout
         )
+        completed = True
     except asyncio.TimeoutError:
+        timed_out = time.monotonic()
+    finally:
+        if session is not None and completed:
+            warm_pools.release(tool, session)
+        else:
+            # Timed out or canceled: signal the process group and tear down
+            # the PTY without waiting, so the slot is released right away
+            process.close(grace=settings.kill_grace_seconds)
+        on_output(b"", final=True)
+        output.close()
+        if process.exited.done():
+            await record_usage(task_id, skill, process, cgroup)
+        elif session is None or not completed:
+            # Account for the tool once it has actually exited
+            process.exited.add_done_callback(
+                lambda _: asyncio.ensure_future(
+                    record_usage(task_id, skill, process, cgroup)
+                )
+            )
+
+    if timed_out is not None:
         error_msg = f"Command timed out after {settings.task_timeout} seconds"
         logger.error("PTY command timeout", task_id=task_id, error=error_msg)
+        # Reclaiming the slot started at the timeout; the caller records it
+        reclaim = {"reason": "timeout", "seconds": time.monotonic() - timed_out}
+        return {"artifacts": [], "error": error_msg, "reclaim": reclaim}
+
+    # Decoded once and shared by the logs and the artifact
+    text = output.text()
+    logger.debug(
+        "PTY command completed",
+        task_id=task_id,
+        return_code=return_code,
+        output_bytes=output.total_bytes,
+        output=text,
+    )
+
+    if return_code != 0:
+        error_msg = f"Command failed with return code {return_code}"
+        logger.error(
+            "PTY command failed",
+            task_id=task_id,
+            return_code=return_code,
+            error=error_msg,
+            output=text,
+            log_file=output.log_path,
+        )
         return {"artifacts": [], "error": error_msg}
 
+    # Sized from the buffer so stores need not serialize the output to measure it
+    return {
+        "artifacts": [output.to_artifact(text)],
+        "artifact_bytes": output.retained_bytes,
+    }
+
+
+async def record_usage(
+    task_id: str,
+    skill: Optional[str],
+    process: PtyProcess,
+    cgroup: Optional[TaskCgroup],
+):
+    """Report the resources used by an exited tool"""
+    if process.rusage is None:
+        return
+    usage = collect_usage(process.rusage, cgroup)
+    if cgroup is not None and not cgroup.remove():
+        # Descendants outlived the tool; kill them and retry once
+        cgroup.kill()
+        asyncio.get_running_loop().call_later(1.0, cgroup.remove)
+    logger.debug("Tool resource usage", task_id=task_id, **usage)
+    await reporter.usage(task_id, skill, usage)
+
 
 async def generate_dockerfile_task(task_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
     """Generate Dockerfile using Claude Code"""
     logger.info("Starting Dockerfile generation task", task_id=task_id)
     try:
-        async with task_semaphore:
-            logger.debug("Task acquired semaphore", task_id=task_id)
+        async with task_scheduler.slot(skill="generate_dockerfile"):
+            logger.debug("Task acquired execution slot", task_id=task_id)
             
             # Extract parameters
             project_description = message.get("project_description", "")
@@ -285,105 +536,11 @@ async def generate_dockerfile_task(task_id: str, message: Dict[str, Any]) -> Dic
             
             if "error" in result:
                 logger.error("Dockerfile generation failed", task_id=task_id, error=result["error"])
-                await task_store.update_task_status(task_id, "failed")
-                await task_store.update_task_result(task_id, result)
+                await task_store.finish_task(task_id, "failed", result)
             else:
                 logger.info("Dockerfile generation completed", task_id=task_id)
-                await task_store.update_task_status(task_id, "completed")
-                await task_store.update_task_result(task_id, result)
+                await task_store.finish_task(task_id, "completed", result)
 
     except Exception as e:
         logger.error("Dockerfile generation task exception", task_id=task_id, error=str(e))
-        await task_store.update_task_status(task_id, "failed")
-        await task_store.update_task_result(task_id, {"artifacts": [], "error": str(e)})
-
-
-def _run_pty_command_blocking(
-    task_id: str, command: List[str], cwd: str
-) -> Dict[str, Any]:
-    """Run command in PTY mode (blocking version)"""
-    logger.debug("PTY command started (blocking)", task_id=task_id)
-    master = None
-    process = None
-    try:
-        # Create PTY process
-        master, slave = pty.openpty()
-        process = subprocess.Popen(
-            command,
-            stdin=slave,
-            stdout=slave,
-            stderr=slave,
-            cwd=cwd,
-            universal_newlines=True,
-            close_fds=True,
-        )
-        os.close(slave)
-
-        # Read output with non-blocking mode
-        os.set_blocking(master, False)
-        output = []
-
-        while process.poll() is None:
-            try:
-                data = os.read(master, 1024).decode()
-                if data:
-                    output.append(data)
-            except (OSError, BlockingIOError):
-                # No data available, continue
-                import time
-
-                time.sleep(0.1)
-                continue
-            except Exception:
-                break
-
-        # Read any remaining output
-        try:
-            while True:
-                data = os.read(master, 1024).decode()
-                if not data:
-                    break
-                output.append(data)
-        except (OSError, BlockingIOError):
-            pass
-
-        # Wait for process to complete
-        return_code = process.wait()
-        logger.debug(
-            "PTY command completed",
-            task_id=task_id,
-            return_code=return_code,
-            output="".join(output),
-        )
-
-        if return_code != 0:
-            error_msg = f"Command failed with return code {return_code}"
-            logger.error(
-                "PTY command failed",
-                task_id=task_id,
-                return_code=return_code,
-                error=error_msg,
-                output="".join(output),
-            )
-            return {"artifacts": [], "error": error_msg}
-
-        return {"artifacts": [{"type": "text", "data": {"output": "".join(output)}}]}
-
-    except Exception as e:
-        logger.error("PTY command exception", task_id=task_id, error=str(e))
-        return {"artifacts": [], "error": str(e)}
-    finally:
-        if master is not None:
-            try:
-                os.close(master)
-            except Exception:
-                pass
-        if process is not None and process.poll() is None:
-            try:
-                process.terminate()
-                process.wait(timeout=1)
-            except Exception:
-                try:
-                    process.kill()
-                except Exception:
-                    pass
+        await task_store.finish_task(task_id, "failed", {"artifacts": [], "error": str(e)})
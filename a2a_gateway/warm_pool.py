@@ -0,0 +1,301 @@
+"""Pre-warmed tool session pool for A2A Coding Gateway"""
+
+import asyncio
+import os
+import re
+import shlex
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Optional, Set
+
+import structlog
+
+from a2a_gateway.config import settings
+from a2a_gateway.metrics import WARM_POOL_IDLE_SESSIONS, WARM_POOL_REQUESTS
+from a2a_gateway.pty_runner import PtyProcess
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+# Bytes of recent output searched for the ready pattern
+READY_WINDOW = 4096
+
+# Seconds between sweeps for expired or exited idle sessions
+MAINTENANCE_INTERVAL = 5.0
+
+
+class WarmSession:
+    """A pre-spawned tool process waiting for a task on its stdin.
+
+    Output printed before a task is handed over (banners, login notices) is
+    discarded. Without a ready pattern a session is single-use: the task input
+    is followed by end-of-file and the task ends when the tool exits. With a
+    ready pattern the tool is expected to print it once it is ready for more
+    input, which ends the task and lets the session be reused.
+    """
+
+    def __init__(self, command, cwd: str, ready_pattern: Optional[re.Pattern]):
+        self.cwd = cwd
+        self.ready_pattern = ready_pattern
+        self.created_at = time.monotonic()
+        self.uses = 0
+        self.process = PtyProcess(
+            command, cwd, on_output=self._on_output, stdin_pipe=True
+        )
+        self._consumer: Optional[Callable[[bytes], None]] = None
+        self._recent = b""
+        self._ready: Optional[asyncio.Future] = None
+
+    @property
+    def age(self) -> float:
+        """Seconds since the session was spawned"""
+        return time.monotonic() - self.created_at
+
+    async def run(self, data: bytes, on_output: Callable[[bytes], None]) -> int:
+        """Hand a task's input to the tool and wait until it is done.
+
+        Returns the exit code, or 0 if the tool printed the ready pattern.
+        """
+        self.uses += 1
+        self._consumer = on_output
+        if self.ready_pattern is None:
+            await self.process.send(data, eof=True)
+            return await self.process.wait()
+
+        self._recent = b""
+        self._ready = asyncio.get_running_loop().create_future()
+        await self.process.send(data + b"\n")
+        exited = asyncio.ensure_future(self.process.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {exited, self._ready}, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            exited.cancel()
+            self._consumer = None
+        if exited in done and not exited.cancelled():
+            return exited.result()
+        return 0
+
+    def close(self):
+        """Kill the tool and tear down its PTY"""
+        self._consumer = None
+        self.process.close()
+
+    def _on_output(self, data: bytes):
+        if self._consumer is None:
+            return
+        self._consumer(data)
+        if self._ready is not None and not self._ready.done():
+            self._recent = (self._recent + data)[-READY_WINDOW:]
+            if self.ready_pattern.search(self._recent):
+                self._ready.set_result(None)
+
+
+class WarmPool:
+    """Idle pre-spawned sessions of one tool, kept per working directory.
+
+    Working directories are learned from the tasks that ask for them (plus
+    ``warm_pool_workdirs``) and the least recently used ones are dropped once
+    more than ``warm_pool_max_workdirs`` are known.
+    """
+
+    def __init__(self, tool: str, command: str):
+        self.tool = tool
+        self.command = shlex.split(command)
+        self.ready_pattern = (
+            re.compile(settings.warm_pool_ready_pattern.encode())
+            if settings.warm_pool_ready_pattern
+            else None
+        )
+        self.idle: "OrderedDict[str, Deque[WarmSession]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._filling: Set[str] = set()
+
+    async def acquire(self, cwd: str) -> Optional[WarmSession]:
+        """Take an idle session for ``cwd``, or None on a miss"""
+        cwd = os.path.abspath(cwd)
+        sessions = self._touch(cwd)
+        session = None
+        while sessions:
+            candidate = sessions.popleft()
+            if self._usable(candidate):
+                session = candidate
+                break
+            candidate.close()
+
+        if session is None:
+            self.misses += 1
+            WARM_POOL_REQUESTS.labels(tool=self.tool, result="miss").inc()
+        else:
+            self.hits += 1
+            WARM_POOL_REQUESTS.labels(tool=self.tool, result="hit").inc()
+        self._update_gauge()
+        self.fill(cwd)
+        return session
+
+    def release(self, session: WarmSession):
+        """Return a session after a task, recycling it if it is spent"""
+        sessions = self.idle.get(session.cwd)
+        if (
+            sessions is not None
+            and session.uses < settings.warm_pool_max_uses
+            and self._usable(session)
+        ):
+            # Reused sessions go first; surplus fresh ones are dropped
+            sessions.appendleft(session)
+            while len(sessions) > settings.warm_pool_size:
+                sessions.pop().close()
+        else:
+            session.close()
+        self._update_gauge()
+
+    def add_workdir(self, cwd: str):
+        """Start keeping warm sessions for ``cwd``"""
+        cwd = os.path.abspath(cwd)
+        self._touch(cwd)
+        self.fill(cwd)
+
+    def fill(self, cwd: str):
+        """Top up the idle sessions of ``cwd`` in the background"""
+        if cwd not in self._filling and cwd in self.idle:
+            self._filling.add(cwd)
+            asyncio.create_task(self._fill(cwd))
+
+    def expire(self):
+        """Drop exited or expired idle sessions and refill"""
+        for cwd, sessions in self.idle.items():
+            for session in list(sessions):
+                if not self._usable(session):
+                    sessions.remove(session)
+                    session.close()
+            self.fill(cwd)
+        self._update_gauge()
+
+    def close(self):
+        """Kill every idle session"""
+        for sessions in self.idle.values():
+            for session in sessions:
+                session.close()
+        self.idle.clear()
+        self._update_gauge()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and hit/miss counts"""
+        requests = self.hits + self.misses
+        return {
+            "idle": sum(len(sessions) for sessions in self.idle.values()),
+            "workdirs": len(self.idle),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+    def _touch(self, cwd: str) -> Deque[WarmSession]:
+        if cwd in self.idle:
+            self.idle.move_to_end(cwd)
+            return self.idle[cwd]
+        sessions = self.idle[cwd] = deque()
+        while len(self.idle) > settings.warm_pool_max_workdirs:
+            _, evicted = self.idle.popitem(last=False)
+            for session in evicted:
+                session.close()
+        return sessions
+
+    def _usable(self, session: WarmSession) -> bool:
+        return (
+            session.process.running and session.age < settings.warm_pool_max_age
+        )
+
+    async def _fill(self, cwd: str):
+        try:
+            while (
+                cwd in self.idle and len(self.idle[cwd]) < settings.warm_pool_size
+            ):
+                session = WarmSession(self.command, cwd, self.ready_pattern)
+                try:
+                    await session.process.start()
+                except Exception as e:
+                    logger.error(
+                        "Failed to spawn warm session",
+                        tool=self.tool,
+                        cwd=cwd,
+                        error=str(e),
+                    )
+                    return
+                if cwd in self.idle:
+                    self.idle[cwd].append(session)
+                else:
+                    session.close()
+                self._update_gauge()
+        finally:
+            self._filling.discard(cwd)
+
+    def _update_gauge(self):
+        WARM_POOL_IDLE_SESSIONS.labels(tool=self.tool).set(
+            sum(len(sessions) for sessions in self.idle.values())
+        )
+
+
+class WarmPoolManager:
+    """Warm pools of every tool that has a warm command configured"""
+
+    def __init__(self):
+        self.pools: Dict[str, WarmPool] = {}
+        self._maintenance: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Create the configured pools and pre-spawn their sessions"""
+        if settings.warm_pool_size <= 0:
+            return
+        commands = {
+            "droid": settings.droid_warm_command,
+            "claude": settings.claude_warm_command,
+        }
+        for tool, command in commands.items():
+            if not command:
+                continue
+            pool = self.pools[tool] = WarmPool(tool, command)
+            for workdir in settings.warm_pool_workdirs:
+                pool.add_workdir(workdir)
+        if self.pools:
+            logger.info("Warm pools started", tools=list(self.pools))
+            self._maintenance = asyncio.create_task(self._maintain())
+
+    async def close(self):
+        """Stop maintenance and kill every idle session"""
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+            self._maintenance = None
+        for pool in self.pools.values():
+            pool.close()
+        self.pools.clear()
+
+    async def acquire(self, tool: str, cwd: str) -> Optional[WarmSession]:
+        """Take an idle session of ``tool`` for ``cwd`` if one is pooled"""
+        pool = self.pools.get(tool)
+        if pool is None:
+            return None
+        return await pool.acquire(cwd)
+
+    def release(self, tool: str, session: WarmSession):
+        """Return a session to its pool after a task"""
+        pool = self.pools.get(tool)
+        if pool is None:
+            session.close()
+        else:
+            pool.release(session)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-tool pool statistics"""
+        return {tool: pool.stats() for tool, pool in self.pools.items()}
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(MAINTENANCE_INTERVAL)
+            for pool in self.pools.values():
+                pool.expire()
+
+
+warm_pools = WarmPoolManager()
@@ -0,0 +1,173 @@
+"""Executor worker process for A2A Coding Gateway"""
+
+import asyncio
+import os
+import signal
+import sys
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import structlog
+
+from a2a_gateway import tools
+from a2a_gateway.config import settings
+from a2a_gateway.executor import read_frame, write_frame
+from a2a_gateway.log import configure_logging
+from a2a_gateway.registry import tool_registry
+from a2a_gateway.warm_pool import warm_pools
+
+# Configure logger
+logger = structlog.get_logger(__name__)
+
+
+class WorkerReporter:
+    """Forwards tool output, usage and results to the API process.
+
+    Frames are queued and written by a sender task that waits for the
+    connection to drain, so a slow API process holds output back here
+    instead of growing the transport buffer. Consecutive output of a task
+    is merged into one frame. Once more than ``executor_output_queue_chars``
+    of output is queued, the oldest is dropped and the stream carries a note
+    of how much; results, which hold the complete output, are never dropped.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.queue: Deque[Dict[str, Any]] = deque()
+        self.queued_chars = 0
+        self._ready = asyncio.Event()
+        self._sender: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start writing queued frames"""
+        self._sender = asyncio.create_task(self._send_queued())
+
+    async def close(self):
+        """Stop writing; frames still queued are discarded"""
+        if self._sender is not None:
+            self._sender.cancel()
+            await asyncio.gather(self._sender, return_exceptions=True)
+            self._sender = None
+
+    def output(self, task_id: str, text: str):
+        """Forward decoded tool output"""
+        last = self.queue[-1] if self.queue else None
+        if last is not None and last["type"] == "output" and last["task_id"] == task_id:
+            last["text"] += text
+        else:
+            self.queue.append({"type": "output", "task_id": task_id, "text": text})
+        self.queued_chars += len(text)
+        if self.queued_chars > settings.executor_output_queue_chars:
+            self._drop_oldest_output()
+        self._ready.set()
+
+    async def usage(
+        self, task_id: str, skill: Optional[str], usage: Dict[str, float]
+    ):
+        """Forward the resources used by an exited tool"""
+        self.send({"type": "usage", "task_id": task_id, "skill": skill, "usage": usage})
+
+    def send(self, message: Dict[str, Any]):
+        """Queue a frame behind the output already queued"""
+        self.queue.append(message)
+        self._ready.set()
+
+    def _drop_oldest_output(self):
+        for frame in self.queue:
+            excess = self.queued_chars - settings.executor_output_queue_chars
+            if excess <= 0:
+                return
+            if frame["type"] != "output":
+                continue
+            dropped = min(excess, len(frame["text"]))
+            frame["text"] = frame["text"][dropped:]
+            frame["dropped"] = frame.get("dropped", 0) + dropped
+            self.queued_chars -= dropped
+
+    async def _send_queued(self):
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self.queue:
+                frame = self.queue.popleft()
+                if frame["type"] == "output":
+                    self.queued_chars -= len(frame["text"])
+                    dropped = frame.pop("dropped", 0)
+                    if dropped:
+                        logger.warning(
+                            "Dropped tool output", task_id=frame["task_id"], chars=dropped
+                        )
+                        frame["text"] = (
+                            f"\n[... {dropped} characters of output dropped ...]\n"
+                            + frame["text"]
+                        )
+                write_frame(self.writer, frame)
+                await self.writer.drain()
+
+
+async def run_job(
+    reporter: WorkerReporter, task_id: str, message: Dict[str, Any], skill: str
+):
+    """Run one task and send its result back"""
+    try:
+        result = await tools.run_skill(task_id, message, skill)
+    except Exception as e:
+        logger.error("Task execution exception", task_id=task_id, error=str(e))
+        result = {"artifacts": [], "error": str(e)}
+    reporter.send({"type": "result", "task_id": task_id, "result": result})
+
+
+async def serve(socket_path: str):
+    """Connect to the API process and run tasks until told to stop"""
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    reporter = tools.reporter = WorkerReporter(writer)
+    await tool_registry.start()
+    await warm_pools.start()
+
+    # The API process terminates workers on shutdown
+    receiving = asyncio.current_task()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, receiving.cancel)
+
+    jobs: Dict[str, asyncio.Task] = {}
+
+    def forget(task_id: str, job: asyncio.Task):
+        if jobs.get(task_id) is job:
+            del jobs[task_id]
+
+    write_frame(writer, {"type": "hello", "pid": os.getpid()})
+    reporter.start()
+    logger.info("Executor worker ready", pid=os.getpid())
+    try:
+        while (message := await read_frame(reader)) is not None:
+            task_id = message["task_id"]
+            if message["type"] == "run":
+                job = asyncio.create_task(
+                    run_job(reporter, task_id, message["message"], message["skill"])
+                )
+                jobs[task_id] = job
+                job.add_done_callback(lambda job, task_id=task_id: forget(task_id, job))
+            elif message["type"] == "cancel" and task_id in jobs:
+                jobs[task_id].cancel()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        # Canceling a job tears down its tool's process group
+        for job in jobs.values():
+            job.cancel()
+        await asyncio.gather(*jobs.values(), return_exceptions=True)
+        await warm_pools.close()
+        await tool_registry.close()
+        await reporter.close()
+        writer.close()
+
+
+def main():
+    """Worker entry point, started by the API process"""
+    configure_logging()
+    # Ctrl-C reaches the whole process group; shutdown is driven by the API
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(serve(sys.argv[1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Throughput benchmark for TerminalNormalizer
+
+Usage:
+    python benchmarks/bench_normalizer.py [transcript ...]
+
+Captured tool transcripts (raw PTY bytes, e.g. from ``script -q``) can be
+passed as arguments. Without arguments, synthetic multi-MB transcripts
+resembling droid and Claude Code sessions are generated.
+"""
+
+import random
+import sys
+import time
+
+from a2a_gateway.normalize import TerminalNormalizer
+
+CHUNK_SIZES = [4 * 1024, 64 * 1024]
+SPINNER = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
+
+
+def make_log_transcript(size: int) -> bytes:
+    """Colored log lines, mostly plain text"""
+    rng = random.Random(1)
+    lines = []
+    total = 0
+    levels = [b"\x1b[32mINFO\x1b[0m", b"\x1b[33mWARN\x1b[0m", b"\x1b[1;31mERROR\x1b[0m"]
+    while total < size:
+        words = b" ".join(
+            rng.choice([b"reading", b"src/app.py", b"patch", b"applied", b"tests"])
+            for _ in range(rng.randint(4, 16))
+        )
+        line = b"%s \x1b[2m%06d\x1b[22m %s\r\n" % (rng.choice(levels), total, words)
+        lines.append(line)
+        total += len(line)
+    return b"".join(lines)
+
+
+def make_spinner_transcript(size: int) -> bytes:
+    """Spinner and progress-bar redraws between short status lines"""
+    parts = [b"\x1b]0;claude\x07"]
+    total = 0
+    step = 0
+    while total < size:
+        frames = []
+        for i in range(100):
+            spinner = SPINNER[i % len(SPINNER)].encode()
+            bar = b"#" * (i // 5) + b"-" * (20 - i // 5)
+            frames.append(
+                b"\r\x1b[2K\x1b[36m%s\x1b[0m Thinking [%s] %d%%" % (spinner, bar, i)
+            )
+        frames.append(b"\r\x1b[2K\x1b[32m\xe2\x9c\x93\x1b[0m step %d done\r\n" % step)
+        chunk = b"".join(frames)
+        parts.append(chunk)
+        total += len(chunk)
+        step += 1
+    return b"".join(parts)
+
+
+def bench(name: str, transcript: bytes):
+    for chunk_size in CHUNK_SIZES:
+        chunks = [
+            transcript[i : i + chunk_size]
+            for i in range(0, len(transcript), chunk_size)
+        ]
+        normalizer = TerminalNormalizer()
+        started = time.perf_counter()
+        output = sum(len(normalizer.feed(chunk)) for chunk in chunks)
+        output += len(normalizer.flush())
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:<24} chunk={chunk_size // 1024:>3} KiB "
+            f"in={len(transcript) / 1e6:7.2f} MB out={output / 1e6:7.2f} MB "
+            f"({output / len(transcript):6.1%}) {len(transcript) / elapsed / 1e6:8.1f} MB/s"
+        )
+
+
+def main():
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                bench(path, f.read())
+        return
+
+    bench("log lines (8 MB)", make_log_transcript(8 * 1024 * 1024))
+    bench("spinner redraws (8 MB)", make_spinner_transcript(8 * 1024 * 1024))
+
+
+if __name__ == "__main__":
+    main()
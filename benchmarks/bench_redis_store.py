@@ -0,0 +1,144 @@
+"""Latency benchmark for RedisTaskStore reads and updates by task size
+
+Usage:
+    python benchmarks/bench_redis_store.py [redis_url]
+
+Compares the store against the single JSON document per task it used to
+keep, for tasks whose artifacts range from 1 KiB to 4 MiB, with every
+available codec. Uses database 15 of a local Redis by default and deletes
+the keys it writes. Without a reachable Redis, only encode/decode times of
+the codecs are reported.
+"""
+
+import asyncio
+import functools
+import json
+import sys
+import time
+import uuid
+
+import redis.asyncio as redis
+
+from a2a_gateway.codec import CODECS, Codec
+from a2a_gateway.config import settings
+from a2a_gateway.redis_store import RedisTaskStore
+
+ARTIFACT_SIZES = [1024, 64 * 1024, 1024 * 1024, 4 * 1024 * 1024]
+ROUNDS = 50
+
+
+def make_result(size: int):
+    line = "test_module.py::test_case PASSED [ 42%]\n"
+    output = (line * (size // len(line) + 1))[:size]
+    return {"artifacts": [{"type": "text", "data": {"output": output}}]}
+
+
+@functools.lru_cache(maxsize=None)
+def available_codecs():
+    codecs = []
+    for name in CODECS:
+        try:
+            codecs.append(Codec(name))
+        except ValueError:
+            print(f"({name} not installed, skipped)")
+    return tuple(codecs)
+
+
+async def timed(call, rounds: int = ROUNDS) -> float:
+    """Mean milliseconds per call"""
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await call()
+    return (time.perf_counter() - started) * 1000 / rounds
+
+
+def bench_codecs():
+    print("codec       artifacts   encode ms   decode ms      bytes")
+    for size in ARTIFACT_SIZES:
+        result = make_result(size)
+        for codec in available_codecs():
+            started = time.perf_counter()
+            for _ in range(ROUNDS):
+                data = codec.dumps(result)
+            encode = (time.perf_counter() - started) * 1000 / ROUNDS
+            started = time.perf_counter()
+            for _ in range(ROUNDS):
+                codec.loads(data)
+            decode = (time.perf_counter() - started) * 1000 / ROUNDS
+            print(
+                f"{codec.name:<10} {size // 1024:>7} KiB {encode:>11.3f} "
+                f"{decode:>11.3f} {len(data):>10}"
+            )
+
+
+async def bench_legacy(client: redis.Redis, size: int):
+    """The former layout: one JSON document per task"""
+    key = f"bench:{uuid.uuid4()}"
+    task = {
+        "id": key,
+        "message": {"bug_description": "x"},
+        "skill": "fix_bug",
+        "status": {"state": "working", "timestamp": "", "error": None},
+        **make_result(size),
+    }
+    await client.set(key, json.dumps(task))
+
+    async def get():
+        return json.loads(await client.get(key))
+
+    async def update():
+        task = await get()
+        task["status"]["state"] = "working"
+        await client.set(key, json.dumps(task))
+
+    timings = (await timed(get), await timed(get), await timed(update))
+    await client.delete(key)
+    return timings
+
+
+async def bench_store(store: RedisTaskStore, size: int):
+    task_id = f"bench-{uuid.uuid4()}"
+    await store.create_task(task_id, {"bug_description": "x"}, "fix_bug", shared=False)
+    await store.update_task_result(task_id, make_result(size))
+    await store.update_task_status(task_id, "working")
+
+    timings = (
+        await timed(lambda: store.get_task_state(task_id)),
+        await timed(lambda: store.get_task(task_id)),
+        await timed(lambda: store.update_task_status(task_id, "working")),
+    )
+    await store.client.delete(f"task:{task_id}", f"artifacts:{task_id}")
+    await store.client.zrem("tasks:working", task_id)
+    return timings
+
+
+async def bench_redis(url: str):
+    client = redis.Redis.from_url(url)
+    try:
+        await client.ping()
+    except Exception as e:
+        print(f"Redis at {url} not reachable ({e}), skipping store benchmark")
+        return
+
+    print("\nlayout      artifacts  state ms  get ms  update ms")
+    for size in ARTIFACT_SIZES:
+        state, get, update = await bench_legacy(client, size)
+        print(f"{'json blob':<10} {size // 1024:>7} KiB {state:>8.3f} {get:>7.3f} {update:>10.3f}")
+        for codec in available_codecs():
+            settings.redis_codec = codec.name
+            store = RedisTaskStore(url)
+            await store.initialize()
+            state, get, update = await bench_store(store, size)
+            await store.close()
+            print(f"{codec.name:<10} {size // 1024:>7} KiB {state:>8.3f} {get:>7.3f} {update:>10.3f}")
+    await client.close()
+
+
+def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else "redis://localhost:6379/15"
+    bench_codecs()
+    asyncio.run(bench_redis(url))
+
+
+if __name__ == "__main__":
+    main()
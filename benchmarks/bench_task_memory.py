@@ -0,0 +1,91 @@
+"""Memory benchmark for retained tasks in InMemoryTaskStore
+
+Usage:
+    python benchmarks/bench_task_memory.py [tasks]
+
+Fills a store with finished tasks (1,000,000 by default) and reports the
+bytes each one takes, next to the nested-dict layout tasks were stored in
+before TaskRecord. Messages are the same small dict in both layouts.
+"""
+
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, UTC
+
+from a2a_gateway.config import settings
+from a2a_gateway.memory_store import InMemoryTaskStore
+
+
+def make_message(index: int):
+    return {"bug_description": f"bug {index}", "workdir": "/srv/repo"}
+
+
+def fill_dicts(task_ids):
+    """Tasks as nested dicts with ISO timestamp strings"""
+    tasks = {}
+    for index, task_id in enumerate(task_ids):
+        tasks[task_id] = {
+            "id": task_id,
+            "message": make_message(index),
+            "skill": "fix_bug",
+            "priority": 0,
+            "tenant": "anonymous",
+            "status": {
+                "state": "submitted",
+                "timestamp": datetime.now(UTC).isoformat(),
+                "error": None,
+            },
+            "artifacts": [],
+            "created_at": datetime.now(UTC).isoformat(),
+        }
+        tasks[task_id]["status"]["state"] = "completed"
+        tasks[task_id]["status"]["timestamp"] = datetime.now(UTC).isoformat()
+    return tasks
+
+
+def fill_store(task_ids):
+    """Tasks as TaskRecords in the store, with its indexes"""
+    store = InMemoryTaskStore()
+
+    async def fill():
+        for index, task_id in enumerate(task_ids):
+            await store.create_task(task_id, make_message(index), "fix_bug")
+            await store.update_task_status(task_id, "completed")
+
+    asyncio.run(fill())
+    return store
+
+
+def measure(name, fill, task_ids):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    tasks = fill(task_ids)
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(task_ids)
+    print(
+        f"{name:<12} {size / count:8.0f} B/task  "
+        f"{size / 2**20:9.1f} MiB total  {count / elapsed:9.0f} tasks/s"
+    )
+    del tasks
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    # Keep every task: only the per-task cost is measured
+    settings.task_retention_seconds = {}
+    settings.task_retention_days = 365
+    task_ids = [str(uuid.uuid4()) for _ in range(count)]
+    print(f"{count} finished tasks")
+    measure("dict", fill_dicts, task_ids)
+    measure("TaskRecord", fill_store, task_ids)
+
+
+if __name__ == "__main__":
+    main()
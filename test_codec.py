@@ -0,0 +1,38 @@
+"""Tests for the Redis value codec"""
+
+import pytest
+
+from a2a_gateway.codec import ZSTD_TAG, Codec
+
+VALUE = {"artifacts": [{"type": "text", "data": {"output": "ok\n"}}]}
+LEGACY = b'{"artifacts":[{"type":"text","data":{"output":"ok\\n"}}]}'
+
+
+@pytest.mark.parametrize(
+    "name, module", [("json", None), ("orjson", "orjson"), ("msgpack", "msgpack")]
+)
+def test_values_round_trip_across_codecs(name, module):
+    """Any codec reads values written as plain JSON or by another codec"""
+    if module is not None:
+        pytest.importorskip(module)
+    codec = Codec(name)
+    assert codec.loads(codec.dumps(VALUE)) == VALUE
+    assert codec.loads(LEGACY) == VALUE
+    assert Codec().loads(codec.dumps(VALUE)) == VALUE
+
+
+def test_large_values_are_compressed():
+    """Values over the threshold are zstd-compressed and tagged as such"""
+    pytest.importorskip("zstandard")
+    codec = Codec("json", compress_threshold=64)
+    value = {"output": "x" * 10000}
+    data = codec.dumps(value)
+    assert data[:1] == ZSTD_TAG and len(data) < 1000
+    assert Codec().loads(data) == value
+    assert codec.dumps(VALUE)[:1] != ZSTD_TAG
+
+
+def test_unknown_codec_is_rejected():
+    """A misconfigured codec fails at startup rather than on first use"""
+    with pytest.raises(ValueError):
+        Codec("pickle")
@@ -0,0 +1,69 @@
+"""Tests for eager task dispatch"""
+
+import asyncio
+
+import pytest
+
+from a2a_gateway import dispatcher
+from a2a_gateway.config import settings
+from a2a_gateway.dispatcher import TaskDispatcher
+from a2a_gateway.tasks import task_store
+
+
+@pytest.mark.asyncio
+async def test_submitted_task_is_launched_once(monkeypatch):
+    """A new task is claimed and launched without any tasks/get"""
+    launched = []
+    monkeypatch.setattr(
+        dispatcher, "launch_task_execution", lambda *args: launched.append(args)
+    )
+    task_dispatcher = TaskDispatcher()
+    await task_dispatcher.start()
+    try:
+        message = {"bug_description": "eager"}
+        task_id = await task_store.create_task(message, "fix_bug", priority=2)
+        while not launched:
+            await asyncio.sleep(0.01)
+
+        assert launched == [(task_id, message, "fix_bug", 2, "anonymous")]
+        task = await task_store.get_task(task_id)
+        assert task["status"]["state"] == "working"
+        # A second claim of the same task is refused
+        assert await task_dispatcher.dispatch(task_id) is False
+    finally:
+        await task_dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_canceled_task_is_not_dispatched(monkeypatch):
+    """Tasks canceled before they are claimed never start"""
+    launched = []
+    monkeypatch.setattr(
+        dispatcher, "launch_task_execution", lambda *args: launched.append(args)
+    )
+    task_id = await task_store.create_task({"bug_description": "x"}, "fix_bug")
+    await task_store.update_task_status(task_id, "canceled")
+
+    assert await TaskDispatcher().dispatch(task_id) is False
+    assert not launched
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_requeued_then_failed(monkeypatch):
+    """A task whose executor stopped renewing its lease runs again, then fails"""
+    monkeypatch.setattr(settings, "lease_seconds", 0)
+    monkeypatch.setattr(settings, "lease_max_retries", 1)
+    task_dispatcher = TaskDispatcher()
+    task_id = await task_store.create_task({"bug_description": "x"}, "fix_bug")
+
+    await task_store.claim_task(task_id)
+    assert await task_dispatcher.recover() == 1
+    task = await task_store.get_task(task_id)
+    assert task["status"]["state"] == "submitted"
+    assert task["recoveries"] == 1
+
+    await task_store.claim_task(task_id)
+    assert await task_dispatcher.recover() == 1
+    task = await task_store.get_task(task_id)
+    assert task["status"]["state"] == "failed"
+    assert "lease expired" in task["status"]["error"]
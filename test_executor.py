@@ -0,0 +1,138 @@
+"""Tests for out-of-process executor workers"""
+
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from prometheus_client import REGISTRY
+
+from a2a_gateway import tools
+from a2a_gateway.config import settings
+from a2a_gateway.events import task_events
+from a2a_gateway.executor import FRAME_HEADER, worker_pool
+from a2a_gateway.tasks import task_store
+from a2a_gateway.worker import WorkerReporter
+
+
+@pytest_asyncio.fixture
+async def workers(monkeypatch):
+    """A running pool of one executor worker"""
+    monkeypatch.setattr(settings, "executor_mode", "workers")
+    monkeypatch.setattr(settings, "executor_workers", 1)
+    # Workers read their settings from the environment
+    monkeypatch.setenv(
+        "A2A_DROID_COMMAND", "sh -c 'echo \"$@\"; [ \"$2\" != hang ] || sleep 30' --"
+    )
+    monkeypatch.setenv("A2A_KILL_GRACE_SECONDS", "0")
+    await worker_pool.start()
+    yield worker_pool
+    await worker_pool.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_task_and_streams_output(workers):
+    """The result and output events come back from the worker process"""
+    message = {"bug_description": "remote"}
+    task_id = await task_store.create_task(message, "fix_bug")
+    await task_store.claim_task(task_id)
+    await tools.execute_task_with_tool(task_id, message, "fix_bug")
+
+    task = await task_store.get_task(task_id)
+    assert task["status"]["state"] == "completed"
+    assert "fix remote" in task["artifacts"][0]["data"]["output"]
+    events, final = await task_events.read(task_id, 0, 1.0)
+    assert final
+    streamed = "".join(
+        event["artifact"]["data"]["output"] for _, event in events if "artifact" in event
+    )
+    assert "fix remote" in streamed
+
+
+@pytest.mark.asyncio
+async def test_cancel_reaches_worker(workers):
+    """Canceling a task stops its tool inside the worker"""
+    message = {"bug_description": "hang"}
+    task_id = await task_store.create_task(message, "fix_bug")
+    await task_store.claim_task(task_id)
+    tools.launch_task_execution(task_id, message, "fix_bug")
+    while not any(worker.jobs for worker in workers.workers.values()):
+        await asyncio.sleep(0.05)
+
+    assert await tools.cancel_task_execution(task_id) is True
+    task = await task_store.get_task(task_id)
+    assert task["status"]["state"] == "canceled"
+    (worker,) = workers.workers.values()
+    assert not worker.jobs
+
+
+def reclaims_recorded(reason: str) -> float:
+    samples = {"reason": reason}
+    count = REGISTRY.get_sample_value("a2a_gateway_task_reclaim_seconds_count", samples)
+    return count or 0.0
+
+
+@pytest.mark.asyncio
+async def test_worker_timeout_reclaim_is_recorded(monkeypatch):
+    """A tool timing out in a worker is recorded by the API process"""
+    monkeypatch.setattr(settings, "executor_mode", "workers")
+    monkeypatch.setattr(settings, "executor_workers", 1)
+    # Answers the version probe at startup, hangs on tasks
+    monkeypatch.setenv(
+        "A2A_DROID_COMMAND", "sh -c '[ \"$1\" = --version ] || sleep 30' --"
+    )
+    monkeypatch.setenv("A2A_TASK_TIMEOUT", "1")
+    monkeypatch.setenv("A2A_KILL_GRACE_SECONDS", "0")
+    await worker_pool.start()
+    try:
+        message = {"bug_description": "slow"}
+        task_id = await task_store.create_task(message, "fix_bug")
+        await task_store.claim_task(task_id)
+        recorded = reclaims_recorded("timeout")
+        await tools.execute_task_with_tool(task_id, message, "fix_bug")
+    finally:
+        await worker_pool.close()
+
+    task = await task_store.get_task(task_id)
+    assert task["status"]["state"] == "failed"
+    assert "timed out" in task["status"]["error"]
+    assert reclaims_recorded("timeout") == recorded + 1
+    assert task_id not in tools._reclaims
+
+
+class SlowWriter:
+    """Stream writer whose peer reads only when allowed to"""
+
+    def __init__(self):
+        self.frames = []
+        self.readable = asyncio.Event()
+
+    def write(self, data: bytes):
+        self.frames.append(json.loads(data[FRAME_HEADER.size :]))
+
+    async def drain(self):
+        await self.readable.wait()
+
+
+@pytest.mark.asyncio
+async def test_worker_output_is_bounded_while_api_is_slow(monkeypatch):
+    """Queued output is merged and trimmed; the result follows it intact"""
+    monkeypatch.setattr(settings, "executor_output_queue_chars", 10)
+    writer = SlowWriter()
+    reporter = WorkerReporter(writer)
+    reporter.start()
+    reporter.output("t", "first")
+    await asyncio.sleep(0)
+    # The first frame is written and now waits for the API to read it
+    for chunk in ("0123456789", "abcdef", "ghij"):
+        reporter.output("t", chunk)
+    reporter.send({"type": "result", "task_id": "t", "result": {}})
+    assert len(reporter.queue) == 2 and reporter.queued_chars == 10
+
+    writer.readable.set()
+    await asyncio.sleep(0)
+    await reporter.close()
+    first, output, result = writer.frames
+    assert first["text"] == "first"
+    assert output["text"] == "\n[... 10 characters of output dropped ...]\nabcdefghij"
+    assert result["type"] == "result"
@@ -0,0 +1,106 @@
+"""Tests for deduplication of repeated task submissions"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from a2a_gateway.config import settings
+from a2a_gateway import idempotency
+from a2a_gateway.idempotency import SubmissionDeduplicator
+from a2a_gateway.main import app
+from a2a_gateway.routes import limiter
+from a2a_gateway.tasks import task_store
+
+
+def test_idempotency_key_returns_same_task(monkeypatch):
+    """A retried tasks/send with the same key gets the original task id"""
+    # Keep the task queued so nothing runs
+    monkeypatch.setattr(task_store, "submit_hooks", [])
+    client = TestClient(app)
+    request = {
+        "jsonrpc": "2.0",
+        "id": "retry-1",
+        "method": "tasks/send",
+        "params": {"message": {"bug_description": "flaky"}, "skill": "fix_bug"},
+    }
+
+    first = client.post("/", json=request, headers={"Idempotency-Key": "abc"})
+    second = client.post("/", json=request, headers={"Idempotency-Key": "abc"})
+    other = client.post("/", json=request, headers={"Idempotency-Key": "xyz"})
+    # Give the requests back to the per-client rate limit
+    limiter.reset()
+
+    task_id = first.json()["result"]["id"]
+    assert second.json()["result"]["id"] == task_id
+    assert other.json()["result"]["id"] != task_id
+
+
+@pytest.mark.asyncio
+async def test_identical_in_flight_submissions_coalesce(monkeypatch):
+    """With dedupe_in_flight, the same skill and message share a running task"""
+    monkeypatch.setattr(settings, "dedupe_in_flight", True)
+    monkeypatch.setattr(task_store, "submit_hooks", [])
+    deduplicator = SubmissionDeduplicator()
+    created = []
+
+    async def submit(message, tenant="anonymous"):
+        async def create(task_id):
+            created.append(task_id)
+            await task_store.create_task(message, "fix_bug", task_id=task_id)
+
+        keys = deduplicator.keys_for(tenant, "fix_bug", message)
+        return await deduplicator.submit(keys, create, task_store.get_task_state)
+
+    task_id, new = await submit({"bug_description": "x", "workdir": ""})
+    assert new
+    # Normalization ignores whitespace and empty fields
+    assert await submit({"bug_description": " x "}) == (task_id, False)
+    assert (await submit({"bug_description": "x"}, tenant="other"))[1]
+
+    # A finished task is not reused for a new submission
+    await task_store.update_task_status(task_id, "completed")
+    retry_id, new = await submit({"bug_description": "x"})
+    assert new and retry_id != task_id
+    assert len(created) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_creation_releases_key(monkeypatch):
+    """A submission that could not create its task does not hold the key"""
+    deduplicator = SubmissionDeduplicator()
+    keys = deduplicator.keys_for("anonymous", "fix_bug", {}, "key-1")
+
+    async def fail(task_id):
+        raise RuntimeError("queue full")
+
+    with pytest.raises(RuntimeError):
+        await deduplicator.submit(keys, fail, task_store.get_task_state)
+    assert not deduplicator.keys
+
+
+@pytest.mark.asyncio
+async def test_key_of_evicted_task_is_reclaimed(monkeypatch):
+    """A missing task counts as being created only for the creation window"""
+    deduplicator = SubmissionDeduplicator()
+    keys = deduplicator.keys_for("anonymous", "fix_bug", {}, "key-1")
+    states = {}
+
+    async def create(task_id):
+        states[task_id] = "completed"
+
+    async def get_state(task_id):
+        return states.get(task_id)
+
+    task_id, _ = await deduplicator.submit(keys, create, get_state)
+    assert await deduplicator.submit(keys, create, get_state) == (task_id, False)
+
+    # Evicted just after creation: still treated as in the making
+    del states[task_id]
+    assert await deduplicator.submit(keys, create, get_state) == (task_id, False)
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + idempotency.CREATION_WINDOW)
+    retry_id, new = await deduplicator.submit(keys, create, get_state)
+    assert new and retry_id != task_id
+    assert await deduplicator.submit(keys, create, get_state) == (retry_id, False)
@@ -0,0 +1,96 @@
+"""Tests for the in-memory task store"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from a2a_gateway.config import settings
+from a2a_gateway.main import app
+from a2a_gateway.memory_store import InMemoryTaskStore
+
+
+@pytest.mark.asyncio
+async def test_state_indexes_follow_transitions():
+    """Counts and pending ids come from per-state indexes kept in sync"""
+    store = InMemoryTaskStore()
+    for task_id in ("a", "b", "c"):
+        await store.create_task(task_id, {"bug_description": "x"}, "fix_bug")
+    assert store.active_count == 3
+    assert await store.get_pending_task_ids() == ["a", "b", "c"]
+
+    await store.claim_task("a", "node", 30)
+    await store.update_task_status("b", "completed")
+    assert store.count("working") == 1 and store.count("completed") == 1
+    assert await store.get_pending_task_ids() == ["c"]
+    assert await store.get_active_count() == 2
+
+    await store.requeue_task("a")
+    await store.update_task_status("c", "canceled")
+    assert await store.get_pending_task_ids() == ["a"]
+    assert store.active_count == 1
+    assert sum(len(ids) for ids in store.by_state.values()) == len(store.tasks)
+
+
+@pytest.mark.asyncio
+async def test_finished_tasks_expire_per_state(monkeypatch):
+    """Completed and failed tasks are kept for their own retention period"""
+    monkeypatch.setattr(
+        settings, "task_retention_seconds", {"completed": 10, "failed": 100}
+    )
+    store = InMemoryTaskStore()
+    for task_id, state in (("done", "completed"), ("bad", "failed"), ("run", None)):
+        await store.create_task(task_id, {}, "fix_bug")
+        if state:
+            await store.update_task_status(task_id, state)
+
+    now = time.time()
+    assert store.sweep(now + 50) == 1
+    assert await store.get_task("done") is None
+    assert await store.get_task("bad") is not None
+    assert store.sweep(now + 500) == 1
+    assert list(store.tasks) == ["run"]
+    assert store.count("failed") == 0
+
+
+@pytest.mark.asyncio
+async def test_caps_evict_least_recently_used(monkeypatch):
+    """Over a cap, the finished task read least recently goes first"""
+    monkeypatch.setattr(settings, "max_retained_tasks", 2)
+    monkeypatch.setattr(settings, "max_retained_artifact_bytes", 1000)
+    store = InMemoryTaskStore()
+    for task_id in ("a", "b", "c"):
+        await store.create_task(task_id, {}, "fix_bug")
+    await store.update_task_status("a", "completed")
+    await store.update_task_status("b", "completed")
+    await store.get_task("a")
+    await store.update_task_status("c", "failed")
+    assert set(store.tasks) == {"a", "c"}
+
+    # Large results push the artifact total over its cap
+    await store.update_task_result("a", {"artifacts": [{"data": "x" * 600}]})
+    await store.update_task_result("c", {"artifacts": [{"data": "x" * 600}]})
+    assert set(store.tasks) == {"c"}
+    assert store.finished_artifact_bytes == store.artifact_bytes["c"]
+
+
+@pytest.mark.asyncio
+async def test_artifact_size_comes_from_the_result():
+    """Tool results carry their output size, so artifacts are not serialized"""
+    store = InMemoryTaskStore()
+    await store.create_task("t", {}, "fix_bug")
+    output = {"type": "text", "data": {"output": "x" * 100}}
+    await store.update_task_result("t", {"artifacts": [output], "artifact_bytes": 100})
+    assert store.artifact_bytes["t"] == 100
+    await store.update_task_result("t", {"artifacts": [output]})
+    assert 100 < store.artifact_bytes["t"] < 200
+
+
+def test_health_reports_task_counts():
+    """/health answers from store counters without scanning tasks"""
+    response = TestClient(app).get("/health")
+    tasks = response.json()["tasks"]
+    assert set(tasks["states"]) == {
+        "submitted", "working", "completed", "failed", "canceled"
+    }
+    assert tasks["age_seconds"] == 0
@@ -0,0 +1,50 @@
+"""Tests for the near-cache of Redis task snapshots"""
+
+from a2a_gateway.config import settings
+from a2a_gateway.near_cache import NearCache
+
+
+def load(cache, task_id, value, artifacts=True, terminal=False):
+    cache.start_load(task_id)
+    cache.finish_load(task_id, artifacts, value, terminal)
+
+
+def test_snapshots_are_served_until_invalidated():
+    """A full snapshot also serves reads without artifacts"""
+    cache = NearCache()
+    assert cache.get("a") is None
+    load(cache, "a", {"id": "a"})
+    assert cache.get("a") == {"id": "a"}
+    assert cache.get("a", artifacts=False) == {"id": "a"}
+
+    cache.invalidate("a")
+    assert cache.get("a", artifacts=False) is None
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+def test_snapshot_invalidated_while_loading_is_not_cached():
+    """A read racing an update cannot bring back the old state"""
+    cache = NearCache()
+    cache.start_load("a")
+    cache.invalidate("a")
+    cache.finish_load("a", True, {"state": "old"}, False)
+    assert cache.get("a") is None
+
+    load(cache, "a", {"state": "new"})
+    assert cache.get("a") == {"state": "new"}
+
+
+def test_ttl_and_size_bounds(monkeypatch):
+    """Unfinished tasks expire sooner than finished ones; the oldest entry is evicted"""
+    monkeypatch.setattr(settings, "near_cache_ttl", 0)
+    monkeypatch.setattr(settings, "near_cache_max_entries", 2)
+    cache = NearCache()
+    load(cache, "working", {"id": "working"})
+    assert cache.get("working") is None
+
+    load(cache, "a", {"id": "a"}, terminal=True)
+    load(cache, "b", {"id": "b"}, terminal=True)
+    load(cache, "c", {"id": "c"}, terminal=True)
+    assert cache.get("a") is None
+    assert cache.get("c") == {"id": "c"}
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,40 @@
+"""Tests for terminal output normalization"""
+
+from a2a_gateway.normalize import TerminalNormalizer
+
+
+def _normalize(chunks):
+    normalizer = TerminalNormalizer()
+    return b"".join(normalizer.feed(chunk) for chunk in chunks) + normalizer.flush()
+
+
+def test_strips_escape_sequences_and_controls():
+    """Colors, titles and stray control bytes are removed"""
+    raw = b"\x1b]0;title\x07\x1b[1;32mok\x1b[0m done\x07\r\n"
+    assert _normalize([raw]) == b"ok done\n"
+
+
+def test_collapses_carriage_return_redraws():
+    """Progress redraws collapse to the final frame of the line"""
+    raw = b"start\r\n" + b"".join(b"\r\x1b[2K%d%%" % i for i in range(101)) + b"\n"
+    assert _normalize([raw]) == b"start\n100%\n"
+
+
+def test_handles_sequences_split_across_chunks():
+    """Escape sequences and lines may be split at any byte"""
+    raw = b"\x1b[31merror\x1b[0m: \x1b]8;;http://x\x1b\\link\x1b]8;;\x1b\\\r\nab\x08c\n"
+    expected = _normalize([raw])
+    assert expected == b"error: link\nac\n"
+    for size in (1, 2, 3, 5):
+        chunks = [raw[i : i + size] for i in range(0, len(raw), size)]
+        assert _normalize(chunks) == expected
+
+
+def test_split_output_matches_whole_output():
+    """Splitting at any byte never changes the result, even around \\r\\r\\n"""
+    raw = b"build ok\r\r\n50%\r100%\r\r\nx\ry\x08z\r\r\n"
+    expected = _normalize([raw])
+    assert expected == b"build ok\n100%\nz\n"
+    for i in range(len(raw) + 1):
+        for j in range(i, len(raw) + 1):
+            assert _normalize([raw[:i], raw[i:j], raw[j:]]) == expected
@@ -0,0 +1,48 @@
+"""Tests for bounded tool output buffering"""
+
+import os
+import time
+
+from a2a_gateway.output import OutputBuffer, remove_log, sweep_logs
+
+
+def test_small_output_is_kept_whole(tmp_path):
+    """Output below the ring size is returned unchanged"""
+    buffer = OutputBuffer("small", ring_bytes=64, head_bytes=8, log_dir=str(tmp_path))
+    buffer.write(b"hello ")
+    buffer.write(b"world")
+    buffer.close()
+    assert not buffer.spilled
+    assert buffer.to_artifact() == {"type": "text", "data": {"output": "hello world"}}
+
+
+def test_large_output_spills_to_log(tmp_path):
+    """Overflowing output is summarised and fully preserved on disk"""
+    buffer = OutputBuffer("large", ring_bytes=16, head_bytes=4, log_dir=str(tmp_path))
+    data = bytes(range(48, 58)) * 100
+    for i in range(0, len(data), 7):
+        buffer.write(data[i : i + 7])
+    buffer.close()
+
+    assert buffer.spilled
+    artifact = buffer.to_artifact()["data"]
+    assert artifact["truncated"] is True
+    assert artifact["total_bytes"] == len(data)
+    assert artifact["log_file"] == "large.log"
+    assert buffer.retained_bytes == 4 + 16
+    assert artifact["output"].startswith("0123")
+    assert artifact["output"].endswith(data[-16:].decode())
+    assert buffer.mmap()[:] == data
+
+
+def test_logs_are_removed_with_their_task_or_once_old(tmp_path):
+    """Spilled logs do not outlive their task's retention"""
+    for task_id in ("evicted", "old", "recent"):
+        (tmp_path / f"{task_id}.log").write_bytes(b"output")
+    stale = time.time() - 100
+    os.utime(tmp_path / "old.log", (stale, stale))
+
+    assert remove_log("evicted", str(tmp_path))
+    assert not remove_log("evicted", str(tmp_path))
+    assert sweep_logs(50, str(tmp_path)) == 1
+    assert sorted(os.listdir(tmp_path)) == ["recent.log"]
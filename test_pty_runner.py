@@ -0,0 +1,78 @@
+"""Tests for the event-loop PTY runner"""
+
+import asyncio
+
+import pytest
+
+from a2a_gateway import tools
+from a2a_gateway.config import settings
+
+
+@pytest.mark.asyncio
+async def test_run_pty_command_collects_output():
+    """Output written to the PTY ends up in the text artifact"""
+    result = await tools.run_pty_command("test", ["sh", "-c", "echo hello"], ".")
+    assert "error" not in result
+    assert "hello" in result["artifacts"][0]["data"]["output"]
+
+
+@pytest.mark.asyncio
+async def test_run_pty_command_reports_exit_code():
+    """A non-zero exit code is reported as an error"""
+    result = await tools.run_pty_command("test", ["sh", "-c", "exit 3"], ".")
+    assert result["error"] == "Command failed with return code 3"
+
+
+@pytest.mark.asyncio
+async def test_run_pty_command_timeout_kills_process(monkeypatch):
+    """A timeout terminates the child instead of leaving it running"""
+    monkeypatch.setattr(settings, "task_timeout", 0.5)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = await tools.run_pty_command("test", ["sleep", "30"], ".")
+    assert "timed out" in result["error"]
+    assert loop.time() - started < 5
+    # Handed to the caller, which records it once the slot is free
+    assert result["reclaim"]["reason"] == "timeout"
+    assert 0 <= result["reclaim"]["seconds"] < 5
+
+
+@pytest.mark.asyncio
+async def test_cancel_kills_tool_and_releases_slot(monkeypatch):
+    """Canceling a running task stops its tool and frees the slot at once"""
+    from a2a_gateway.scheduler import task_scheduler
+    from a2a_gateway.tasks import task_store
+
+    monkeypatch.setattr(settings, "droid_command", "sh -c 'sleep 30' --")
+    monkeypatch.setattr(settings, "kill_grace_seconds", 0)
+    message = {"bug_description": "hang"}
+    task_id = await task_store.create_task(message, "fix_bug")
+    await task_store.claim_task(task_id)
+    running = task_scheduler.running
+
+    tools.launch_task_execution(task_id, message, "fix_bug")
+    while task_scheduler.running == running:
+        await asyncio.sleep(0.01)
+
+    assert await tools.cancel_task_execution(task_id) is True
+    assert task_scheduler.running == running
+    task = await task_store.get_task(task_id)
+    assert task["status"]["state"] == "canceled"
+    assert task_id not in tools.running_executions
+
+
+@pytest.mark.asyncio
+async def test_limits_are_applied_and_usage_recorded(monkeypatch):
+    """Per-skill rlimits reach the tool and its usage is stored"""
+    from a2a_gateway.tasks import task_store
+
+    monkeypatch.setattr(settings, "droid_command", "sh -c 'ulimit -n' --")
+    monkeypatch.setattr(settings, "tool_limits", {"fix_bug": {"open_files": 64}})
+    message = {"bug_description": "limits"}
+    task_id = await task_store.create_task(message, "fix_bug")
+    await task_store.claim_task(task_id)
+
+    await tools.execute_task_with_tool(task_id, message, "fix_bug")
+    task = await task_store.get_task(task_id)
+    assert task["artifacts"][0]["data"]["output"].strip() == "64"
+    assert set(task["usage"]) == {"cpu_seconds", "peak_rss_bytes", "bytes_written"}
@@ -0,0 +1,323 @@
+"""Tests for the Redis task store, against an in-process fake Redis"""
+
+import asyncio
+import json
+import time
+
+import pytest
+import pytest_asyncio
+import redis.asyncio as redis
+
+from a2a_gateway.config import settings
+from a2a_gateway.models import TaskState
+from a2a_gateway.redis_store import (
+    LEASE_OWNERS_KEY,
+    LEASES_KEY,
+    RETENTION_LOCK_KEY,
+    STATE_INDEXES,
+    RedisTaskStore,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest_asyncio.fixture
+async def make_store(monkeypatch):
+    """Factory of stores sharing one fake Redis server, like gateway nodes"""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis.ConnectionPool,
+        "from_url",
+        lambda url: fakeredis.FakeAsyncRedis(server=server).connection_pool,
+    )
+    stores = []
+
+    async def make():
+        store = RedisTaskStore("redis://fake")
+        await store.initialize()
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        await store.close()
+
+
+@pytest_asyncio.fixture
+async def store(make_store):
+    return await make_store()
+
+
+@pytest.mark.asyncio
+async def test_late_usage_keeps_final_state(store):
+    """Usage recorded after the task finished only adds the usage field"""
+    await store.create_task("t", {"bug_description": "x"}, "fix_bug")
+    await store.claim_task("t")
+    await store.finish_task("t", "completed", {"artifacts": [{"type": "text"}]})
+    await store.update_task_usage("t", {"cpu_seconds": 1.5})
+
+    task = await store.get_task("t")
+    assert task["status"]["state"] == "completed"
+    assert task["artifacts"] == [{"type": "text"}]
+    assert task["usage"] == {"cpu_seconds": 1.5}
+
+
+async def watch(store):
+    """Start following cluster pub/sub; returns the ids seen per channel"""
+    seen = {"submitted": [], "cancel": []}
+    watcher = asyncio.create_task(
+        store.watch_cluster(seen["submitted"].append, seen["cancel"].append)
+    )
+    await asyncio.sleep(0.05)
+    return seen, watcher
+
+
+@pytest.mark.asyncio
+async def test_cluster_pull_lease_and_cancel_fan_out(make_store, monkeypatch):
+    """A task submitted on one node is announced, leased and canceled on another"""
+    monkeypatch.setattr(settings, "cluster_mode", True)
+    submitter, runner = await make_store(), await make_store()
+    seen, watcher = await watch(runner)
+
+    await submitter.create_task("t", {"bug_description": "x"}, "fix_bug")
+    await asyncio.sleep(0.05)
+    assert seen["submitted"] == ["t"]
+
+    task = await runner.claim_next_task("runner", lease_seconds=30)
+    assert task["id"] == "t" and task["status"]["state"] == "working"
+    assert await runner.claim_next_task("other", lease_seconds=30) is None
+    assert await runner.client.hget(LEASE_OWNERS_KEY, "t") == b"runner"
+
+    await submitter.publish_cancel("t")
+    await asyncio.sleep(0.05)
+    assert seen["cancel"] == ["t"]
+    watcher.cancel()
+    await asyncio.gather(watcher, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_pulled_task_is_recoverable_if_the_node_dies(store):
+    """Popping a task also claims and leases it, so a crash cannot lose it"""
+    await store.create_task("gone", {"bug_description": "x"}, "fix_bug", priority=1)
+    await store.update_task_status("gone", "canceled")
+    # A stale queue entry is dropped rather than claimed
+    await store.client.zadd("tasks:pending", {"gone": 0})
+    await store.create_task("t", {"bug_description": "x"}, "fix_bug")
+
+    # Pulled by a node that dies at once: its lease is already expired
+    task = await store.claim_next_task("dead", lease_seconds=0)
+    assert task["id"] == "t" and task["status"]["state"] == "working"
+    assert await index_of(store, "t") == ["working"]
+    assert await store.get_pending_task_ids() == []
+    assert await store.get_task_state("gone") == "canceled"
+
+    await asyncio.sleep(0.01)
+    assert await store.get_expired_leases() == ["t"]
+    assert await store.take_expired_lease("t")
+    assert await store.requeue_task("t")
+    task = await store.claim_next_task("live", lease_seconds=30)
+    assert task["id"] == "t" and task["recoveries"] == 1
+    assert await store.client.hget(LEASE_OWNERS_KEY, "t") == b"live"
+
+
+@pytest.mark.asyncio
+async def test_cached_counts_follow_own_submissions(store):
+    """Admission sees this node's submissions before the next count refresh"""
+    await store.create_task("a", {"bug_description": "x"}, "fix_bug")
+    await store.create_task("b", {"bug_description": "x"}, "fix_bug")
+    await store.create_task("local", {"bug_description": "x"}, "fix_bug", shared=False)
+    assert store.state_counts()[0]["submitted"] == 2
+
+    await store.claim_next_task("node", lease_seconds=30)
+    assert store.state_counts()[0]["submitted"] == 1
+    assert (await store.refresh_counts())["submitted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_submissions_are_not_announced_outside_cluster_mode(make_store):
+    """Without cluster mode no node listens, so nothing is published"""
+    store = await make_store()
+    seen, watcher = await watch(store)
+    await store.create_task("t", {"bug_description": "x"}, "fix_bug")
+    await asyncio.sleep(0.05)
+    assert seen["submitted"] == []
+    assert await store.get_pending_task_ids() == ["t"]
+
+    # Nor when recovery requeues a task
+    await store.claim_task("t")
+    assert await store.requeue_task("t")
+    await asyncio.sleep(0.05)
+    assert seen["submitted"] == []
+    watcher.cancel()
+    await asyncio.gather(watcher, return_exceptions=True)
+
+
+async def index_of(store, task_id):
+    """Names of the state index sets holding a task"""
+    return [
+        state.value
+        for state, index in STATE_INDEXES.items()
+        if await store.client.zscore(index, task_id) is not None
+    ]
+
+
+@pytest.mark.asyncio
+async def test_transitions_move_indexes_and_leases_together(store):
+    """Claim, requeue and finish each update hash, index and lease at once"""
+    await store.create_task("t", {"bug_description": "x"}, "fix_bug")
+    assert await index_of(store, "t") == ["submitted"]
+
+    task = await store.claim_task("t", "a", lease_seconds=30)
+    assert task["status"]["state"] == "working"
+    assert await index_of(store, "t") == ["working"]
+    assert await store.client.hget(LEASE_OWNERS_KEY, "t") == b"a"
+
+    assert await store.requeue_task("t")
+    task = await store.get_task("t")
+    assert task["status"]["state"] == "submitted" and task["recoveries"] == 1
+    assert await index_of(store, "t") == ["submitted"]
+    assert await store.client.zscore(LEASES_KEY, "t") is None
+
+    await store.claim_task("t", "b", lease_seconds=30)
+    assert await store.finish_task("t", "completed", {"artifacts": [{"n": 1}]}, "b")
+    task = await store.get_task("t")
+    assert task["status"]["state"] == "completed"
+    assert task["artifacts"] == [{"n": 1}]
+    assert await index_of(store, "t") == ["completed"]
+    assert await store.client.hget(LEASE_OWNERS_KEY, "t") is None
+
+
+@pytest.mark.asyncio
+async def test_stale_writers_are_refused(store):
+    """A node that lost its lease cannot overwrite the task's newer state"""
+    await store.create_task("t", {"bug_description": "x"}, "fix_bug")
+    await store.claim_task("t", "a", lease_seconds=30)
+    assert await store.claim_task("t", "b", lease_seconds=30) is None
+
+    # a's lease expired: recovery requeued the task and b claimed it
+    await store.requeue_task("t")
+    await store.claim_task("t", "b", lease_seconds=30)
+    assert not await store.finish_task("t", "completed", {"artifacts": []}, "a")
+    assert await store.get_task_state("t") == "working"
+    assert await store.client.hget(LEASE_OWNERS_KEY, "t") == b"b"
+
+    # Finished tasks never change again
+    assert await store.update_task_status("t", "canceled")
+    assert not await store.finish_task("t", "completed", {"artifacts": []}, "b")
+    assert not await store.update_task_status("t", "working")
+    assert await store.get_task_state("t") == "canceled"
+    assert await index_of(store, "t") == ["canceled"]
+
+
+@pytest.mark.asyncio
+async def test_json_tasks_are_migrated_to_hashes(make_store):
+    """Tasks written as JSON documents by older gateways become hashes"""
+    legacy = {
+        "id": "old",
+        "message": {"bug_description": "x"},
+        "skill": "fix_bug",
+        "priority": 2,
+        "status": {
+            "state": "completed",
+            "timestamp": "2026-01-01T00:00:10+00:00",
+            "error": None,
+        },
+        "artifacts": [{"type": "text", "data": {"output": "done"}}],
+        "created_at": "2026-01-01T00:00:00+00:00",
+    }
+    first = await make_store()
+    await first.client.set("task:old", json.dumps(legacy))
+
+    store = await make_store()
+    assert await store.client.type("task:old") == b"hash"
+    task = await store.get_task("old")
+    assert task["status"] == legacy["status"]
+    assert task["artifacts"] == legacy["artifacts"]
+    assert task["created_at"] == legacy["created_at"]
+    assert (task["message"], task["priority"]) == (legacy["message"], 2)
+
+
+@pytest.fixture
+def short_retention(monkeypatch):
+    monkeypatch.setattr(
+        settings, "task_retention_seconds", {"completed": 100, "failed": 1000}
+    )
+    monkeypatch.setattr(settings, "retention_sweep_pause", 0)
+
+
+async def finished(store, task_id, state="completed"):
+    await store.create_task(task_id, {"bug_description": "x"}, "fix_bug")
+    await store.claim_task(task_id)
+    await store.finish_task(task_id, state, {"artifacts": [{"type": "text"}]})
+
+
+@pytest.mark.asyncio
+async def test_final_transition_sets_ttl(store, short_retention):
+    """Finished tasks expire with their artifacts, even after a late result"""
+    await store.create_task("t", {"bug_description": "x"}, "fix_bug")
+    await store.claim_task("t")
+    assert await store.client.ttl("task:t") == -1
+
+    await store.finish_task("t", "completed", {"artifacts": [{"type": "text"}]})
+    assert 0 < await store.client.ttl("task:t") <= 100
+    assert 0 < await store.client.ttl("artifacts:t") <= 100
+
+    await store.update_task_result("t", {"artifacts": [{"type": "late"}]})
+    assert 0 < await store.client.ttl("artifacts:t") <= 100
+    assert (await store.get_task("t"))["artifacts"] == [{"type": "late"}]
+
+    await finished(store, "f", "failed")
+    assert 100 < await store.client.ttl("task:f") <= 1000
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_expired_tasks_in_batches(
+    store, short_retention, monkeypatch
+):
+    """Expired tasks go in batches of retention_sweep_batch_size"""
+    monkeypatch.setattr(settings, "retention_sweep_batch_size", 2)
+    for n in range(5):
+        await finished(store, f"c{n}")
+    await finished(store, "f", "failed")
+    batches = []
+    delete_tasks = store._delete_tasks
+
+    async def record(index, task_ids):
+        batches.append(len(task_ids))
+        await delete_tasks(index, task_ids)
+
+    monkeypatch.setattr(store, "_delete_tasks", record)
+    assert await store.sweep(now=time.time() + 500) == 5
+    assert batches == [2, 2, 1]
+    assert await store.client.zcard(STATE_INDEXES[TaskState.COMPLETED]) == 0
+    assert await store.client.exists("task:c0", "artifacts:c4") == 0
+    # Failed tasks are kept longer
+    assert await index_of(store, "f") == ["failed"]
+    assert await store.get_task_state("f") == "failed"
+
+
+@pytest.mark.asyncio
+async def test_one_sweeper_holds_the_lock(make_store, short_retention, monkeypatch):
+    """Only the lock holder sweeps, and it stops once the lock is lost"""
+    monkeypatch.setattr(settings, "retention_sweep_batch_size", 2)
+    first, second = await make_store(), await make_store()
+    for n in range(5):
+        await finished(first, f"c{n}")
+
+    assert await first.acquire_sweep_lock()
+    assert not await second.acquire_sweep_lock()
+    interval_ms = settings.retention_sweep_interval * 1000
+    assert 0 < await first.client.pttl(RETENTION_LOCK_KEY) <= interval_ms
+
+    # The lock lapses during the first batch and the second node takes it
+    delete_tasks = first._delete_tasks
+
+    async def lose_lock(index, task_ids):
+        await delete_tasks(index, task_ids)
+        await first.client.delete(RETENTION_LOCK_KEY)
+        assert await second.acquire_sweep_lock()
+
+    monkeypatch.setattr(first, "_delete_tasks", lose_lock)
+    assert await first.sweep(now=time.time() + 500, locked=True) == 2
+    assert await first.client.get(RETENTION_LOCK_KEY) == second._lock_token.encode()
+    assert await second.sweep(now=time.time() + 500, locked=True) == 3
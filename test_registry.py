@@ -0,0 +1,33 @@
+"""Tests for the tool and skill registry"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from a2a_gateway.config import settings
+from a2a_gateway.main import app
+from a2a_gateway.registry import ToolAdapter
+from a2a_gateway.tools import tool_registry
+
+client = TestClient(app)
+
+
+def test_agent_card_skills_come_from_registry():
+    """Every registered skill is advertised on the Agent Card"""
+    card = client.get("/.well-known/agent.json").json()
+    assert {skill["id"] for skill in card["skills"]} == set(tool_registry.skills)
+    assert set(tool_registry.skills) == {"fix_bug", "generate_dockerfile"}
+
+
+@pytest.mark.asyncio
+async def test_tool_probe_is_cached(monkeypatch):
+    """Availability is probed once and then served from cache"""
+    monkeypatch.setattr(settings, "droid_command", "sh -c 'echo droid 1.0' --")
+    tool = ToolAdapter("droid", "droid_command")
+    assert await tool.is_available() is True
+    assert tool.version == "droid 1.0"
+
+    probed_at = tool.probed_at
+    monkeypatch.setattr(settings, "droid_command", "/nonexistent/droid")
+    assert await tool.is_available() is True
+    assert tool.probed_at == probed_at
+    assert await tool.probe() is False
@@ -0,0 +1,70 @@
+"""Tests for the content-addressed result cache"""
+
+import asyncio
+
+import pytest
+
+from a2a_gateway import tools
+from a2a_gateway.config import settings
+from a2a_gateway.result_cache import result_cache
+from a2a_gateway.tasks import task_store
+
+
+@pytest.mark.asyncio
+async def test_key_follows_message_and_workdir_content(tmp_path):
+    """Equivalent messages share a key; any file change invalidates it"""
+    (tmp_path / "app.py").write_text("print('hi')\n")
+    message = {"workdir": str(tmp_path), "project_type": "python"}
+    key = await result_cache.make_key("review_pr", message)
+    reordered = {"project_type": " python ", "workdir": str(tmp_path), "x": None}
+    assert await result_cache.make_key("review_pr", reordered) == key
+    assert await result_cache.make_key("generate_dockerfile", message) != key
+
+    (tmp_path / "app.py").write_text("print('bye')\n")
+    assert await result_cache.make_key("review_pr", message) != key
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_completes_task_without_running_tool(monkeypatch, tmp_path):
+    """A repeated request is served from cache"""
+    monkeypatch.setattr(settings, "result_cache_enabled", True)
+    calls = []
+
+    async def handler(task_id, message):
+        calls.append(task_id)
+        return {"artifacts": [{"type": "text", "data": {"output": "review"}}]}
+
+    skill = tools.tool_registry.get_skill("generate_dockerfile")
+    monkeypatch.setattr(skill, "handler", handler)
+    message = {"workdir": str(tmp_path)}
+
+    for _ in range(2):
+        task_id = await task_store.create_task(message, "generate_dockerfile")
+        await task_store.claim_task(task_id)
+        await tools.execute_task_with_tool(task_id, message, "generate_dockerfile")
+        task = await task_store.get_task(task_id)
+        assert task["status"]["state"] == "completed"
+        assert task["artifacts"][0]["data"]["output"] == "review"
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancel_during_cache_lookup_records_reclaim(monkeypatch):
+    """A task canceled before it takes a slot leaves no reclaim behind"""
+    monkeypatch.setattr(settings, "result_cache_enabled", True)
+    lookup = asyncio.Event()
+
+    async def make_key(skill, message):
+        lookup.set()
+        await asyncio.sleep(30)
+
+    monkeypatch.setattr(result_cache, "make_key", make_key)
+    message = {"workdir": "."}
+    task_id = await task_store.create_task(message, "generate_dockerfile")
+    await task_store.claim_task(task_id)
+    tools.launch_task_execution(task_id, message, "generate_dockerfile")
+    await lookup.wait()
+
+    assert await tools.cancel_task_execution(task_id)
+    assert (await task_store.get_task(task_id))["status"]["state"] == "canceled"
+    assert task_id not in tools._reclaims
@@ -0,0 +1,195 @@
+"""Tests for the task scheduler and admission control"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from a2a_gateway import concurrency
+from a2a_gateway.concurrency import AdaptiveLimiter
+from a2a_gateway.config import settings
+from a2a_gateway.main import app
+from a2a_gateway.scheduler import QueueFull, TaskScheduler, task_scheduler
+
+
+@pytest.mark.asyncio
+async def test_slots_are_granted_by_priority(monkeypatch):
+    """Waiting tasks run highest priority first, then in arrival order"""
+    monkeypatch.setattr(settings, "max_concurrent_tasks", 1)
+    scheduler = TaskScheduler()
+    order = []
+    release = asyncio.Event()
+
+    async def run(name, priority):
+        async with scheduler.slot(priority):
+            order.append(name)
+            await release.wait()
+
+    first = asyncio.create_task(run("first", 0))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.create_task(run(name, priority))
+        for name, priority in [("low", 0), ("high", 5), ("low2", 0)]
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.queued == 3
+
+    release.set()
+    await asyncio.gather(first, *waiters)
+    assert order == ["first", "high", "low", "low2"]
+    assert scheduler.running == 0 and scheduler.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_canceled_waiter_leaves_queue(monkeypatch):
+    """A task canceled while queued gives up its place"""
+    monkeypatch.setattr(settings, "max_concurrent_tasks", 1)
+    scheduler = TaskScheduler()
+    async with scheduler.slot():
+        waiter = asyncio.create_task(scheduler.slot().__aenter__())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert scheduler.queued == 0
+    assert scheduler.running == 0
+
+
+@pytest.mark.asyncio
+async def test_tenants_share_slots_by_weight(monkeypatch):
+    """A tenant flooding the queue does not starve others"""
+    monkeypatch.setattr(settings, "max_concurrent_tasks", 1)
+    monkeypatch.setattr(settings, "tenant_weights", {"big": 2.0})
+    scheduler = TaskScheduler()
+    order = []
+    release = asyncio.Event()
+
+    async def run(tenant):
+        async with scheduler.slot(tenant=tenant):
+            order.append(tenant)
+            await release.wait()
+
+    blocker = asyncio.create_task(run("blocker"))
+    await asyncio.sleep(0)
+    tasks = [asyncio.create_task(run("flood")) for _ in range(4)]
+    tasks += [asyncio.create_task(run("big")) for _ in range(4)]
+    tasks += [asyncio.create_task(run("small")) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(blocker, *tasks)
+    # "big" is served twice as often as the others while all are waiting
+    assert order[1:] == [
+        "flood", "big", "small", "big", "flood", "big", "small", "big", "flood", "flood"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_skill_cap_leaves_room_for_other_skills(monkeypatch):
+    """A capped skill waits while other skills use the free slots"""
+    monkeypatch.setattr(settings, "max_concurrent_tasks", 3)
+    monkeypatch.setattr(settings, "skill_concurrency", {"fix_bug": 1})
+    scheduler = TaskScheduler()
+    release = asyncio.Event()
+
+    async def run(skill):
+        async with scheduler.slot(skill=skill):
+            await release.wait()
+
+    tasks = [asyncio.create_task(run("fix_bug")) for _ in range(3)]
+    tasks.append(asyncio.create_task(run("generate_dockerfile")))
+    await asyncio.sleep(0)
+
+    stats = scheduler.stats()
+    assert stats["skills"]["fix_bug"] == {"running": 1, "queued": 2, "limit": 1}
+    assert stats["skills"]["generate_dockerfile"]["running"] == 1
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+def test_full_queue_rejects_with_retry_after(monkeypatch):
+    """tasks/send returns -32003 with a retry-after hint when the queue is full"""
+    monkeypatch.setattr(settings, "max_queue_depth", 0)
+    monkeypatch.setattr(task_scheduler, "running", settings.max_concurrent_tasks)
+    with pytest.raises(QueueFull):
+        task_scheduler.admit()
+
+    response = TestClient(app).post(
+        "/",
+        json={
+            "jsonrpc": "2.0",
+            "id": "overload-1",
+            "method": "tasks/send",
+            "params": {"message": {"bug_description": "x"}, "skill": "fix_bug"},
+        },
+    )
+    error = response.json()["error"]
+    assert error["code"] == -32003
+    assert error["data"]["retry_after"] >= 1
+
+
+def test_cluster_backlog_counts_toward_queue_depth(monkeypatch):
+    """Tasks waiting in the shared cluster queue fill the queue too"""
+    monkeypatch.setattr(settings, "max_concurrent_tasks", 1)
+    monkeypatch.setattr(settings, "max_queue_depth", 2)
+    scheduler = TaskScheduler()
+    backlog = 0
+    scheduler.backlog = lambda: backlog
+
+    scheduler.admit()
+    scheduler.running = 1
+    backlog = 1
+    scheduler.admit()
+    backlog = 2
+    with pytest.raises(QueueFull) as rejected:
+        scheduler.admit()
+    assert rejected.value.queue_depth == 2
+
+
+def test_adaptive_limit_follows_load(monkeypatch):
+    """The adaptive limit grows under demand and backs off under load"""
+    monkeypatch.setattr(settings, "max_concurrent_tasks", 4)
+    monkeypatch.setattr(settings, "adaptive_min_concurrency", 2)
+    monkeypatch.setattr(settings, "adaptive_max_concurrency", 6)
+    load = {"cpu": 0.5, "memory": 0.5}
+    monkeypatch.setattr(concurrency, "cpu_load", lambda: load["cpu"])
+    monkeypatch.setattr(concurrency, "free_memory", lambda: load["memory"])
+    limiter = AdaptiveLimiter()
+
+    assert limiter.update(saturated=False) == 4
+    assert [limiter.update(saturated=True) for _ in range(3)] == [5, 6, 6]
+
+    load["cpu"] = 3.0
+    assert [limiter.update(saturated=True) for _ in range(3)] == [4, 3, 2]
+    load["cpu"] = 0.5
+    load["memory"] = 0.05
+    assert limiter.update(saturated=True) == 2
+
+    # Tasks running much slower than their skill's baseline also back off
+    load["memory"] = 0.5
+    limiter.limit = 4
+    limiter.observe("fix_bug", 10.0)
+    limiter.observe("fix_bug", 40.0)
+    assert limiter.update(saturated=True) == 3
+    assert limiter.update(saturated=True) == 4
+
+
+@pytest.mark.asyncio
+async def test_adaptive_demand_includes_backlog(monkeypatch):
+    """Tasks waiting outside the scheduler, as in cluster mode, count as demand"""
+    monkeypatch.setattr(settings, "max_concurrent_tasks", 1)
+    scheduler = TaskScheduler()
+    release = asyncio.Event()
+
+    async def run():
+        async with scheduler.slot(skill="fix_bug"):
+            await release.wait()
+
+    task = asyncio.create_task(run())
+    await asyncio.sleep(0)
+    assert not scheduler.saturated
+    scheduler.backlog = lambda: 2
+    assert scheduler.saturated
+
+    release.set()
+    await task
+    assert scheduler.adaptive._baselines == {}
@@ -0,0 +1,101 @@
+"""Tests for SSE task streaming"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from a2a_gateway.config import settings
+from a2a_gateway.events import TaskEventBus, task_events
+from a2a_gateway.main import app
+from a2a_gateway.memory_store import InMemoryTaskStore
+from a2a_gateway.routes import _stream_events
+from a2a_gateway.tasks import task_store
+
+
+def _read_events(response):
+    """Parse (id, payload) pairs from an SSE response body"""
+    events = []
+    for block in response.text.split("\n\n"):
+        lines = dict(
+            line.split(": ", 1) for line in block.splitlines() if ": " in line
+        )
+        if "data" in lines:
+            events.append((int(lines["id"]), json.loads(lines["data"])))
+    return events
+
+
+def test_tasks_send_subscribe_streams_output(monkeypatch):
+    """Output chunks and the final status are streamed as events"""
+    monkeypatch.setattr(settings, "droid_command", "echo")
+    payload = {
+        "jsonrpc": "2.0",
+        "id": "stream-1",
+        "method": "tasks/sendSubscribe",
+        "params": {
+            "message": {"bug_description": "streamed"},
+            "skill": "fix_bug",
+        },
+    }
+
+    # The lifespan starts the dispatcher that runs submitted tasks
+    with TestClient(app) as client:
+        response = client.post("/", json=payload)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+
+    events = _read_events(response)
+    results = [event["result"] for _, event in events]
+    output = "".join(
+        r["artifact"]["data"]["output"] for r in results if "artifact" in r
+    )
+    assert "fix streamed" in output
+    assert results[-1]["final"] is True
+    assert results[-1]["status"]["state"] == "completed"
+
+    # Resubscribing after the first event replays only the rest
+    task_id = results[0]["id"]
+    resubscribe = {
+        "jsonrpc": "2.0",
+        "id": "stream-2",
+        "method": "tasks/resubscribe",
+        "params": {"id": task_id, "offset": events[0][0]},
+    }
+    replayed = _read_events(TestClient(app).post("/", json=resubscribe))
+    assert [seq for seq, _ in replayed] == [seq for seq, _ in events[1:]]
+
+
+@pytest.mark.asyncio
+async def test_trimmed_history_is_signalled(monkeypatch):
+    """A reader resuming before the oldest kept event is told what it missed"""
+    monkeypatch.setattr(settings, "stream_history_bytes", 10)
+    bus = TaskEventBus()
+    for _ in range(3):
+        bus.publish_output("t", "0123456789")
+
+    events, final = await bus.read("t", 0, timeout=0)
+    assert not final
+    assert events[0] == (
+        2,
+        {"id": "t", "historyTruncated": {"firstAvailableSeq": 3, "missedEvents": 2}},
+    )
+    assert [seq for seq, _ in events[1:]] == [3]
+
+
+@pytest.mark.asyncio
+async def test_stream_of_task_held_elsewhere_polls_the_store(monkeypatch):
+    """Without local events, the stream waits for the stored task to finish"""
+    monkeypatch.setattr(settings, "stream_poll_seconds", 0.01)
+    store = InMemoryTaskStore()
+    monkeypatch.setattr(task_store, "store", store)
+    await store.create_task("remote", {"bug_description": "x"}, "fix_bug")
+    await store.update_task_status("remote", "working")
+
+    stream = _stream_events("req", "remote", 0)
+    assert await stream.__anext__() == ": keepalive\n\n"
+    assert not task_events.has_stream("remote")
+
+    await store.finish_task("remote", "completed", {"artifacts": []})
+    rest = [chunk async for chunk in stream]
+    assert '"final":true' in rest[-1]
+    assert '"completed"' in rest[-1]
@@ -0,0 +1,61 @@
+"""Tests for the warm tool session pool"""
+
+import asyncio
+
+import pytest
+
+from a2a_gateway import tools
+from a2a_gateway.config import settings
+from a2a_gateway.warm_pool import warm_pools
+
+
+async def _wait_idle(tool: str, count: int):
+    for _ in range(100):
+        if warm_pools.stats()[tool]["idle"] >= count:
+            return
+        await asyncio.sleep(0.02)
+    raise AssertionError("warm session was not spawned")
+
+
+@pytest.mark.asyncio
+async def test_warm_session_is_used_once(monkeypatch, tmp_path):
+    """A single-use session receives the task on stdin and is replaced"""
+    monkeypatch.setattr(settings, "warm_pool_size", 1)
+    monkeypatch.setattr(settings, "claude_warm_command", "cat")
+    monkeypatch.setattr(settings, "warm_pool_workdirs", [str(tmp_path)])
+    await warm_pools.start()
+    try:
+        await _wait_idle("claude", 1)
+        result = await tools.run_pty_command(
+            "warm", ["false"], str(tmp_path), tool="claude", warm_input="hello"
+        )
+        assert result["artifacts"][0]["data"]["output"] == "hello"
+        assert warm_pools.stats()["claude"]["hits"] == 1
+        await _wait_idle("claude", 1)
+    finally:
+        await warm_pools.close()
+
+
+@pytest.mark.asyncio
+async def test_warm_session_is_reused_with_ready_pattern(monkeypatch, tmp_path):
+    """A tool printing the ready pattern serves several tasks"""
+    script = 'while read line; do echo "got $line"; echo READY; done'
+    monkeypatch.setattr(settings, "warm_pool_size", 1)
+    monkeypatch.setattr(settings, "warm_pool_max_uses", 2)
+    monkeypatch.setattr(settings, "warm_pool_ready_pattern", "READY")
+    monkeypatch.setattr(settings, "droid_warm_command", f"sh -c '{script}'")
+    monkeypatch.setattr(settings, "warm_pool_workdirs", [str(tmp_path)])
+    await warm_pools.start()
+    try:
+        await _wait_idle("droid", 1)
+        pids = []
+        for text in ("one", "two"):
+            session = await warm_pools.acquire("droid", str(tmp_path))
+            pids.append(session.process.pid)
+            output = []
+            assert await session.run(text.encode(), output.append) == 0
+            assert f"got {text}" in b"".join(output).decode()
+            warm_pools.release("droid", session)
+        assert pids[0] == pids[1]
+    finally:
+        await warm_pools.close()